@@ -1,3 +1,16 @@
+import heapq
+import math
+from path import Path
+from changelog import ChangeLog
+from spatial_index import GridIndex
+
+
+# Radio polar de la Tierra (WGS-84) en km. Al ser el radio mínimo, la distancia
+# de círculo máximo calculada con él nunca supera la longitud real de un segmento,
+# por lo que la heurística de A* es admisible.
+EARTH_RADIUS_KM = 6356.752
+
+
 class NavPoint:
     def __init__(self, number, name, latitude, longitude):
         """
@@ -13,6 +26,10 @@ class NavPoint:
         self.name = name
         self.latitude = latitude
         self.longitude = longitude
+        # Valores precalculados para la heurística de círculo máximo
+        self.lat_rad = math.radians(latitude)
+        self.lon_rad = math.radians(longitude)
+        self.cos_lat = math.cos(self.lat_rad)
 
 
 class NavSegment:
@@ -37,11 +54,11 @@ class NavAirport:
         self.stars = stars  # Lista de números: [91011, 121314]
 
 
-    def get_first_sid_point(self, nav_points):
+    def get_first_sid_point(self, airspace):
         """Devuelve el primer punto SID del aeropuerto"""
         if not self.sids:
             return None
-        return next((p for p in nav_points if p.number == self.sids[0]), None)
+        return airspace.get_point(self.sids[0])
 
 
 class AirSpace:
@@ -50,9 +67,88 @@ class AirSpace:
         self.nav_points = []  # Lista de NavPoint
         self.nav_segments = []  # Lista de NavSegment
         self.nav_airports = []  # Lista de NavAirport
+        self.points_by_number = {}  # Diccionario número -> NavPoint
+        self.outgoing = {}  # Número de origen -> lista de NavSegment salientes
+        self.incoming = {}  # Número de destino -> lista de NavSegment entrantes
+        self.changes = ChangeLog()  # Versión y últimos cambios (para invalidar o actualizar cachés)
+        self._spatial = None  # GridIndex de números de punto por (longitud, latitud), se crea al primer uso
+        self._views = {}  # Tipo -> vista CSR de reachability (se reconstruye al cambiar version)
+        self._components = None  # StrongComponents de la última versión consultada
+
+    def add_nav_point(self, point):
+        """Añade un punto de navegación si su número no existe todavía"""
+        if point.number in self.points_by_number:
+            return False
+        self.nav_points.append(point)
+        self.points_by_number[point.number] = point
+        if self._spatial is not None:
+            self._spatial.add(point.number, point.longitude, point.latitude)
+        self.changes.record('add_point', point)
+        return True
+
+    def add_nav_segment(self, segment):
+        """
+        Añade un segmento entre dos puntos existentes y lo registra en las listas de adyacencia
 
-
-def LoadAirspace(nav_file, seg_file, airport_file):
+        Returns:
+            bool: True si se añadió, False si el origen o el destino no existen
+        """
+        if segment.origin_number not in self.points_by_number or \
+                segment.destination_number not in self.points_by_number:
+            return False
+        self.nav_segments.append(segment)
+        self.outgoing.setdefault(segment.origin_number, []).append(segment)
+        self.incoming.setdefault(segment.destination_number, []).append(segment)
+        self.changes.record('add_segment', segment)
+        return True
+
+    def remove_nav_segment(self, origin_number, destination_number):
+        """Elimina el segmento origin -> destination (el primero si hay varios)"""
+        for segment in self.get_outgoing_segments(origin_number):
+            if segment.destination_number == destination_number:
+                self.nav_segments.remove(segment)
+                self.outgoing[origin_number].remove(segment)
+                self.incoming[destination_number].remove(segment)
+                self.changes.record('remove_segment', segment)
+                return True
+        return False
+
+    def set_segment_distance(self, origin_number, destination_number, distance):
+        """Cambia la distancia del segmento origin -> destination (el primero si hay varios)"""
+        for segment in self.get_outgoing_segments(origin_number):
+            if segment.destination_number == destination_number:
+                segment.distance = distance
+                self.changes.record('change_segment', segment)
+                return True
+        return False
+
+    @property
+    def version(self):
+        """Versión actual (se incrementa con cada cambio registrado en changes)"""
+        return self.changes.version
+
+    def get_point(self, number):
+        """Obtiene un NavPoint por su número, o None si no existe"""
+        return self.points_by_number.get(number)
+
+    def get_outgoing_segments(self, number):
+        """Obtiene los segmentos que salen del punto indicado"""
+        return self.outgoing.get(number, [])
+
+    def spatial_index(self):
+        """Índice espacial (GridIndex) de los números de punto por longitud y latitud, creado la primera vez"""
+        if self._spatial is None:
+            self._spatial = GridIndex((p.number for p in self.nav_points),
+                                      (p.longitude for p in self.nav_points),
+                                      (p.latitude for p in self.nav_points))
+        return self._spatial
+
+    def get_incoming_segments(self, number):
+        """Obtiene los segmentos que llegan al punto indicado"""
+        return self.incoming.get(number, [])
+
+
+def LoadAirspace(nav_file, seg_file, airport_file, cache_file=None):
     """
     Carga los datos del espacio aéreo desde los archivos de texto
 
@@ -60,10 +156,17 @@ def LoadAirspace(nav_file, seg_file, airport_file):
         nav_file (str): Ruta al archivo de puntos de navegación
         seg_file (str): Ruta al archivo de segmentos
         airport_file (str): Ruta al archivo de aeropuertos
+        cache_file (str): Ruta de una caché binaria. Si se indica, se reutiliza mientras
+            los archivos de texto no cambien y se vuelve a crear cuando cambian (opcional)
 
     Returns:
         AirSpace: Objeto con todos los datos del espacio aéreo cargados
+            (CompactAirSpace con la misma interfaz si se usa la caché)
     """
+    if cache_file:
+        from compact_airspace import LoadAirspaceWithCache
+        return LoadAirspaceWithCache(nav_file, seg_file, airport_file, cache_file)
+
     airspace = AirSpace()
 
     # 1. Cargar puntos de navegación
@@ -79,7 +182,7 @@ def LoadAirspace(nav_file, seg_file, airport_file):
                 name = parts[1]
                 latitude = float(parts[2])
                 longitude = float(parts[3])
-                airspace.nav_points.append(NavPoint(number, name, latitude, longitude))
+                airspace.add_nav_point(NavPoint(number, name, latitude, longitude))
             except (IndexError, ValueError) as e:
                 print(f"Error al procesar línea en {nav_file}: {line}")
                 continue
@@ -96,12 +199,36 @@ def LoadAirspace(nav_file, seg_file, airport_file):
                 origin = int(parts[0])
                 destination = int(parts[1])
                 distance = float(parts[2])
-                airspace.nav_segments.append(NavSegment(origin, destination, distance))
+                segment = NavSegment(origin, destination, distance)
             except (IndexError, ValueError) as e:
                 print(f"Error al procesar línea en {seg_file}: {line}")
                 continue
+            if not airspace.add_nav_segment(segment):
+                print(f"Segmento con puntos desconocidos en {seg_file}: {line}")
 
     # 3. Cargar aeropuertos
+    airspace.nav_airports = LoadNavAirports(airport_file, {p.name: p.number for p in airspace.nav_points})
+
+    return airspace
+
+
+def LoadNavAirports(airport_file, point_numbers=None):
+    """
+    Carga la lista de aeropuertos desde el archivo de texto
+
+    Después de cada aeropuerto vienen sus puntos SID ("BCN.D") y STAR ("BCN.A") por
+    nombre, que se convierten en números de NavPoint. También se aceptan líneas
+    "SID n1 n2 ..." y "STAR n1 n2 ..." con los números directamente.
+
+    Args:
+        airport_file (str): Ruta al archivo de aeropuertos
+        point_numbers (dict): Nombre -> número de los NavPoint, para resolver los nombres (opcional)
+
+    Returns:
+        list: Lista de NavAirport
+    """
+    point_numbers = point_numbers or {}
+    nav_airports = []
     with open(airport_file, 'r') as f:
         current_airport = None
         current_sids = []
@@ -112,11 +239,19 @@ def LoadAirspace(nav_file, seg_file, airport_file):
             if not line:
                 continue
 
+            # Punto SID (.D, salida) o STAR (.A, llegada) por nombre
+            if line.endswith(('.D', '.A')) and current_airport:
+                if line not in point_numbers:
+                    print(f"Punto desconocido en {airport_file}: {line}")
+                elif line.endswith('.D'):
+                    current_sids.append(point_numbers[line])
+                else:
+                    current_stars.append(point_numbers[line])
             # Si es un aeropuerto nuevo
-            if not line.startswith(('SID', 'STAR')):
+            elif not line.startswith(('SID', 'STAR')):
                 # Guardar el aeropuerto anterior si existe
                 if current_airport:
-                    airspace.nav_airports.append(NavAirport(current_airport, current_sids, current_stars))
+                    nav_airports.append(NavAirport(current_airport, current_sids, current_stars))
                     current_sids = []
                     current_stars = []
 
@@ -134,9 +269,9 @@ def LoadAirspace(nav_file, seg_file, airport_file):
 
         # Añadir el último aeropuerto
         if current_airport:
-            airspace.nav_airports.append(NavAirport(current_airport, current_sids, current_stars))
+            nav_airports.append(NavAirport(current_airport, current_sids, current_stars))
 
-    return airspace
+    return nav_airports
 
 
 def GetReachableNavPoints(airspace, start_id):
@@ -150,37 +285,57 @@ def GetReachableNavPoints(airspace, start_id):
     Returns:
         list: Lista de NavPoint alcanzables desde el punto inicial
     """
-    from collections import deque
+    from reachability import ReachableNavPoints
 
-    # Encontrar el punto de inicio
-    start_point = next((p for p in airspace.nav_points if p.number == start_id), None)
-    if not start_point:
-        return []
+    # BFS sobre la vista CSR del espacio aéreo, que se reutiliza mientras no cambie
+    return ReachableNavPoints(airspace, start_id)
 
-    visited = set()
-    queue = deque([start_point])
-    reachable = []
 
-    while queue:
-        current = queue.popleft()
-        if current.number in visited:
-            continue
+def HaversineDistance(p1, p2):
+    """
+    Distancia de círculo máximo entre dos NavPoint en km (fórmula del haversine)
+
+    Usa EARTH_RADIUS_KM, así que es una cota inferior de la distancia por aerovía.
+    """
+    sin_dlat = math.sin((p2.lat_rad - p1.lat_rad) / 2)
+    sin_dlon = math.sin((p2.lon_rad - p1.lon_rad) / 2)
+    a = sin_dlat * sin_dlat + p1.cos_lat * p2.cos_lat * sin_dlon * sin_dlon
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _AvoidFilter(airspace, avoid_points, avoid_segments):
+    """
+    Segmentos salientes y entrantes sin los puntos ni segmentos a evitar (sin copiar el espacio aéreo)
+
+    Un segmento no se puede usar si llega a un punto evitado. El punto de inicio se puede
+    abandonar aunque esté en avoid_points, pero no se puede volver a él.
+
+    Args:
+        avoid_points (set): Números de NavPoint que no se pueden atravesar
+        avoid_segments: NavSegment o pares (origen, destino) que no se pueden usar
 
-        visited.add(current.number)
-        reachable.append(current)
+    Returns:
+        tuple: (outgoing, incoming), funciones número -> lista de NavSegment permitidos
+    """
+    avoid_points = avoid_points or set()
+    avoid_pairs = {(s.origin_number, s.destination_number) if isinstance(s, NavSegment) else tuple(s)
+                   for s in avoid_segments or ()}
 
-        # Encontrar todos los vecinos (destinos de segmentos que salen de current)
-        for seg in airspace.nav_segments:
-            if seg.origin_number == current.number:
-                neighbor = next((p for p in airspace.nav_points
-                                 if p.number == seg.destination_number), None)
-                if neighbor and neighbor.number not in visited:
-                    queue.append(neighbor)
+    def outgoing(number):
+        return [seg for seg in airspace.get_outgoing_segments(number)
+                if seg.destination_number not in avoid_points
+                and (not avoid_pairs or (number, seg.destination_number) not in avoid_pairs)]
 
-    return reachable
+    def incoming(number):
+        if number in avoid_points:
+            return []
+        return [seg for seg in airspace.get_incoming_segments(number)
+                if not avoid_pairs or (seg.origin_number, number) not in avoid_pairs]
+    return outgoing, incoming
 
 
-def FindShortestNavPath(airspace, start_id, end_id):
+def FindShortestNavPath(airspace, start_id, end_id, heuristic=None, stats=None, bidirectional=False,
+                        avoid_points=None, avoid_segments=None):
     """
     Encuentra el camino más corto entre dos puntos de navegación usando A*
 
@@ -188,62 +343,282 @@ def FindShortestNavPath(airspace, start_id, end_id):
         airspace (AirSpace): El espacio aéreo completo
         start_id (int): Número del punto de inicio
         end_id (int): Número del punto de destino
+        heuristic (callable): Función (point, end_point) -> cota inferior en km.
+            Por defecto HaversineDistance (opcional)
+        stats (dict): Si se indica, se guarda en stats['expanded'] el número de
+            puntos expandidos (opcional)
+        bidirectional (bool): Buscar a la vez desde el origen y desde el destino
+            (ver FindShortestNavPathBidirectional, también con avoid_points y avoid_segments) (opcional)
+        avoid_points (set): Números de NavPoint que no se pueden atravesar (opcional)
+        avoid_segments: NavSegment o pares (origen, destino) que no se pueden usar (opcional)
 
     Returns:
         Path: Objeto con los puntos del camino y el costo total, o None si no hay camino
     """
-    import heapq
-
-    class Path:
-        def __init__(self, points, cost):
-            self.points = points  # Lista de NavPoint en orden del camino
-            self.cost = cost  # Costo total acumulado del camino
+    if bidirectional:
+        return FindShortestNavPathBidirectional(airspace, start_id, end_id, heuristic, stats,
+                                                avoid_points, avoid_segments)
+    if avoid_points or avoid_segments:
+        outgoing, _ = _AvoidFilter(airspace, avoid_points, avoid_segments)
+    else:
+        outgoing = airspace.get_outgoing_segments
 
     # Verificar que los puntos existen
-    start_point = next((p for p in airspace.nav_points if p.number == start_id), None)
-    end_point = next((p for p in airspace.nav_points if p.number == end_id), None)
+    start_point = airspace.get_point(start_id)
+    end_point = airspace.get_point(end_id)
 
     if not start_point or not end_point:
         return None
 
-    # Priority queue: (f_score, path_object)
-    open_set = []
-    heapq.heappush(open_set, (0, Path([start_point], 0)))
+    if heuristic is None:
+        heuristic = HaversineDistance
 
-    # Diccionario para almacenar los mejores costos conocidos
-    g_scores = {start_point.number: 0}
+    def remaining(point):
+        # Heurística: cota inferior de la distancia al destino (en km)
+        return heuristic(point, end_point)
 
-    while open_set:
-        _, current_path = heapq.heappop(open_set)
-        last_point = current_path.points[-1]
+    # Priority queue: (f_score, desempate, número de punto)
+    open_set = [(remaining(start_point), 0, start_id)]
+    counter = 1
 
-        # Si llegamos al destino
-        if last_point.number == end_id:
-            return current_path
+    # Mejores costos conocidos y punteros al punto anterior
+    g_scores = {start_id: 0}
+    came_from = {start_id: None}
+    closed_set = set()
+
+    while open_set:
+        _, _, current = heapq.heappop(open_set)
+        if current in closed_set:
+            continue  # Entrada obsoleta, el punto ya se expandió
+        closed_set.add(current)
+        if stats is not None:
+            stats['expanded'] = len(closed_set)
+
+        # Si llegamos al destino, reconstruir el camino una sola vez
+        if current == end_id:
+            points = []
+            while current is not None:
+                points.append(airspace.get_point(current))
+                current = came_from[current]
+            points.reverse()
+
+            path = Path()
+            path.points = points
+            path.cost = g_scores[end_id]
+            return path
 
         # Explorar vecinos
-        for seg in airspace.nav_segments:
-            if seg.origin_number == last_point.number:
-                neighbor = next((p for p in airspace.nav_points
-                                 if p.number == seg.destination_number), None)
-                if not neighbor:
-                    continue
+        for seg in outgoing(current):
+            neighbor = airspace.get_point(seg.destination_number)
+            if not neighbor or neighbor.number in closed_set:
+                continue
 
-                # Calcular nuevo costo acumulado
-                tentative_g_score = g_scores[last_point.number] + seg.distance
+            # Calcular nuevo costo acumulado
+            tentative_g_score = g_scores[current] + seg.distance
 
-                if neighbor.number not in g_scores or tentative_g_score < g_scores[neighbor.number]:
-                    g_scores[neighbor.number] = tentative_g_score
+            if tentative_g_score < g_scores.get(neighbor.number, float('inf')):
+                g_scores[neighbor.number] = tentative_g_score
+                came_from[neighbor.number] = current
+                f_score = tentative_g_score + remaining(neighbor)
+                heapq.heappush(open_set, (f_score, counter, neighbor.number))
+                counter += 1
 
-                    # Heurística: distancia euclidiana al destino (en grados)
-                    h_score = ((neighbor.latitude - end_point.latitude) ** 2 +
-                               (neighbor.longitude - end_point.longitude) ** 2) ** 0.5
-                    f_score = tentative_g_score + h_score
+    return None
 
-                    new_path = Path(current_path.points + [neighbor], tentative_g_score)
-                    heapq.heappush(open_set, (f_score, new_path))
 
-    return None
+def FindAlternativeNavPath(airspace, start_id, end_id, avoid_points=None, avoid_segments=None, heuristic=None):
+    """
+    Encuentra un camino alternativo evitando puntos y segmentos específicos (A*)
+
+    Args:
+        airspace (AirSpace): El espacio aéreo completo
+        start_id (int): Número del punto de inicio
+        end_id (int): Número del punto de destino
+        avoid_points (set): Números de NavPoint que no se pueden atravesar (opcional)
+        avoid_segments: NavSegment o pares (origen, destino) que no se pueden usar (opcional)
+        heuristic (callable): Cota inferior en km, como en FindShortestNavPath. Una cota
+            calculada sobre el espacio aéreo completo sigue siendo válida al evitar
+            puntos o segmentos (opcional)
+
+    Returns:
+        Path: Objeto con los puntos del camino y el costo total, o None si no hay camino
+    """
+    avoid_points = avoid_points or set()
+    if start_id in avoid_points or end_id in avoid_points:
+        return None  # No hay camino válido
+    return FindShortestNavPath(airspace, start_id, end_id, heuristic=heuristic, avoid_points=avoid_points,
+                               avoid_segments=avoid_segments)
+
+
+def FindShortestNavPathBidirectional(airspace, start_id, end_id, heuristic=None, stats=None,
+                                     avoid_points=None, avoid_segments=None):
+    """
+    Camino más corto con búsqueda bidireccional (A* simétrico con potenciales promediados)
+
+    La búsqueda hacia delante sigue los segmentos salientes y la búsqueda hacia atrás
+    los entrantes. Ambas usan el potencial p(v) = (h(v, destino) - h(origen, v)) / 2
+    (con signo contrario hacia atrás), que es consistente en los dos sentidos. Con una
+    heurística nula es un Dijkstra bidireccional. La búsqueda termina cuando la suma
+    de las claves mínimas de las dos colas alcanza el mejor camino encontrado.
+
+    Args:
+        airspace (AirSpace): El espacio aéreo completo
+        start_id (int): Número del punto de inicio
+        end_id (int): Número del punto de destino
+        heuristic (callable): Función (point, other) -> cota inferior en km de point a other.
+            Por defecto HaversineDistance (opcional)
+        stats (dict): Si se indica, se guarda en stats['expanded'] el número de
+            puntos expandidos entre las dos búsquedas (opcional)
+        avoid_points (set): Números de NavPoint que no se pueden atravesar (opcional)
+        avoid_segments: NavSegment o pares (origen, destino) que no se pueden usar (opcional)
+
+    Returns:
+        Path: Objeto con los puntos del camino y el costo total, o None si no hay camino
+    """
+    start_point = airspace.get_point(start_id)
+    end_point = airspace.get_point(end_id)
+
+    if not start_point or not end_point:
+        return None
+
+    if heuristic is None:
+        heuristic = HaversineDistance
+
+    if avoid_points or avoid_segments:
+        outgoing, incoming = _AvoidFilter(airspace, avoid_points, avoid_segments)
+    else:
+        outgoing, incoming = airspace.get_outgoing_segments, airspace.get_incoming_segments
+
+    def potential(point):
+        return (heuristic(point, end_point) - heuristic(start_point, point)) / 2
+
+    # Índice 0: búsqueda hacia delante, índice 1: búsqueda hacia atrás
+    g_scores = ({start_id: 0}, {end_id: 0})
+    came_from = ({start_id: None}, {end_id: None})
+    closed_sets = (set(), set())
+    open_sets = ([(potential(start_point), 0, start_id)], [(-potential(end_point), 0, end_id)])
+    counter = 1
+
+    best_cost = 0 if start_id == end_id else float('inf')
+    meeting = start_id if start_id == end_id else None
+
+    while open_sets[0] and open_sets[1]:
+        # Criterio de parada: ningún camino que pase por las colas puede mejorar el actual
+        if open_sets[0][0][0] + open_sets[1][0][0] >= best_cost:
+            break
+
+        side = 0 if open_sets[0][0][0] <= open_sets[1][0][0] else 1
+        _, _, current = heapq.heappop(open_sets[side])
+        if current in closed_sets[side]:
+            continue  # Entrada obsoleta
+        closed_sets[side].add(current)
+
+        if side == 0:
+            segments = [(seg.destination_number, seg.distance) for seg in outgoing(current)]
+        else:
+            segments = [(seg.origin_number, seg.distance) for seg in incoming(current)]
+
+        for neighbor_number, distance in segments:
+            if neighbor_number in closed_sets[side]:
+                continue
+            neighbor = airspace.get_point(neighbor_number)
+            if not neighbor:
+                continue
+
+            tentative_g_score = g_scores[side][current] + distance
+            if tentative_g_score < g_scores[side].get(neighbor_number, float('inf')):
+                g_scores[side][neighbor_number] = tentative_g_score
+                came_from[side][neighbor_number] = current
+                key = tentative_g_score + (potential(neighbor) if side == 0 else -potential(neighbor))
+                heapq.heappush(open_sets[side], (key, counter, neighbor_number))
+                counter += 1
+
+                # ¿La otra búsqueda ya había llegado a este punto?
+                other_g_score = g_scores[1 - side].get(neighbor_number)
+                if other_g_score is not None and tentative_g_score + other_g_score < best_cost:
+                    best_cost = tentative_g_score + other_g_score
+                    meeting = neighbor_number
+
+    if stats is not None:
+        stats['expanded'] = len(closed_sets[0]) + len(closed_sets[1])
+
+    if meeting is None:
+        return None
+
+    # Reconstruir: origen -> punto de encuentro -> destino
+    numbers = []
+    current = meeting
+    while current is not None:
+        numbers.append(current)
+        current = came_from[0][current]
+    numbers.reverse()
+    current = came_from[1][meeting]
+    while current is not None:
+        numbers.append(current)
+        current = came_from[1][current]
+
+    path = Path()
+    path.points = [airspace.get_point(n) for n in numbers]
+    path.cost = best_cost
+    return path
+
+
+def NavDijkstra(airspace, start_id, end_id=None):
+    """
+    Algoritmo de Dijkstra desde un punto sobre los segmentos salientes del espacio aéreo
+
+    Args:
+        airspace (AirSpace): El espacio aéreo completo
+        start_id (int): Número del punto de inicio
+        end_id (int): Número del punto de destino; la búsqueda termina al extraerlo.
+            Sin destino se calcula el árbol de caminos mínimos completo (opcional)
+
+    Returns:
+        tuple: (distances, previous) con la distancia y el predecesor de cada número alcanzado
+    """
+    distances = {start_id: 0}
+    previous = {start_id: None}
+    visited = set()
+    heap = [(0, start_id)]
+
+    while heap:
+        dist, current = heapq.heappop(heap)
+        if current in visited:
+            continue  # Entrada obsoleta
+        visited.add(current)
+
+        if current == end_id:
+            break
+
+        for seg in airspace.get_outgoing_segments(current):
+            neighbor = seg.destination_number
+            if neighbor in visited:
+                continue
+            alt = dist + seg.distance
+            if alt < distances.get(neighbor, float('inf')):
+                distances[neighbor] = alt
+                previous[neighbor] = current
+                heapq.heappush(heap, (alt, neighbor))
+
+    return distances, previous
+
+
+def BuildNavPath(airspace, previous, distances, end_id):
+    """Reconstruye el Path hasta end_id a partir de los predecesores, o None si no se alcanzó"""
+    if end_id not in distances:
+        return None
+
+    numbers = []
+    current = end_id
+    while current is not None:
+        numbers.append(current)
+        current = previous[current]
+    numbers.reverse()
+
+    path = Path()
+    path.points = [airspace.get_point(n) for n in numbers]
+    path.cost = distances[end_id]
+    return path
 
 
 # Funciones auxiliares para facilitar el testing
@@ -0,0 +1,597 @@
+"""
+Pruebas de rendimiento del proyecto.
+
+Uso:
+    python benchmark.py
+
+Cada función bench_* imprime una pequeña tabla con los tiempos medidos.
+"""
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import airspace
+import compact_airspace
+import contraction
+import distance_matrix
+import navgraph
+import pareto
+import reachability
+import graph
+import k_shortest
+import landmarks
+import path
+import shortest_path_tree
+import spatial_index
+import spt_cache
+import strong_components
+from node import AddNeighbor
+
+
+def _timed(func, *args, **kwargs):
+    """Ejecuta func y devuelve (resultado, segundos)"""
+    t0 = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+def _best(func, *args, repeat=3, **kwargs):
+    """Menor tiempo de varias ejecuciones de func (descarta pausas del recolector de basura)"""
+    return min(_timed(func, *args, **kwargs)[1] for _ in range(repeat))
+
+
+def WriteSyntheticGraphFile(filename, n_nodes, seed=0):
+    """
+    Escribe un grafo sintético en formato [NODES]/[SEGMENTS]
+
+    Los nodos forman una malla aproximadamente cuadrada y cada nodo se conecta
+    con su vecino de la derecha y el de abajo (unos 2 segmentos por nodo).
+    """
+    rng = random.Random(seed)
+    side = max(1, int(n_nodes ** 0.5))
+    with open(filename, 'w') as f:
+        f.write("# Synthetic graph\n[NODES]\n")
+        for i in range(n_nodes):
+            x = (i % side) + rng.random() * 0.5
+            y = (i // side) + rng.random() * 0.5
+            f.write(f"N{i}, {x:.4f}, {y:.4f}\n")
+
+        f.write("\n[SEGMENTS]\n")
+        for i in range(n_nodes):
+            right = i + 1
+            down = i + side
+            if right % side != 0 and right < n_nodes:
+                f.write(f"N{i}-N{right}, N{i}, N{right}\n")
+            if down < n_nodes:
+                f.write(f"N{i}-N{down}, N{i}, N{down}\n")
+
+
+def _LegacyAddNode(g, n):
+    """AddNode tal como era antes del índice por nombre (búsqueda lineal)"""
+    if any(node.name == n.name for node in g.nodes):
+        return False
+    g.nodes.append(n)
+    g.node_index[n.name] = n
+    return True
+
+
+def _LegacyAddSegment(g, name, origin_name, destination_name):
+    """AddSegment tal como era antes del índice por nombre (búsquedas lineales)"""
+    origin = next((n for n in g.nodes if n.name == origin_name), None)
+    destination = next((n for n in g.nodes if n.name == destination_name), None)
+    if not origin or not destination:
+        return False
+    if any(seg.origin == origin and seg.destination == destination for seg in g.segments):
+        return False
+    cost = ((destination.x - origin.x) ** 2 + (destination.y - origin.y) ** 2) ** 0.5
+    g.segments.append(graph.Segment(name, origin, destination, cost))
+    AddNeighbor(origin, destination)
+    return True
+
+
+def _LoadGraphLegacy(filename):
+    """Carga el fichero con LoadGraphFromFile usando las búsquedas lineales antiguas"""
+    add_node, add_segment = graph.AddNode, graph.AddSegment
+    graph.AddNode, graph.AddSegment = _LegacyAddNode, _LegacyAddSegment
+    try:
+        return graph.LoadGraphFromFile(filename)
+    finally:
+        graph.AddNode, graph.AddSegment = add_node, add_segment
+
+
+def bench_load_graph(sizes=(1000, 2000, 4000), big_size=100000, legacy_limit=4000):
+    """
+    Compara LoadGraphFromFile con índice por nombre frente al comportamiento anterior
+
+    El cargador antiguo es O(N·M), así que solo se mide hasta legacy_limit nodos.
+    """
+    print("== LoadGraphFromFile ==")
+    print(f"{'nodes':>8} {'segments':>9} {'indexed (s)':>12} {'legacy (s)':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in list(sizes) + [big_size]:
+            filename = os.path.join(tmp, f"graph_{n}.txt")
+            WriteSyntheticGraphFile(filename, n)
+            g, t_new = _timed(graph.LoadGraphFromFile, filename)
+            legacy = "-"
+            if n <= legacy_limit:
+                g_old, t_old = _timed(_LoadGraphLegacy, filename)
+                assert len(g_old.segments) == len(g.segments)
+                legacy = f"{t_old:.3f}"
+            print(f"{n:>8} {len(g.segments):>9} {t_new:>12.3f} {legacy:>11}")
+
+
+def _RandomPairs(names, n_pairs, seed=1):
+    rng = random.Random(seed)
+    return [(rng.choice(names), rng.choice(names)) for _ in range(n_pairs)]
+
+
+def bench_graph_queries(n_nodes=841, n_pairs=200):
+    """Mide FindShortestPath (A*) y GetReachableNodes sobre un grafo del tamaño de Eur_nav.txt"""
+    print("== Graph queries ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "graph.txt")
+        WriteSyntheticGraphFile(filename, n_nodes)
+        g = graph.LoadGraphFromFile(filename)
+
+    pairs = _RandomPairs([n.name for n in g.nodes], n_pairs)
+    _, t_astar = _timed(lambda: [path.FindShortestPath(g, a, b) for a, b in pairs])
+    _, t_reach = _timed(lambda: [path.GetReachableNodes(g, a) for a, _ in pairs[:20]])
+    print(f"{n_nodes} nodes, {len(g.segments)} segments")
+    print(f"path.FindShortestPath:  {1000 * t_astar / n_pairs:.3f} ms/query")
+    print(f"path.GetReachableNodes: {1000 * t_reach / 20:.3f} ms/query")
+
+
+DATASETS = {
+    "Cat": ("Cat_nav.txt", "Cat_seg.txt", "Cat_ger.txt"),
+    "Spa": ("Spa_nav.txt", "Spa_seg.txt", "Spa_ger.txt"),
+    "Eur": ("Eur_nav.txt", "Eur_seg.txt", "Eur_ger.txt"),
+}
+
+
+def _DegreesHeuristic(point, end_point):
+    """Heurística anterior: distancia euclidiana en grados (no comparable con km)"""
+    return ((point.latitude - end_point.latitude) ** 2 +
+            (point.longitude - end_point.longitude) ** 2) ** 0.5
+
+
+def _ReachablePairs(a, n_pairs, seed=1):
+    """Pares aleatorios (origen, destino) que tienen camino"""
+    rng = random.Random(seed)
+    numbers = [p.number for p in a.nav_points]
+    pairs = []
+    while len(pairs) < n_pairs:
+        start, end = rng.choice(numbers), rng.choice(numbers)
+        if airspace.FindShortestNavPath(a, start, end):
+            pairs.append((start, end))
+    return pairs
+
+
+def bench_nav_heuristics(n_pairs=200):
+    """Compara los puntos expandidos por FindShortestNavPath según la heurística"""
+    print("== FindShortestNavPath: expanded points per query ==")
+    heuristics = [
+        ("none", lambda point, end_point: 0),
+        ("degrees", _DegreesHeuristic),
+        ("haversine", airspace.HaversineDistance),
+    ]
+    print(f"{'dataset':>8} " + " ".join(f"{name:>18}" for name, _ in heuristics))
+    for name, files in DATASETS.items():
+        a = airspace.LoadAirspace(*files)
+        pairs = _ReachablePairs(a, n_pairs)
+        cells = []
+        for _, h in heuristics:
+            expanded = 0
+            t0 = time.perf_counter()
+            for start, end in pairs:
+                stats = {}
+                airspace.FindShortestNavPath(a, start, end, heuristic=h, stats=stats)
+                expanded += stats['expanded']
+            ms = 1000 * (time.perf_counter() - t0) / len(pairs)
+            cells.append(f"{expanded / len(pairs):8.1f} ({ms:5.2f}ms)")
+        print(f"{name:>8} " + " ".join(f"{c:>18}" for c in cells))
+
+
+def WriteMergedAirspaceFiles(directory, copies, base="Eur"):
+    """
+    Escribe un espacio aéreo formado por varias copias desplazadas de un dataset
+
+    Returns:
+        tuple: rutas (nav_file, seg_file, airport_file)
+    """
+    nav_src, seg_src, airport_src = DATASETS[base]
+    with open(nav_src) as f:
+        points = [line.split() for line in f if line.strip()]
+    with open(seg_src) as f:
+        segments = [line.split() for line in f if line.strip()]
+    offset = max(int(p[0]) for p in points) + 1
+
+    nav_file = os.path.join(directory, f"{base}x{copies}_nav.txt")
+    seg_file = os.path.join(directory, f"{base}x{copies}_seg.txt")
+    with open(nav_file, 'w') as f:
+        for c in range(copies):
+            for number, name, lat, lon in points:
+                f.write(f"{int(number) + c * offset} {name}{c} {lat} {float(lon) + c * 0.01}\n")
+    with open(seg_file, 'w') as f:
+        for c in range(copies):
+            for origin, destination, distance in segments:
+                f.write(f"{int(origin) + c * offset} {int(destination) + c * offset} {distance}\n")
+    return nav_file, seg_file, airport_src
+
+
+def _MeasureLoad(loader, files):
+    """Devuelve (segundos, MB en memoria tras la carga) de un cargador de espacio aéreo"""
+    tracemalloc.start()
+    a, seconds = _timed(loader, *files)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Tiempo sin la sobrecarga de tracemalloc
+    _, seconds = _timed(loader, *files)
+    return a, seconds, current / 2 ** 20
+
+
+def bench_airspace_loading(copies=(1, 20, 100)):
+    """Compara LoadAirspace con el cargador columnar LoadAirspaceCompact"""
+    print("== Airspace loading (merged copies of Eur) ==")
+    print(f"{'points':>8} {'segments':>9} {'LoadAirspace':>20} {'LoadAirspaceCompact':>20}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in copies:
+            files = WriteMergedAirspaceFiles(tmp, n)
+            a, t_old, mb_old = _MeasureLoad(airspace.LoadAirspace, files)
+            _, t_new, mb_new = _MeasureLoad(compact_airspace.LoadAirspaceCompact, files)
+            print(f"{len(a.nav_points):>8} {len(a.nav_segments):>9} "
+                  f"{1000 * t_old:>9.1f}ms {mb_old:>6.1f}MB {1000 * t_new:>9.1f}ms {mb_new:>6.1f}MB")
+
+
+def bench_airspace_cache(copies=(1, 20, 100)):
+    """Compara la carga desde texto con la carga desde la caché binaria mapeada en memoria"""
+    print("== Airspace binary cache ==")
+    print(f"{'points':>8} {'text load':>10} {'first load':>11} {'cached load':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in copies:
+            files = WriteMergedAirspaceFiles(tmp, n)
+            cache_file = os.path.join(tmp, f"x{n}_airspace.cache")
+            a, t_text = _timed(airspace.LoadAirspace, *files)
+            _, t_first = _timed(airspace.LoadAirspace, *files, cache_file=cache_file)
+            _, t_cached = _timed(airspace.LoadAirspace, *files, cache_file=cache_file)
+            print(f"{len(a.nav_points):>8} {1000 * t_text:>8.1f}ms {1000 * t_first:>9.1f}ms "
+                  f"{1000 * t_cached:>10.1f}ms")
+
+
+def bench_csr(copies=100, n_pairs=200):
+    """Compara FindShortestNavPath / GetReachableNavPoints con sus versiones sobre CSR"""
+    print("== CSR routing ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        a = compact_airspace.LoadAirspaceCompact(*WriteMergedAirspaceFiles(tmp, copies))
+    g, t_build = _timed(navgraph.BuildNavGraph, a)
+    csr_bytes = sum(len(x) * x.itemsize for x in (g.offsets, g.targets, g.weights))
+    print(f"{g}: built in {1000 * t_build:.1f}ms, CSR arrays {csr_bytes / 2 ** 20:.1f}MB")
+
+    eur = airspace.LoadAirspace(*DATASETS["Eur"])
+    pairs = _ReachablePairs(eur, n_pairs)
+    _, t_obj = _timed(lambda: [airspace.FindShortestNavPath(a, s, e) for s, e in pairs])
+    _, t_csr = _timed(lambda: [navgraph.FindShortestNavPathCSR(g, s, e) for s, e in pairs])
+    print(f"shortest path: {1000 * t_obj / n_pairs:.3f} ms -> {1000 * t_csr / n_pairs:.3f} ms per query")
+    starts = [s for s, _ in pairs[:20]]
+    _, t_obj = _timed(lambda: [airspace.GetReachableNavPoints(a, s) for s in starts])
+    _, t_csr = _timed(lambda: [navgraph.GetReachableNavPointsCSR(g, s) for s in starts])
+    print(f"reachability:  {1000 * t_obj / 20:.3f} ms -> {1000 * t_csr / 20:.3f} ms per query")
+
+
+def _LongHaulPairs(a, n_pairs, seed=1):
+    """Pares con camino elegidos entre los más alejados (por distancia de círculo máximo)"""
+    candidates = _ReachablePairs(a, 5 * n_pairs, seed)
+    candidates.sort(key=lambda pair: -airspace.HaversineDistance(a.get_point(pair[0]), a.get_point(pair[1])))
+    return candidates[:n_pairs]
+
+
+def bench_bidirectional(n_pairs=100):
+    """Compara los puntos expandidos por la búsqueda unidireccional y la bidireccional"""
+    print("== FindShortestNavPath: unidirectional vs bidirectional (long-haul pairs) ==")
+    zero = lambda point, end_point: 0
+    modes = [
+        ("dijkstra", zero, False),
+        ("A*", None, False),
+        ("bidir dijkstra", zero, True),
+        ("bidir A*", None, True),
+    ]
+    print(f"{'dataset':>8} " + " ".join(f"{name:>18}" for name, _, _ in modes))
+    for name, files in DATASETS.items():
+        a = airspace.LoadAirspace(*files)
+        pairs = _LongHaulPairs(a, n_pairs)
+        cells = []
+        for _, h, bidirectional in modes:
+            expanded = 0
+            t0 = time.perf_counter()
+            for start, end in pairs:
+                stats = {}
+                airspace.FindShortestNavPath(a, start, end, heuristic=h, stats=stats,
+                                             bidirectional=bidirectional)
+                expanded += stats['expanded']
+            ms = 1000 * (time.perf_counter() - t0) / len(pairs)
+            cells.append(f"{expanded / len(pairs):8.1f} ({ms:5.2f}ms)")
+        print(f"{name:>8} " + " ".join(f"{c:>18}" for c in cells))
+
+
+def bench_landmarks(counts=(4, 8, 16), n_pairs=200):
+    """Compara los puntos expandidos con la heurística de círculo máximo y con ALT"""
+    print("== FindShortestNavPath: haversine vs ALT landmarks ==")
+    print(f"{'dataset':>8} {'heuristic':>12} {'build':>9} {'reload':>9} {'expanded':>9} {'query':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, files in DATASETS.items():
+            a = airspace.LoadAirspace(*files)
+            pairs = _ReachablePairs(a, n_pairs)
+            rows = [("haversine", None, 0, 0)]
+            for count in counts:
+                lm, build = _timed(landmarks.BuildLandmarks, a, count)
+                filename = os.path.join(tmp, f"{name}{count}_landmarks.cache")
+                landmarks.SaveLandmarks(lm, filename, list(files))
+                _, reload = _timed(landmarks.LoadLandmarks, filename, list(files))
+                rows.append((f"ALT {count}", lm.lower_bound, build, reload))
+            for label, h, build, reload in rows:
+                expanded = 0
+                t0 = time.perf_counter()
+                for start, end in pairs:
+                    stats = {}
+                    airspace.FindShortestNavPath(a, start, end, heuristic=h, stats=stats)
+                    expanded += stats['expanded']
+                ms = 1000 * (time.perf_counter() - t0) / len(pairs)
+                print(f"{name:>8} {label:>12} {1000 * build:7.1f}ms {1000 * reload:7.2f}ms "
+                      f"{expanded / len(pairs):9.1f} {ms:6.2f}ms")
+
+
+def _Percentiles(samples, percents=(50, 90, 99)):
+    """Percentiles (en ms) de una lista de tiempos en segundos"""
+    samples = sorted(samples)
+    return [1000 * samples[min(len(samples) - 1, len(samples) * p // 100)] for p in percents]
+
+
+def bench_contraction(n_pairs=1000):
+    """Preprocesado, memoria y latencia de las consultas con contraction hierarchies"""
+    print("== Contraction hierarchies vs FindShortestNavPath ==")
+    print(f"{'dataset':>8} {'build':>8} {'memory':>9} {'shortcuts':>9}   "
+          f"{'A* p50/p90/p99 (ms)':>22}   {'CH p50/p90/p99 (ms)':>22}")
+    for name, files in DATASETS.items():
+        a = airspace.LoadAirspace(*files)
+        navgraph_view = navgraph.BuildNavGraph(a)
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        ch = contraction.BuildContractionHierarchy(navgraph_view)
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        _, build = _timed(contraction.BuildContractionHierarchy, navgraph_view)
+        shortcuts = sum(1 for _, middle in ch.edge_data.values() if middle >= 0)
+
+        rng = random.Random(2)
+        numbers = [p.number for p in a.nav_points]
+        pairs = [(rng.choice(numbers), rng.choice(numbers)) for _ in range(n_pairs)]
+        astar = [_timed(airspace.FindShortestNavPath, a, s, e)[1] for s, e in pairs]
+        hierarchy = [_timed(contraction.FindShortestNavPathCH, ch, s, e)[1] for s, e in pairs]
+        cells = ["/".join(f"{ms:.3f}" for ms in _Percentiles(t)) for t in (astar, hierarchy)]
+        print(f"{name:>8} {build:7.2f}s {(after - before) / 2 ** 20:7.2f}MB {shortcuts:>9}   "
+              f"{cells[0]:>22}   {cells[1]:>22}")
+
+
+def _PairwiseDistances(a, sources, targets):
+    """Distancias origen-destino con una búsqueda FindShortestNavPath por par"""
+    paths = [airspace.FindShortestNavPath(a, s, t) for s in sources for t in targets]
+    return [p.cost if p else float('inf') for p in paths]
+
+
+def bench_distance_matrix(processes=(1, 4)):
+    """Matriz SID x STAR de los aeropuertos: búsquedas por par frente a una búsqueda por origen"""
+    print(f"== Airport SID x STAR distance matrix ({os.cpu_count()} CPUs) ==")
+    print(f"{'dataset':>8} {'size':>8} {'pairwise':>10} " + " ".join(f"{f'{p} proc':>10}" for p in processes))
+    for name, files in DATASETS.items():
+        a = airspace.LoadAirspace(*files)
+        view = navgraph.BuildNavGraph(a)
+        matrix = distance_matrix.BuildAirportDistanceMatrix(view)
+        _, pairwise = _timed(_PairwiseDistances, a, matrix.sources, matrix.targets)
+        cells = [_timed(distance_matrix.BuildAirportDistanceMatrix, view, processes=p)[1] for p in processes]
+        size = f"{len(matrix.sources)}x{len(matrix.targets)}"
+        print(f"{name:>8} {size:>8} {1000 * pairwise:8.1f}ms " + " ".join(f"{1000 * t:8.1f}ms" for t in cells))
+
+
+def bench_path_cache(n_origins=5, n_destinations=50):
+    """Consultas repetidas desde el mismo origen: A* frente a la caché de árboles"""
+    print("== Repeated origin queries: FindShortestNavPath vs ShortestPathTreeCache ==")
+    print(f"{'dataset':>8} {'A*':>10} {'cache':>10} {'stats':>30}")
+    for name, files in DATASETS.items():
+        a = airspace.LoadAirspace(*files)
+        rng = random.Random(4)
+        numbers = [p.number for p in a.nav_points]
+        queries = [(start, rng.choice(numbers)) for start in rng.sample(numbers, n_origins)
+                   for _ in range(n_destinations)]
+        cache = spt_cache.ShortestPathTreeCache()
+        _, astar = _timed(lambda: [airspace.FindShortestNavPath(a, s, e) for s, e in queries])
+        _, cached = _timed(lambda: [cache.shortest_nav_path(a, s, e) for s, e in queries])
+        stats = f"{cache.hits} hits / {cache.misses} misses"
+        print(f"{name:>8} {1000 * astar / len(queries):8.3f}ms {1000 * cached / len(queries):8.3f}ms {stats:>30}")
+
+
+def bench_segment_closure(n_closures=100):
+    """Cerrar un segmento del camino y volver a calcular: reparación del árbol frente a Dijkstra completo"""
+    print("== Close a segment on the route and re-route: repair vs full recomputation ==")
+    print(f"{'dataset':>8} {'full':>10} {'repair':>10} {'repaired':>9} {'reached':>8}")
+    for name, files in DATASETS.items():
+        a = airspace.LoadAirspace(*files)
+        rng = random.Random(6)
+        numbers = [p.number for p in a.nav_points]
+        full = repair = 0
+        repaired = reached = 0
+        for _ in range(n_closures):
+            tree = shortest_path_tree.ShortestPathTree(a, rng.choice(numbers))
+            reached += len(tree.distances)
+            path = tree.path_to(rng.choice(list(tree.distances)))
+            if len(path.points) < 2:
+                continue
+            k = rng.randrange(len(path.points) - 1)
+            origin, destination = path.points[k].number, path.points[k + 1].number
+            distance = next(s.distance for s in a.get_outgoing_segments(origin)
+                            if s.destination_number == destination)
+            a.remove_nav_segment(origin, destination)
+            _, seconds = _timed(tree.update)
+            repair += seconds
+            repaired += tree.repaired
+            _, seconds = _timed(airspace.NavDijkstra, a, tree.origin)
+            full += seconds
+            a.add_nav_segment(airspace.NavSegment(origin, destination, distance))  # Reabrir el segmento
+        print(f"{name:>8} {1000 * full / n_closures:8.3f}ms {1000 * repair / n_closures:8.3f}ms "
+              f"{repaired / n_closures:9.1f} {reached / n_closures:8.1f}")
+
+
+def bench_k_shortest(k=10, n_pairs=20):
+    """k caminos sin ciclos más cortos (Yen) entre puntos SID y STAR de aeropuertos distintos"""
+    print(f"== FindKShortestNavPaths: k={k} between airports ==")
+    print(f"{'dataset':>8} {'pairs':>6} {'mean':>10} {'max':>10} {'found':>6}")
+    for name, files in DATASETS.items():
+        a = airspace.LoadAirspace(*files)
+        rng = random.Random(7)
+        airports = [ap for ap in a.nav_airports if ap.sids and ap.stars]
+        if len(airports) < 2:
+            continue
+        times, found = [], 0
+        for _ in range(n_pairs):
+            origin, destination = rng.sample(airports, 2)
+            paths, seconds = _timed(k_shortest.FindKShortestNavPaths, a, origin.sids[0], destination.stars[0], k)
+            times.append(seconds)
+            found += len(paths)
+        print(f"{name:>8} {n_pairs:>6} {1000 * sum(times) / n_pairs:8.2f}ms {1000 * max(times):8.2f}ms "
+              f"{found / n_pairs:6.1f}")
+
+
+def bench_pareto(n_pairs=20):
+    """Frente de Pareto (distancia, segmentos) entre aeropuertos distintos"""
+    print("== FindParetoNavRoutes: distance / hops front between airports ==")
+    print(f"{'dataset':>8} {'pairs':>6} {'mean':>10} {'max':>10} {'front':>6}")
+    for name, files in DATASETS.items():
+        a = airspace.LoadAirspace(*files)
+        rng = random.Random(8)
+        airports = [ap for ap in a.nav_airports if ap.sids and ap.stars]
+        if len(airports) < 2:
+            continue
+        times, sizes = [], 0
+        for _ in range(n_pairs):
+            origin, destination = rng.sample(airports, 2)
+            routes, seconds = _timed(pareto.FindParetoNavRoutes, a, origin.sids[0], destination.stars[0])
+            times.append(seconds)
+            sizes += len(routes)
+        print(f"{name:>8} {n_pairs:>6} {1000 * sum(times) / n_pairs:8.2f}ms {1000 * max(times):8.2f}ms "
+              f"{sizes / n_pairs:6.1f}")
+
+
+def bench_avoid(n_pairs=100, n_avoid=500):
+    """A* sin restricciones frente a A* evitando n_avoid puntos al azar (filtro sobre la adyacencia)"""
+    print(f"== FindAlternativeNavPath: avoiding {n_avoid} random points ==")
+    print(f"{'dataset':>8} {'A*':>10} {'avoid':>10}")
+    for name, files in DATASETS.items():
+        a = airspace.LoadAirspace(*files)
+        rng = random.Random(9)
+        pairs = _ReachablePairs(a, n_pairs, seed=9)
+        numbers = [p.number for p in a.nav_points]
+        avoid = set(rng.sample(numbers, min(n_avoid, len(numbers) // 4))) - {n for pair in pairs for n in pair}
+        _, plain = _timed(lambda: [airspace.FindShortestNavPath(a, s, e) for s, e in pairs])
+        _, avoiding = _timed(lambda: [airspace.FindAlternativeNavPath(a, s, e, avoid) for s, e in pairs])
+        print(f"{name:>8} {1000 * plain / n_pairs:8.3f}ms {1000 * avoiding / n_pairs:8.3f}ms")
+
+
+def bench_bounded_reachability(n_starts=200, max_hops=6, max_distance=400):
+    """Alcance acotado por segmentos o por km: recorrido completo, consultas sueltas y por lotes"""
+    print(f"== Bounded reachability ({max_hops} hops / {max_distance} km, {n_starts} starts) ==")
+    print(f"{'dataset':>8} {'all':>9} {'hops':>9} {'hops batch':>11} {'km':>9} {'points':>7}")
+    for name, files in DATASETS.items():
+        a = airspace.LoadAirspace(*files)
+        starts = random.Random(10).sample([p.number for p in a.nav_points], min(n_starts, len(a.nav_points)))
+        airspace.GetReachableNavPoints(a, starts[0])  # Construir la vista CSR antes de medir
+        _, t_all = _timed(lambda: [airspace.GetReachableNavPoints(a, s) for s in starts])
+        t_hops = _best(lambda: [reachability.ReachableNavPointsWithin(a, s, max_hops=max_hops) for s in starts])
+        t_batch = _best(reachability.ReachableNavPointsWithinBatch, a, starts, max_hops)
+        found, t_km = _timed(lambda: [reachability.ReachableNavPointsWithin(a, s, max_distance=max_distance)
+                                      for s in starts])
+        points = sum(len(f) for f in found) / len(starts)
+        print(f"{name:>8} {1000 * t_all:7.1f}ms {1000 * t_hops:7.1f}ms {1000 * t_batch:9.1f}ms "
+              f"{1000 * t_km:7.1f}ms {points:7.1f}")
+
+
+def bench_unreachable(n_pairs=200):
+    """Consultas sin camino: A* completo frente a la comprobación con componentes fuertemente conexos"""
+    print("== Unreachable route queries: A* vs strong components check ==")
+    print(f"{'dataset':>8} {'components':>11} {'build':>9} {'A*':>10} {'check':>10}")
+    for name, files in DATASETS.items():
+        a = airspace.LoadAirspace(*files)
+        components, t_build = _timed(strong_components.GetStrongComponents, a)
+        rng = random.Random(11)
+        numbers = [p.number for p in a.nav_points]
+        pairs = []
+        while len(pairs) < n_pairs:
+            start, end = rng.choice(numbers), rng.choice(numbers)
+            if not components.can_reach(start, end):
+                pairs.append((start, end))
+        _, t_astar = _timed(lambda: [airspace.FindShortestNavPath(a, s, e) for s, e in pairs])
+        _, t_check = _timed(lambda: [strong_components.CanReachNavPoint(a, s, e) for s, e in pairs])
+        print(f"{name:>8} {components.count:>11} {1000 * t_build:7.2f}ms {1000 * t_astar / n_pairs:8.3f}ms "
+              f"{1e6 * t_check / n_pairs:8.2f}us")
+
+
+def bench_connectivity(n_nodes=841, n_pairs=200):
+    """Consulta "¿están conectados A y B?": BFS completo frente a union-find"""
+    print("== Graph connectivity: GetReachableNodes vs union-find ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "graph.txt")
+        WriteSyntheticGraphFile(filename, n_nodes)
+        g = graph.LoadGraphFromFile(filename)
+    pairs = _RandomPairs([n.name for n in g.nodes], n_pairs)
+    _, t_bfs = _timed(lambda: [b in {n.name for n in path.GetReachableNodes(g, a)} for a, b in pairs])
+    _, t_uf = _timed(lambda: [graph.AreConnected(g, a, b) for a, b in pairs])
+    segment = g.segments[0]
+    graph.RemoveSegment(g, segment.origin.name, segment.destination.name)
+    _, t_rebuild = _timed(graph.AreConnected, g, *pairs[0])
+    print(f"BFS: {1000 * t_bfs / n_pairs:.3f} ms/query, union-find: {1e6 * t_uf / n_pairs:.2f} us/query, "
+          f"rebuild after a removal: {1000 * t_rebuild:.2f} ms")
+
+
+def bench_closest(n_queries=1000, n_synthetic=1000000):
+    """Punto más cercano a un clic: recorrido lineal frente al índice de rejilla"""
+    print("== Closest point to a click: linear scan vs grid index ==")
+    print(f"{'dataset':>8} {'points':>8} {'build':>9} {'linear':>10} {'grid':>9}")
+    rng = random.Random(5)
+
+    def row(name, numbers, lons, lats):
+        index, t_build = _timed(spatial_index.GridIndex, numbers, lons, lats)
+        clicks = [(rng.uniform(min(lons), max(lons)), rng.uniform(min(lats), max(lats))) for _ in range(n_queries)]
+        n_linear = max(1, min(n_queries, 10 ** 7 // len(numbers)))
+        _, t_linear = _timed(lambda: [min(range(len(numbers)), key=lambda i: (lons[i] - x) ** 2 + (lats[i] - y) ** 2)
+                                      for x, y in clicks[:n_linear]])
+        _, t_grid = _timed(lambda: [index.nearest(x, y) for x, y in clicks])
+        print(f"{name:>8} {len(numbers):>8} {1000 * t_build:7.1f}ms {1000 * t_linear / n_linear:8.3f}ms "
+              f"{1e6 * t_grid / n_queries:7.2f}us")
+
+    for name, files in DATASETS.items():
+        a = compact_airspace.LoadAirspaceCompact(*files)
+        row(name, a.numbers, a.longitudes, a.latitudes)
+    lons = [rng.uniform(-30, 40) for _ in range(n_synthetic)]
+    lats = [rng.uniform(30, 70) for _ in range(n_synthetic)]
+    row("random", range(n_synthetic), lons, lats)
+
+
+if __name__ == "__main__":
+    bench_load_graph()
+    bench_graph_queries()
+    bench_nav_heuristics()
+    bench_airspace_loading()
+    bench_airspace_cache()
+    bench_csr()
+    bench_bidirectional()
+    bench_landmarks()
+    bench_contraction()
+    bench_distance_matrix()
+    bench_path_cache()
+    bench_segment_closure()
+    bench_k_shortest()
+    bench_pareto()
+    bench_avoid()
+    bench_bounded_reachability()
+    bench_unreachable()
+    bench_connectivity()
+    bench_closest()
@@ -0,0 +1,46 @@
+from collections import deque
+
+
+class ChangeLog:
+    def __init__(self, max_entries=1000):
+        """
+        Registro de cambios de un Graph o AirSpace con un número de versión creciente
+
+        Cada cambio incrementa la versión y guarda (versión, tipo, objeto afectado).
+        Solo se conservan los últimos max_entries cambios.
+
+        Tipos usados: 'add_node', 'remove_node' y 'add_point' (el objeto es el nodo o
+        NavPoint); 'add_segment', 'remove_segment' y 'change_segment' (el objeto es el
+        Segment o NavSegment, con su costo actual).
+
+        Args:
+            max_entries (int): Número de cambios que se conservan (opcional)
+        """
+        self.version = 0
+        self.entries = deque(maxlen=max_entries)
+
+    def __repr__(self):
+        return f"ChangeLog(version={self.version}, {len(self.entries)} entries)"
+
+    def record(self, kind, item):
+        """Registra un cambio y devuelve la nueva versión"""
+        self.version += 1
+        self.entries.append((self.version, kind, item))
+        return self.version
+
+    def since(self, version):
+        """
+        Cambios posteriores a una versión
+
+        Args:
+            version (int): Versión con la que se calculó una estructura derivada
+
+        Returns:
+            list: Lista de (versión, tipo, objeto) en orden, o None si el registro ya no
+            llega tan atrás (hay que reconstruir la estructura)
+        """
+        if version >= self.version:
+            return []
+        if not self.entries or self.entries[0][0] > version + 1:
+            return None
+        return [entry for entry in self.entries if entry[0] > version]
@@ -0,0 +1,548 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import Counter
+from itertools import accumulate
+
+from changelog import ChangeLog
+from spatial_index import GridIndex
+from airspace import NavPoint, NavSegment, NavAirport, LoadNavAirports
+
+
+class LazyRows:
+    """
+    Secuencia de solo lectura que crea los objetos fila a fila cuando se accede a ellos
+
+    Args:
+        size (callable): Función que devuelve el número de filas
+        build (callable): Función fila -> objeto (NavPoint o NavSegment)
+    """
+
+    def __init__(self, size, build):
+        self._size = size
+        self._build = build
+
+    def __len__(self):
+        return self._size()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._build(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        return self._build(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._build(i)
+
+    def __bool__(self):
+        return len(self) > 0
+
+
+# Columnas numéricas de CompactAirSpace
+COLUMNS = ('numbers', 'latitudes', 'longitudes', 'origin_rows', 'destination_rows', 'distances')
+
+
+class CompactAirSpace:
+    def __init__(self):
+        """
+        Espacio aéreo guardado por columnas (arrays compactos en lugar de un objeto por fila)
+
+        Ofrece la misma interfaz que AirSpace (nav_points, nav_segments, nav_airports,
+        get_point, get_outgoing_segments...), así que se puede usar con FindShortestNavPath,
+        GetReachableNavPoints o la interfaz gráfica. Los NavPoint y NavSegment solo se
+        crean cuando alguien accede a ellos.
+        """
+        # Columnas de los puntos de navegación
+        self.numbers = array('q')
+        self.names = []
+        self.latitudes = array('d')
+        self.longitudes = array('d')
+
+        # Columnas de los segmentos (filas de origen y destino en las columnas de puntos)
+        self.origin_rows = array('q')
+        self.destination_rows = array('q')
+        self.distances = array('d')
+
+        self.nav_airports = []  # Lista de NavAirport
+        self.nav_points = LazyRows(lambda: len(self.numbers), self.point_at)
+        self.nav_segments = LazyRows(lambda: len(self.distances), self.segment_at)
+
+        self.row_of = {}  # Número de punto -> fila
+        self._point_cache = {}  # Fila -> NavPoint ya creado
+        self._segment_cache = {}  # Fila -> NavSegment ya creado
+        self._adjacency = None  # Índices de segmentos por origen y destino (se crean al primer uso)
+        self._spatial = None  # GridIndex de números de punto por (longitud, latitud), se crea al primer uso
+        self._views = {}  # Tipo -> vista CSR de reachability (se reconstruye al cambiar version)
+        self._components = None  # StrongComponents de la última versión consultada
+        self.changes = ChangeLog()  # Versión y últimos cambios (para invalidar o actualizar cachés)
+
+    def point_at(self, row):
+        """Devuelve (creándolo si hace falta) el NavPoint de una fila"""
+        point = self._point_cache.get(row)
+        if point is None:
+            point = NavPoint(self.numbers[row], self.names[row],
+                             self.latitudes[row], self.longitudes[row])
+            self._point_cache[row] = point
+        return point
+
+    def segment_at(self, row):
+        """Devuelve (creándolo si hace falta) el NavSegment de una fila"""
+        segment = self._segment_cache.get(row)
+        if segment is None:
+            segment = NavSegment(self.numbers[self.origin_rows[row]],
+                                 self.numbers[self.destination_rows[row]],
+                                 self.distances[row])
+            self._segment_cache[row] = segment
+        return segment
+
+    def _ensure_writable(self):
+        """Copia a arrays propios las columnas que vienen de un archivo mapeado en memoria"""
+        for column in COLUMNS:
+            values = getattr(self, column)
+            if isinstance(values, memoryview):
+                setattr(self, column, array(values.format, values))
+
+    def add_nav_point(self, point):
+        """Añade un punto de navegación si su número no existe todavía"""
+        if point.number in self.row_of:
+            return False
+        self._ensure_writable()
+        row = len(self.numbers)
+        self.numbers.append(point.number)
+        self.names.append(point.name)
+        self.latitudes.append(point.latitude)
+        self.longitudes.append(point.longitude)
+        self.row_of[point.number] = row
+        self._point_cache[row] = point
+        if self._spatial is not None:
+            self._spatial.add(point.number, point.longitude, point.latitude)
+        self.changes.record('add_point', point)
+        return True
+
+    def add_nav_segment(self, segment):
+        """
+        Añade un segmento entre dos puntos existentes (igual que AirSpace.add_nav_segment)
+
+        Returns:
+            bool: True si se añadió, False si el origen o el destino no existen
+        """
+        origin = self.row_of.get(segment.origin_number)
+        destination = self.row_of.get(segment.destination_number)
+        if origin is None or destination is None:
+            return False
+        self._ensure_writable()
+        row = len(self.distances)
+        self.origin_rows.append(origin)
+        self.destination_rows.append(destination)
+        self.distances.append(segment.distance)
+        self._segment_cache[row] = segment
+        if self._adjacency is not None:
+            self._adjacency[2].setdefault(origin, []).append(row)
+            self._adjacency[3].setdefault(destination, []).append(row)
+        self.changes.record('add_segment', segment)
+        return True
+
+    def _find_segment_row(self, origin_number, destination_number):
+        """Fila del primer segmento origin -> destination, o None si no existe"""
+        for row in self._segment_rows(origin_number, 0, 2):
+            if self.numbers[self.destination_rows[row]] == destination_number:
+                return row
+        return None
+
+    def remove_nav_segment(self, origin_number, destination_number):
+        """Elimina el segmento origin -> destination (el primero si hay varios)"""
+        row = self._find_segment_row(origin_number, destination_number)
+        if row is None:
+            return False
+        segment = self.segment_at(row)
+        self._ensure_writable()
+        del self.origin_rows[row]
+        del self.destination_rows[row]
+        del self.distances[row]
+        # Las filas siguientes se desplazan: se renumera la caché y se rehacen los índices
+        self._segment_cache = {r - (r > row): s for r, s in self._segment_cache.items() if r != row}
+        self._adjacency = None
+        self.changes.record('remove_segment', segment)
+        return True
+
+    def set_segment_distance(self, origin_number, destination_number, distance):
+        """Cambia la distancia del segmento origin -> destination (el primero si hay varios)"""
+        row = self._find_segment_row(origin_number, destination_number)
+        if row is None:
+            return False
+        self._ensure_writable()
+        self.distances[row] = distance
+        segment = self.segment_at(row)
+        segment.distance = distance
+        self.changes.record('change_segment', segment)
+        return True
+
+    @property
+    def version(self):
+        """Versión actual (se incrementa con cada cambio registrado en changes)"""
+        return self.changes.version
+
+    def get_point(self, number):
+        """Obtiene un NavPoint por su número, o None si no existe"""
+        row = self.row_of.get(number)
+        if row is None:
+            return None
+        return self.point_at(row)
+
+    def get_outgoing_segments(self, number):
+        """Obtiene los segmentos que salen del punto indicado"""
+        return [self.segment_at(row) for row in self._segment_rows(number, 0, 2)]
+
+    def spatial_index(self):
+        """Índice espacial (GridIndex) de los números de punto, creado la primera vez desde las columnas"""
+        if self._spatial is None:
+            self._spatial = GridIndex(self.numbers, self.longitudes, self.latitudes)
+        return self._spatial
+
+    def get_incoming_segments(self, number):
+        """Obtiene los segmentos que llegan al punto indicado"""
+        return [self.segment_at(row) for row in self._segment_rows(number, 1, 3)]
+
+    def _segment_rows(self, number, grouped, extra):
+        point_row = self.row_of.get(number)
+        if point_row is None:
+            return []
+        adjacency = self.adjacency()
+        offsets, order = adjacency[grouped]
+        rows = []
+        if point_row + 1 < len(offsets):
+            rows = order[offsets[point_row]:offsets[point_row + 1]].tolist()
+        return rows + adjacency[extra].get(point_row, [])
+
+    def adjacency(self):
+        """
+        Índices de segmentos agrupados por punto, creados la primera vez que se piden
+
+        Returns:
+            tuple: ((offsets, order) por origen, (offsets, order) por destino,
+                    segmentos salientes añadidos después, segmentos entrantes añadidos después)
+        """
+        if self._adjacency is None:
+            self._adjacency = (_GroupRows(self.origin_rows, len(self.numbers)),
+                               _GroupRows(self.destination_rows, len(self.numbers)),
+                               {}, {})
+        return self._adjacency
+
+
+def _GroupRows(keys, n_groups):
+    """
+    Agrupa las filas de segmentos por punto (ordenación por recuento)
+
+    Returns:
+        tuple: (offsets, order) de forma que las filas del grupo g son
+               order[offsets[g]:offsets[g + 1]]
+    """
+    order = array('q', sorted(range(len(keys)), key=keys.__getitem__))
+    counts = Counter(keys)
+    offsets = array('q', accumulate((counts.get(g, 0) for g in range(n_groups)), initial=0))
+    return offsets, order
+
+
+def LoadAirspaceCompact(nav_file, seg_file, airport_file):
+    """
+    Carga el espacio aéreo en columnas, leyendo cada archivo de una sola vez
+
+    Args:
+        nav_file (str): Ruta al archivo de puntos de navegación
+        seg_file (str): Ruta al archivo de segmentos
+        airport_file (str): Ruta al archivo de aeropuertos
+
+    Returns:
+        CompactAirSpace: Espacio aéreo con los datos en arrays compactos
+    """
+    airspace = CompactAirSpace()
+
+    # 1. Cargar puntos de navegación
+    with open(nav_file, 'r') as f:
+        tokens = _ReadTokens(f, 4)
+    if tokens is not None:
+        try:
+            numbers = array('q', map(int, tokens[0::4]))
+            latitudes = array('d', map(float, tokens[2::4]))
+            longitudes = array('d', map(float, tokens[3::4]))
+        except ValueError:
+            tokens = None
+    if tokens is not None:
+        row_of = dict(zip(numbers, range(len(numbers))))
+        if len(row_of) != len(numbers):
+            tokens = None  # Números repetidos
+    if tokens is not None:
+        airspace.numbers = numbers
+        airspace.names = tokens[1::4]
+        airspace.latitudes = latitudes
+        airspace.longitudes = longitudes
+        airspace.row_of = row_of
+    else:
+        # Formato irregular: procesar línea a línea como LoadAirspace
+        for parts in _ReadLines(nav_file):
+            try:
+                point = NavPoint(int(parts[0]), parts[1], float(parts[2]), float(parts[3]))
+            except (IndexError, ValueError):
+                print(f"Error al procesar línea en {nav_file}: {' '.join(parts)}")
+                continue
+            airspace.add_nav_point(point)
+        airspace._point_cache.clear()
+
+    # 2. Cargar segmentos
+    with open(seg_file, 'r') as f:
+        tokens = _ReadTokens(f, 3)
+    if tokens is not None:
+        try:
+            airspace.origin_rows = array('q', map(airspace.row_of.__getitem__, map(int, tokens[0::3])))
+            airspace.destination_rows = array('q', map(airspace.row_of.__getitem__, map(int, tokens[1::3])))
+            airspace.distances = array('d', map(float, tokens[2::3]))
+        except (KeyError, ValueError):
+            airspace.origin_rows = array('q')
+            airspace.destination_rows = array('q')
+            airspace.distances = array('d')
+            tokens = None
+    if tokens is None:
+        for parts in _ReadLines(seg_file):
+            try:
+                segment = NavSegment(int(parts[0]), int(parts[1]), float(parts[2]))
+            except (IndexError, ValueError):
+                print(f"Error al procesar línea en {seg_file}: {' '.join(parts)}")
+                continue
+            if not airspace.add_nav_segment(segment):
+                print(f"Segmento con puntos desconocidos en {seg_file}: {' '.join(parts)}")
+        airspace._segment_cache.clear()
+
+    # 3. Cargar aeropuertos
+    airspace.nav_airports = LoadNavAirports(airport_file, dict(zip(airspace.names, airspace.numbers)))
+
+    return airspace
+
+
+def _ReadTokens(f, columns):
+    """Lee todo el archivo y lo divide en palabras, o None si no tiene el formato esperado"""
+    text = f.read()
+    if '#' in text:
+        return None  # Hay comentarios: se procesa línea a línea
+    tokens = text.split()
+    if '\n\n' in text or text.startswith('\n'):
+        lines = text.splitlines()
+        n_lines = len(lines) - lines.count('')
+    else:
+        n_lines = text.count('\n') + (not text.endswith('\n'))
+    if len(tokens) != columns * n_lines:
+        return None  # Alguna línea no tiene exactamente el número de columnas esperado
+    return tokens
+
+
+def _ReadLines(filename):
+    """Devuelve las líneas no vacías (y sin comentarios) del archivo ya divididas"""
+    with open(filename, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            yield line.split()
+
+
+# Formato de la caché binaria: CACHE_MAGIC, versión y longitud de la cabecera (CACHE_HEADER),
+# cabecera JSON y después cada sección alineada a 8 bytes
+CACHE_MAGIC = b'AIRSPACE'
+CACHE_VERSION = 2  # 2: aeropuertos con sus SID/STAR resueltos
+CACHE_HEADER = struct.Struct('<8sII')
+CACHE_SECTIONS = COLUMNS + ('out_offsets', 'out_order', 'in_offsets', 'in_order')
+
+
+def _SourceSignature(filename, with_hash=True):
+    """Firma de un archivo de datos: ruta, fecha de modificación, tamaño y hash"""
+    stat = os.stat(filename)
+    signature = {'path': os.path.abspath(filename), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+    if with_hash:
+        with open(filename, 'rb') as f:
+            signature['sha1'] = hashlib.sha1(f.read()).hexdigest()
+    return signature
+
+
+def _SourcesUnchanged(saved, source_files):
+    """Comprueba que los archivos de datos no han cambiado desde que se creó la caché"""
+    if len(saved) != len(source_files):
+        return False
+    for signature, filename in zip(saved, source_files):
+        if not os.path.exists(filename):
+            return False
+        current = _SourceSignature(filename, with_hash=False)
+        if current['path'] != signature['path'] or current['size'] != signature['size']:
+            return False
+        # Si solo cambió la fecha (copia, checkout...) se compara el contenido
+        if current['mtime_ns'] != signature['mtime_ns'] and \
+                _SourceSignature(filename)['sha1'] != signature['sha1']:
+            return False
+    return True
+
+
+def SaveAirspaceCache(airspace, cache_file, source_files):
+    """
+    Guarda un CompactAirSpace (con sus índices de adyacencia) en una caché binaria
+
+    El archivo se escribe primero con otro nombre y luego se renombra, de forma que
+    otros procesos nunca leen una caché a medio escribir.
+
+    Args:
+        airspace (CompactAirSpace): Espacio aéreo a guardar
+        cache_file (str): Ruta del archivo de caché
+        source_files (list): Archivos de texto de los que procede (para invalidar la caché)
+
+    Returns:
+        bool: True si se guardó correctamente, False si no
+    """
+    (out_offsets, out_order), (in_offsets, in_order), extra_out, extra_in = airspace.adjacency()
+    if extra_out or extra_in:
+        airspace._adjacency = None  # Hay segmentos añadidos después: reconstruir los índices
+        (out_offsets, out_order), (in_offsets, in_order), _, _ = airspace.adjacency()
+    sections = {column: getattr(airspace, column) for column in COLUMNS}
+    sections.update(out_offsets=out_offsets, out_order=out_order,
+                    in_offsets=in_offsets, in_order=in_order)
+
+    header = {
+        'byteorder': sys.byteorder,
+        'sources': [_SourceSignature(f) for f in source_files],
+        'names': '\n'.join(airspace.names),
+        'airports': [[a.name, a.sids, a.stars] for a in airspace.nav_airports],
+        'sections': {},
+    }
+    # Calcular la posición de cada sección, alineada a 8 bytes
+    offset = 0
+    for name in CACHE_SECTIONS:
+        values = sections[name]
+        typecode = values.format if isinstance(values, memoryview) else values.typecode
+        header['sections'][name] = [offset, len(values), typecode]
+        offset += len(values) * values.itemsize
+    header_bytes = json.dumps(header).encode('utf-8')
+    start = CACHE_HEADER.size + len(header_bytes)
+    padding = -start % 8
+
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, len(header_bytes) + padding))
+            f.write(header_bytes + b' ' * padding)
+            for name in CACHE_SECTIONS:
+                f.write(sections[name])
+        os.replace(tmp_file, cache_file)
+        return True
+    except OSError as e:
+        print(f"Error saving airspace cache: {e}")
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        return False
+
+
+def _CheckCacheSections(sections, start, file_size):
+    """
+    Comprueba que las secciones de la cabecera caben en el archivo y tienen longitudes coherentes
+
+    Returns:
+        dict: Nombre -> (byte inicial, byte final, typecode) de cada sección
+
+    Raises:
+        ValueError: Si falta alguna sección, se sale del archivo o su longitud no cuadra
+    """
+    layout = {}
+    lengths = {}
+    for name in CACHE_SECTIONS:
+        offset, length, typecode = sections[name]
+        if typecode != ('d' if name in ('latitudes', 'longitudes', 'distances') else 'q'):
+            raise ValueError(f"La sección {name} tiene un tipo inesperado ({typecode})")
+        begin = start + offset
+        end = begin + length * array(typecode).itemsize
+        if offset < 0 or length < 0 or end > file_size:
+            raise ValueError(f"La sección {name} se sale del archivo")
+        layout[name] = (begin, end, typecode)
+        lengths[name] = length
+
+    n_points, n_segments = lengths['numbers'], lengths['distances']
+    expected = dict.fromkeys(('numbers', 'latitudes', 'longitudes'), n_points)
+    expected.update(dict.fromkeys(('origin_rows', 'destination_rows', 'distances', 'out_order', 'in_order'), n_segments))
+    expected.update(out_offsets=n_points + 1, in_offsets=n_points + 1)
+    for name, length in expected.items():
+        if lengths[name] != length:
+            raise ValueError(f"La sección {name} tiene {lengths[name]} valores en lugar de {length}")
+    return layout
+
+
+def LoadAirspaceCache(cache_file, source_files=None):
+    """
+    Abre una caché binaria mapeándola en memoria (sin copiar las columnas)
+
+    Args:
+        cache_file (str): Ruta del archivo de caché
+        source_files (list): Si se indica, la caché se descarta si estos archivos han cambiado
+
+    Returns:
+        CompactAirSpace: Espacio aéreo cargado, o None si la caché no existe o no es válida
+    """
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        with open(cache_file, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        magic, version, header_size = CACHE_HEADER.unpack_from(mapping, 0)
+        if magic != CACHE_MAGIC or version != CACHE_VERSION:
+            raise ValueError("Formato de caché desconocido")
+        start = CACHE_HEADER.size + header_size
+        if start > len(mapping):
+            raise ValueError("Cabecera incompleta")
+        header = json.loads(mapping[CACHE_HEADER.size:start].decode('utf-8'))
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError("Orden de bytes distinto")
+        if source_files is not None and not _SourcesUnchanged(header['sources'], source_files):
+            raise ValueError("Los archivos de origen han cambiado")
+        layout = _CheckCacheSections(header['sections'], start, len(mapping))
+        n_points = header['sections']['numbers'][1]
+        names = header['names'].split('\n') if n_points else []
+        if len(names) != n_points:
+            raise ValueError("El número de nombres no coincide con el de puntos")
+        airports = [NavAirport(name, sids, stars) for name, sids, stars in header['airports']]
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        mapping.close()
+        return None
+
+    data = memoryview(mapping)
+    sections = {name: data[begin:end].cast(typecode) for name, (begin, end, typecode) in layout.items()}
+
+    airspace = CompactAirSpace()
+    for column in COLUMNS:
+        setattr(airspace, column, sections[column])
+    airspace.names = names
+    airspace.nav_airports = airports
+    airspace.row_of = dict(zip(airspace.numbers, range(len(airspace.numbers))))
+    airspace._adjacency = ((sections['out_offsets'], sections['out_order']),
+                           (sections['in_offsets'], sections['in_order']), {}, {})
+    airspace._mapping = mapping  # Mantener el archivo mapeado mientras se use
+    return airspace
+
+
+def LoadAirspaceWithCache(nav_file, seg_file, airport_file, cache_file):
+    """
+    Carga el espacio aéreo desde la caché binaria si sigue siendo válida; si no,
+    lo carga desde los archivos de texto y vuelve a crear la caché
+
+    Returns:
+        CompactAirSpace: Espacio aéreo cargado
+    """
+    source_files = [nav_file, seg_file, airport_file]
+    airspace = LoadAirspaceCache(cache_file, source_files)
+    if airspace is None:
+        airspace = LoadAirspaceCompact(nav_file, seg_file, airport_file)
+        SaveAirspaceCache(airspace, cache_file, source_files)
+    return airspace
@@ -0,0 +1,281 @@
+import heapq
+from array import array
+
+from navgraph import BuildNavGraph
+from path import Path
+
+INFINITY = float('inf')
+
+
+class ContractionHierarchy:
+    def __init__(self, navgraph, rank, up, down, edge_data):
+        """
+        Jerarquía de contracción de un espacio aéreo (contraction hierarchies)
+
+        Los puntos se identifican por su índice en el NavGraph. Cada punto tiene un
+        rango (orden de contracción); las búsquedas solo suben de rango.
+
+        Args:
+            navgraph (NavGraph): Vista CSR del espacio aéreo original
+            rank (array): Rango de cada índice
+            up (tuple): (offsets, targets, weights) de los segmentos hacia puntos de rango mayor
+            down (tuple): (offsets, sources, weights) de los segmentos que llegan desde
+                puntos de rango mayor (para la búsqueda hacia atrás)
+            edge_data (dict): (origen, destino) -> (distancia, punto intermedio o -1)
+        """
+        self.navgraph = navgraph
+        self.rank = rank
+        self.up = up
+        self.down = down
+        self.edge_data = edge_data
+
+    def __repr__(self):
+        shortcuts = sum(1 for _, middle in self.edge_data.values() if middle >= 0)
+        return f"ContractionHierarchy with {len(self.rank)} points and {shortcuts} shortcuts"
+
+    def unpack(self, indices):
+        """
+        Sustituye los atajos de un camino por los segmentos originales
+
+        Args:
+            indices (list): Índices del camino en la jerarquía
+
+        Returns:
+            tuple: (índices del camino original, distancias de cada segmento original)
+        """
+        path = [indices[0]]
+        distances = []
+        for origin, destination in zip(indices, indices[1:]):
+            stack = [(origin, destination)]
+            while stack:
+                u, w = stack.pop()
+                distance, middle = self.edge_data[(u, w)]
+                if middle < 0:
+                    path.append(w)
+                    distances.append(distance)
+                else:
+                    # Se procesa primero u -> middle y después middle -> w
+                    stack.append((middle, w))
+                    stack.append((u, middle))
+        return path, distances
+
+
+def _WitnessSearch(out_edges, source, skipped, max_cost, settle_limit):
+    """
+    Dijkstra local desde source sin pasar por skipped, limitado en coste y en puntos fijados
+
+    Returns:
+        dict: Distancias encontradas (puede faltar algún punto si se llegó al límite)
+    """
+    distances = {source: 0}
+    heap = [(0, source)]
+    settled = 0
+    while heap and settled < settle_limit:
+        dist, current = heapq.heappop(heap)
+        if dist > distances[current]:
+            continue
+        if dist > max_cost:
+            break
+        settled += 1
+        for neighbor, (weight, _) in out_edges[current].items():
+            if neighbor == skipped:
+                continue
+            alt = dist + weight
+            if alt < distances.get(neighbor, INFINITY):
+                distances[neighbor] = alt
+                heapq.heappush(heap, (alt, neighbor))
+    return distances
+
+
+def _Shortcuts(out_edges, in_edges, v, settle_limit):
+    """Atajos (u, w, distancia) necesarios para contraer v sin cambiar ninguna distancia"""
+    shortcuts = []
+    for u, (weight_in, _) in in_edges[v].items():
+        targets = {w: weight_in + weight_out for w, (weight_out, _) in out_edges[v].items() if w != u}
+        if not targets:
+            continue
+        witness = _WitnessSearch(out_edges, u, v, max(targets.values()), settle_limit)
+        for w, cost in targets.items():
+            if witness.get(w, INFINITY) > cost:
+                shortcuts.append((u, w, cost))
+    return shortcuts
+
+
+def _CSR(lists):
+    """Convierte una lista de listas [(vecino, distancia)] en arrays (offsets, vecinos, distancias)"""
+    offsets = array('q', [0])
+    neighbors = array('q')
+    weights = array('d')
+    for edges in lists:
+        for neighbor, weight in edges:
+            neighbors.append(neighbor)
+            weights.append(weight)
+        offsets.append(len(neighbors))
+    return offsets, neighbors, weights
+
+
+def BuildContractionHierarchy(airspace, settle_limit=60):
+    """
+    Preprocesa un espacio aéreo contrayendo sus puntos uno a uno
+
+    El orden de contracción se elige con una cola de prioridad perezosa según la
+    diferencia de segmentos (atajos añadidos menos segmentos eliminados) más el
+    número de vecinos ya contraídos.
+
+    Args:
+        airspace (AirSpace): Espacio aéreo a preprocesar (o un NavGraph ya construido)
+        settle_limit (int): Puntos que puede fijar cada búsqueda de testigos (opcional).
+            Un límite menor acelera el preprocesado a cambio de añadir algún atajo innecesario
+
+    Returns:
+        ContractionHierarchy: Jerarquía. Hay que volver a construirla si el espacio aéreo cambia
+    """
+    navgraph = airspace if hasattr(airspace, 'offsets') else BuildNavGraph(airspace)
+    n = len(navgraph.numbers)
+
+    # Grafo de trabajo: solo contiene puntos aún no contraídos (la menor distancia de cada par)
+    out_edges = [{} for _ in range(n)]
+    in_edges = [{} for _ in range(n)]
+    offsets, targets, weights = navgraph.offsets, navgraph.targets, navgraph.weights
+    for u in range(n):
+        for k in range(offsets[u], offsets[u + 1]):
+            w, weight = targets[k], weights[k]
+            if w != u and weight < out_edges[u].get(w, (INFINITY, -1))[0]:
+                out_edges[u][w] = (weight, -1)
+                in_edges[w][u] = (weight, -1)
+
+    contracted_neighbors = [0] * n
+
+    def priority(v):
+        removed = len(in_edges[v]) + len(out_edges[v])
+        return len(_Shortcuts(out_edges, in_edges, v, settle_limit)) - removed + contracted_neighbors[v]
+
+    heap = [(priority(v), v) for v in range(n)]
+    heapq.heapify(heap)
+    rank = array('q', [0]) * n
+    contracted = bytearray(n)
+    up = [None] * n
+    down = [None] * n
+    edge_data = {}
+    order = 0
+
+    while heap:
+        _, v = heapq.heappop(heap)
+        if contracted[v]:
+            continue
+        # Actualización perezosa: si la prioridad ha empeorado, volver a la cola
+        current = priority(v)
+        if heap and current > heap[0][0]:
+            heapq.heappush(heap, (current, v))
+            continue
+
+        shortcuts = _Shortcuts(out_edges, in_edges, v, settle_limit)
+        contracted[v] = 1
+        rank[v] = order
+        order += 1
+
+        # Los segmentos que quedan de v van a puntos de rango mayor: se congelan
+        up[v] = [(w, weight) for w, (weight, _) in out_edges[v].items()]
+        down[v] = [(u, weight) for u, (weight, _) in in_edges[v].items()]
+        for w, data in out_edges[v].items():
+            edge_data[(v, w)] = data
+            del in_edges[w][v]
+            contracted_neighbors[w] += 1
+        for u, data in in_edges[v].items():
+            edge_data[(u, v)] = data
+            del out_edges[u][v]
+            contracted_neighbors[u] += 1
+
+        for u, w, cost in shortcuts:
+            if cost < out_edges[u].get(w, (INFINITY, -1))[0]:
+                out_edges[u][w] = (cost, v)
+                in_edges[w][u] = (cost, v)
+
+        for neighbor in set(out_edges[v]) | set(in_edges[v]):
+            heapq.heappush(heap, (priority(neighbor), neighbor))
+        out_edges[v] = {}
+        in_edges[v] = {}
+
+    return ContractionHierarchy(navgraph, rank, _CSR(up), _CSR(down), edge_data)
+
+
+def FindShortestNavPathCH(hierarchy, start_id, end_id, stats=None):
+    """
+    Encuentra el camino más corto entre dos puntos con una búsqueda bidireccional
+    sobre la jerarquía de contracción
+
+    Args:
+        hierarchy (ContractionHierarchy): Jerarquía del espacio aéreo
+        start_id (int): Número del punto de inicio
+        end_id (int): Número del punto de destino
+        stats (dict): Si se indica, se guarda en stats['expanded'] el número de
+            puntos expandidos entre las dos búsquedas (opcional)
+
+    Returns:
+        Path: Objeto con los puntos del camino y el costo total, o None si no hay camino
+    """
+    navgraph = hierarchy.navgraph
+    start = navgraph.index_of.get(start_id)
+    end = navgraph.index_of.get(end_id)
+    if start is None or end is None:
+        return None
+
+    # Índice 0: búsqueda hacia delante (sube por up), índice 1: hacia atrás (sube por down)
+    graphs = (hierarchy.up, hierarchy.down)
+    distances = ({start: 0}, {end: 0})
+    parents = ({start: None}, {end: None})
+    settled = (set(), set())
+    heaps = ([(0, start)], [(0, end)])
+    best_cost = INFINITY
+    meeting = None
+
+    while True:
+        # Cada búsqueda termina cuando su mínimo ya no puede mejorar el mejor camino
+        active = [side for side in (0, 1) if heaps[side] and heaps[side][0][0] < best_cost]
+        if not active:
+            break
+        side = min(active, key=lambda s: heaps[s][0][0])
+        dist, current = heapq.heappop(heaps[side])
+        if current in settled[side]:
+            continue
+        settled[side].add(current)
+
+        other = distances[1 - side].get(current)
+        if other is not None and dist + other < best_cost:
+            best_cost = dist + other
+            meeting = current
+
+        offsets, neighbors, weights = graphs[side]
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = neighbors[k]
+            alt = dist + weights[k]
+            if alt < distances[side].get(neighbor, INFINITY):
+                distances[side][neighbor] = alt
+                parents[side][neighbor] = current
+                heapq.heappush(heaps[side], (alt, neighbor))
+
+    if stats is not None:
+        stats['expanded'] = len(settled[0]) + len(settled[1])
+
+    if meeting is None:
+        return None
+
+    # Camino en la jerarquía: origen -> punto de encuentro -> destino
+    indices = []
+    current = meeting
+    while current is not None:
+        indices.append(current)
+        current = parents[0][current]
+    indices.reverse()
+    current = parents[1][meeting]
+    while current is not None:
+        indices.append(current)
+        current = parents[1][current]
+
+    indices, segment_distances = hierarchy.unpack(indices)
+    path = Path()
+    path.points = [navgraph.point(i) for i in indices]
+    path.cost = 0
+    for distance in segment_distances:
+        path.cost += distance
+    return path
@@ -0,0 +1,56 @@
+class DisjointSet:
+    def __init__(self):
+        """
+        Conjuntos disjuntos (union-find) con unión por tamaño y compresión de caminos
+
+        Sirve para saber en tiempo casi constante si dos elementos están en el mismo
+        componente conexo. No admite borrados: quien lo usa marca dirty = True y lo
+        reconstruye cuando lo vuelve a necesitar.
+        """
+        self.parent = {}
+        self.size = {}
+        self.count = 0  # Número de conjuntos
+        self.dirty = False  # True si hay que reconstruirlo (después de un borrado)
+
+    def __repr__(self):
+        return f"DisjointSet({len(self.parent)} items, {self.count} sets)"
+
+    def add(self, item):
+        """Añade item como conjunto de un solo elemento (si no estaba ya)"""
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+            self.count += 1
+
+    def find(self, item):
+        """Representante del conjunto de item (con compresión de caminos por mitades)"""
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        """
+        Une los conjuntos de a y b
+
+        Returns:
+            bool: True si estaban separados
+        """
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size.pop(root_b)
+        self.count -= 1
+        return True
+
+    def connected(self, a, b):
+        """True si a y b están en el mismo conjunto"""
+        return self.find(a) == self.find(b)
+
+    def set_size(self, item):
+        """Número de elementos del conjunto de item"""
+        return self.size[self.find(item)]
@@ -0,0 +1,177 @@
+import heapq
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from navgraph import BuildNavGraph
+from path import Path
+
+INFINITY = float('inf')
+
+_worker_graph = None  # (offsets, targets, weights) de cada proceso del pool
+
+
+class DistanceMatrix:
+    def __init__(self, navgraph, sources, targets, values, predecessors=None):
+        """
+        Matriz densa de distancias por aerovía entre dos listas de puntos
+
+        Args:
+            navgraph (NavGraph): Vista CSR usada para calcularla
+            sources (list): Números de NavPoint de las filas
+            targets (list): Números de NavPoint de las columnas
+            values (array): Distancias fila a fila (infinito si no hay camino)
+            predecessors (list): Para cada fila, array con el índice del predecesor
+                de cada punto en el árbol de caminos mínimos (-1 si no tiene) (opcional)
+        """
+        self.navgraph = navgraph
+        self.sources = sources
+        self.targets = targets
+        self.values = values
+        self.predecessors = predecessors
+        self.row_of = {number: i for i, number in enumerate(sources)}
+        self.column_of = {number: j for j, number in enumerate(targets)}
+
+    def __repr__(self):
+        return f"DistanceMatrix({len(self.sources)} x {len(self.targets)})"
+
+    def get(self, source_id, target_id):
+        """Distancia en km de source_id a target_id (infinito si no hay camino)"""
+        return self.values[self.row_of[source_id] * len(self.targets) + self.column_of[target_id]]
+
+    def row(self, source_id):
+        """Distancias de source_id a todas las columnas"""
+        start = self.row_of[source_id] * len(self.targets)
+        return self.values[start:start + len(self.targets)]
+
+    def path(self, source_id, target_id):
+        """
+        Reconstruye el camino mínimo a partir del árbol de predecesores
+
+        Returns:
+            Path: Objeto con los puntos del camino y el costo total, o None si no hay
+            camino o la matriz se calculó sin predecesores
+        """
+        cost = self.get(source_id, target_id)
+        if self.predecessors is None or cost == INFINITY:
+            return None
+        parents = self.predecessors[self.row_of[source_id]]
+        indices = []
+        current = self.navgraph.index_of[target_id]
+        while current >= 0:
+            indices.append(current)
+            current = parents[current]
+        indices.reverse()
+
+        path = Path()
+        path.points = [self.navgraph.point(i) for i in indices]
+        path.cost = cost
+        return path
+
+    def to_numpy(self):
+        """Devuelve la matriz como numpy.ndarray de forma (filas, columnas); necesita NumPy"""
+        import numpy as np
+        return np.array(self.values, dtype=float).reshape(len(self.sources), len(self.targets))
+
+
+def _SingleSource(graph, source, targets, with_predecessors):
+    """
+    Dijkstra sobre CSR desde source que termina al fijar todos los destinos
+
+    Args:
+        graph (tuple): (offsets, targets, weights) de la vista CSR
+        source (int): Índice del punto de inicio
+        targets (list): Índices de los destinos (None si no existen)
+        with_predecessors (bool): Devolver también el árbol de predecesores
+
+    Returns:
+        tuple: (array de distancias a cada destino, array de predecesores o None)
+    """
+    offsets, neighbors, weights = graph
+    n = len(offsets) - 1
+    distances = array('d', [INFINITY]) * n
+    parents = array('q', [-1]) * n if with_predecessors else None
+    settled = bytearray(n)
+    pending = {t for t in targets if t is not None}
+
+    if source is not None:
+        distances[source] = 0
+        heap = [(0, source)]
+        while heap and pending:
+            dist, current = heapq.heappop(heap)
+            if settled[current]:
+                continue
+            settled[current] = 1
+            pending.discard(current)
+            for k in range(offsets[current], offsets[current + 1]):
+                neighbor = neighbors[k]
+                alt = dist + weights[k]
+                if alt < distances[neighbor]:
+                    distances[neighbor] = alt
+                    if parents is not None:
+                        parents[neighbor] = current
+                    heapq.heappush(heap, (alt, neighbor))
+
+    row = array('d', (distances[t] if t is not None else INFINITY for t in targets))
+    return row, parents
+
+
+def _InitWorker(graph):
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _WorkerSingleSource(args):
+    return _SingleSource(_worker_graph, *args)
+
+
+def BuildDistanceMatrix(airspace, sources, targets, predecessors=False, processes=1):
+    """
+    Calcula las distancias mínimas de cada origen a todos los destinos con una sola
+    búsqueda por origen
+
+    Args:
+        airspace (AirSpace): Espacio aéreo (o un NavGraph ya construido)
+        sources (list): Números de NavPoint de origen
+        targets (list): Números de NavPoint de destino
+        predecessors (bool): Guardar el árbol de predecesores de cada origen para poder
+            reconstruir los caminos con DistanceMatrix.path (opcional)
+        processes (int): Número de procesos. Con más de uno las búsquedas se reparten
+            en un ProcessPoolExecutor (opcional)
+
+    Returns:
+        DistanceMatrix: Matriz len(sources) x len(targets)
+    """
+    navgraph = airspace if hasattr(airspace, 'offsets') else BuildNavGraph(airspace)
+    sources, targets = list(sources), list(targets)
+    graph = (navgraph.offsets, navgraph.targets, navgraph.weights)
+    target_indices = [navgraph.index_of.get(t) for t in targets]
+    jobs = [(navgraph.index_of.get(s), target_indices, predecessors) for s in sources]
+
+    if processes > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(processes, initializer=_InitWorker, initargs=(graph,)) as pool:
+            results = list(pool.map(_WorkerSingleSource, jobs, chunksize=max(1, len(jobs) // (4 * processes))))
+    else:
+        results = [_SingleSource(graph, *job) for job in jobs]
+
+    values = array('d')
+    for row, _ in results:
+        values.extend(row)
+    trees = [parents for _, parents in results] if predecessors else None
+    return DistanceMatrix(navgraph, sources, targets, values, trees)
+
+
+def BuildAirportDistanceMatrix(airspace, **kwargs):
+    """
+    Matriz de distancias de todos los puntos SID a todos los puntos STAR de los aeropuertos
+
+    Args:
+        airspace (AirSpace): Espacio aéreo con sus aeropuertos (o un NavGraph ya construido)
+        **kwargs: Opciones de BuildDistanceMatrix (predecessors, processes)
+
+    Returns:
+        DistanceMatrix: Filas = SID, columnas = STAR, en el orden de nav_airports
+    """
+    airports = (airspace.airspace if hasattr(airspace, 'offsets') else airspace).nav_airports
+    sids = [number for airport in airports for number in airport.sids]
+    stars = [number for airport in airports for number in airport.stars]
+    return BuildDistanceMatrix(airspace, sids, stars, **kwargs)
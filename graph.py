@@ -1,7 +1,11 @@
 from node import Node, AddNeighbor, Distance
 from segment import Segment
 import matplotlib.pyplot as plt
-from path import Path
+from path import Path, Dijkstra, BuildPath
+from changelog import ChangeLog
+from disjoint_set import DisjointSet
+from reachability import ReachableNodes
+from spatial_index import GridIndex
 import math
 import os
 
@@ -11,34 +15,59 @@ class Graph:
     def __init__(self):
         self.nodes = []
         self.segments = []
+        self.node_index = {}  # Diccionario nombre -> Node para búsquedas O(1)
+        self.adjacency = {}  # Node -> lista de (vecino, Segment) de los segmentos salientes
+        self.reverse_adjacency = {}  # Node -> lista de (origen, Segment) de los segmentos entrantes
+        self.changes = ChangeLog()  # Versión y últimos cambios (para invalidar o actualizar cachés)
+        self.components = DisjointSet()  # Componentes conexos sin tener en cuenta el sentido
+        self.spatial = None  # GridIndex de los nodos por (x, y), se crea en la primera búsqueda
+        self._views = {}  # Tipo -> vista CSR de reachability (se reconstruye al cambiar version)
 
     def __repr__(self):
         return f"Graph with {len(self.nodes)} nodes and {len(self.segments)} segments"
 
+    @property
+    def version(self):
+        """Versión actual (se incrementa con cada cambio registrado en changes)"""
+        return self.changes.version
+
+    def get_node(self, name):
+        """Obtiene un nodo por su nombre, o None si no existe"""
+        return self.node_index.get(name)
+
     def get_neighbors(self, node):
-        """Obtiene todos los vecinos de un nodo"""
-        neighbors = []
-        for seg in self.segments:
-            if seg.origin == node:
-                neighbors.append(seg.destination)
-            elif seg.destination == node:
-                neighbors.append(seg.origin)
+        """Obtiene todos los vecinos de un nodo (segmentos salientes y entrantes)"""
+        neighbors = [neighbor for neighbor, _ in self.adjacency.get(node, [])]
+        neighbors.extend(origin for origin, _ in self.reverse_adjacency.get(node, []))
         return neighbors
 
+    def get_segment(self, origin, destination):
+        """Obtiene el segmento dirigido origin -> destination, o None si no existe"""
+        for neighbor, seg in self.adjacency.get(origin, []):
+            if neighbor == destination:
+                return seg
+        return None
+
     def get_segment_cost(self, node1, node2):
         """Obtiene el costo del segmento entre dos nodos"""
-        for seg in self.segments:
-            if (seg.origin == node1 and seg.destination == node2) or \
-                    (seg.origin == node2 and seg.destination == node1):
-                return seg.cost
-        return None
+        seg = self.get_segment(node1, node2) or self.get_segment(node2, node1)
+        if seg is None:
+            return None
+        return seg.cost
 
 
 def AddNode(g, n):
     """Add a node to the graph if it doesn't already exist"""
-    if any(node.name == n.name for node in g.nodes):
+    if n.name in g.node_index:
         return False
     g.nodes.append(n)
+    g.node_index[n.name] = n
+    g.adjacency[n] = []
+    g.reverse_adjacency[n] = []
+    g.components.add(n)
+    if g.spatial is not None:
+        g.spatial.add(n, n.x, n.y)
+    g.changes.record('add_node', n)
     return True
 
 
@@ -55,14 +84,14 @@ def AddSegment(g, name, origin_name, destination_name):
     Returns:
         bool: True si se añadió correctamente, False si no
     """
-    origin = next((n for n in g.nodes if n.name == origin_name), None)
-    destination = next((n for n in g.nodes if n.name == destination_name), None)
+    origin = g.get_node(origin_name)
+    destination = g.get_node(destination_name)
 
     if not origin or not destination:
         return False
 
     # Verificar si el segmento ya existe
-    if any(seg.origin == origin and seg.destination == destination for seg in g.segments):
+    if g.get_segment(origin, destination) is not None:
         return False
 
     # Calcular costo (distancia euclidiana)
@@ -71,10 +100,15 @@ def AddSegment(g, name, origin_name, destination_name):
     # Crear el segmento
     new_segment = Segment(name, origin, destination, cost)
     g.segments.append(new_segment)
+    g.adjacency[origin].append((destination, new_segment))
+    g.reverse_adjacency[destination].append((origin, new_segment))
 
     # Añadir como vecinos
     AddNeighbor(origin, destination)
+    if not g.components.dirty:
+        g.components.union(origin, destination)
 
+    g.changes.record('add_segment', new_segment)
     return True
 
 
@@ -83,7 +117,18 @@ def GetClosest(g, x, y):
     if not g.nodes:
         return None
 
-    return min(g.nodes, key=lambda node: (node.x - x) ** 2 + (node.y - y) ** 2)
+    return GetSpatialIndex(g).nearest(x, y)
+
+
+def GetSpatialIndex(g):
+    """
+    Índice espacial de los nodos (rejilla uniforme sobre x, y)
+
+    Se construye en la primera consulta; después AddNode y RemoveNode lo mantienen al día.
+    """
+    if g.spatial is None:
+        g.spatial = GridIndex(g.nodes, (node.x for node in g.nodes), (node.y for node in g.nodes))
+    return g.spatial
 
 
 def Plot(g, highlight_path=None):
@@ -139,7 +184,7 @@ def Plot(g, highlight_path=None):
 
 def PlotNode(g, nameOrigin):
     """Plot a specific node and its neighbors"""
-    origin = next((node for node in g.nodes if node.name == nameOrigin), None)
+    origin = g.get_node(nameOrigin)
     if origin is None:
         return False
 
@@ -257,7 +302,7 @@ def SaveGraphToFile(g, filename):
 
 def RemoveNode(g, node_name):
     """Remove a node and all connected segments"""
-    node_to_remove = next((node for node in g.nodes if node.name == node_name), None)
+    node_to_remove = g.get_node(node_name)
     if node_to_remove is None:
         return False
 
@@ -265,39 +310,66 @@ def RemoveNode(g, node_name):
     g.segments = [seg for seg in g.segments
                   if seg.origin.name != node_name and seg.destination.name != node_name]
 
-    # Remove from neighbors lists of other nodes
-    for node in g.nodes:
-        if node_to_remove in node.neighbors:
-            node.neighbors.remove(node_to_remove)
+    # Remove from adjacency and neighbors lists of the other endpoints
+    for destination, segment in g.adjacency.pop(node_to_remove):
+        g.reverse_adjacency[destination] = [(o, s) for o, s in g.reverse_adjacency[destination]
+                                            if o != node_to_remove]
+        g.changes.record('remove_segment', segment)
+    for origin, segment in g.reverse_adjacency.pop(node_to_remove):
+        if origin == node_to_remove:
+            continue
+        g.changes.record('remove_segment', segment)
+        g.adjacency[origin] = [(d, s) for d, s in g.adjacency[origin] if d != node_to_remove]
+        if node_to_remove in origin.neighbors:
+            origin.neighbors.remove(node_to_remove)
 
     # Remove the node
     g.nodes.remove(node_to_remove)
+    del g.node_index[node_name]
+    g.components.dirty = True  # Se reconstruye en la próxima consulta
+    if g.spatial is not None:
+        g.spatial.remove(node_to_remove, node_to_remove.x, node_to_remove.y)
+    g.changes.record('remove_node', node_to_remove)
     return True
 
 
 def RemoveSegment(g, origin_name, destination_name):
     """Remove a specific segment between two nodes"""
-    origin = next((node for node in g.nodes if node.name == origin_name), None)
-    destination = next((node for node in g.nodes if node.name == destination_name), None)
+    origin = g.get_node(origin_name)
+    destination = g.get_node(destination_name)
 
     if origin is None or destination is None:
         return False
 
     # Remove the segment if it exists
-    segments_to_remove = [seg for seg in g.segments
-                          if seg.origin == origin and seg.destination == destination]
-
-    if not segments_to_remove:
+    segment = g.get_segment(origin, destination)
+    if segment is None:
         return False
 
-    for seg in segments_to_remove:
-        g.segments.remove(seg)
+    g.segments.remove(segment)
+    g.adjacency[origin] = [(d, s) for d, s in g.adjacency[origin] if s is not segment]
+    g.reverse_adjacency[destination] = [(o, s) for o, s in g.reverse_adjacency[destination]
+                                        if s is not segment]
 
-    # Update neighbors if no other segments exist between these nodes
-    if not any(seg.origin == origin and seg.destination == destination for seg in g.segments):
-        if destination in origin.neighbors:
-            origin.neighbors.remove(destination)
+    # Update neighbors
+    if destination in origin.neighbors:
+        origin.neighbors.remove(destination)
+    g.components.dirty = True  # Se reconstruye en la próxima consulta
 
+    g.changes.record('remove_segment', segment)
+    return True
+
+
+def SetSegmentCost(g, origin_name, destination_name, cost):
+    """Change the cost of an existing segment"""
+    origin = g.get_node(origin_name)
+    destination = g.get_node(destination_name)
+    segment = g.get_segment(origin, destination) if origin and destination else None
+    if segment is None:
+        return False
+
+    segment.cost = cost
+    g.changes.record('change_segment', segment)
     return True
 
 
@@ -363,34 +435,47 @@ def GetReachableNodes(graph, start_node_name):
         list: Lista de nodos alcanzables (objetos Node)
     """
     # Encontrar el nodo inicial
-    start_node = None
-    for node in graph.nodes:
-        if node.name == start_node_name:
-            start_node = node
-            break
+    start_node = graph.get_node(start_node_name)
 
     if not start_node:
         return []
 
-    visited = set()
-    queue = [start_node]  # Usamos una lista como cola
-    reachable = []
+    # BFS sobre la vista CSR del grafo (cola deque y visitados en un bytearray)
+    return ReachableNodes(graph, start_node)
 
-    while queue:
-        current = queue.pop(0)  # Sacamos el primer elemento
 
-        if current in visited:
-            continue
+def GetComponents(g):
+    """
+    Conjuntos disjuntos de los componentes conexos (segmentos en los dos sentidos)
 
-        visited.add(current)
-        reachable.append(current)
+    AddSegment los mantiene al día. Después de borrar un nodo o un segmento se
+    reconstruyen aquí, solo cuando se vuelven a consultar.
+    """
+    if g.components.dirty:
+        components = DisjointSet()
+        for node in g.nodes:
+            components.add(node)
+        for segment in g.segments:
+            components.union(segment.origin, segment.destination)
+        g.components = components
+    return g.components
+
+
+def AreConnected(g, name1, name2):
+    """True si hay un camino entre los dos nodos ignorando el sentido de los segmentos"""
+    node1 = g.get_node(name1)
+    node2 = g.get_node(name2)
+    if not node1 or not node2:
+        return False
+    return GetComponents(g).connected(node1, node2)
 
-        # Añadir vecinos no visitados
-        for neighbor in current.neighbors:
-            if neighbor not in visited and neighbor not in queue:
-                queue.append(neighbor)
 
-    return reachable
+def GetComponentSize(g, node_name):
+    """Número de nodos del componente conexo de un nodo (0 si no existe)"""
+    node = g.get_node(node_name)
+    if not node:
+        return 0
+    return GetComponents(g).set_size(node)
 
 
 def PlotReachableNodes(g, start_node_name):
@@ -443,70 +528,17 @@ def FindShortestPath(graph, start_node_name, end_node_name):
         end_node_name (str): Nombre del nodo destino
 
     Returns:
-        dict: {'path': lista de nombres de nodos, 'cost': costo total}
-              o None si no hay camino
+        Path: Objeto con los nodos del camino y el costo total, o None si no hay camino
     """
     # Encontrar nodos de inicio y fin
-    start_node = end_node = None
-    for node in graph.nodes:
-        if node.name == start_node_name:
-            start_node = node
-        if node.name == end_node_name:
-            end_node = node
+    start_node = graph.get_node(start_node_name)
+    end_node = graph.get_node(end_node_name)
 
     if not start_node or not end_node:
         return None
 
-    # Estructuras para el algoritmo
-    distances = {node: float('inf') for node in graph.nodes}
-    previous = {node: None for node in graph.nodes}
-    distances[start_node] = 0
-    unvisited = set(graph.nodes)
-
-    while unvisited:
-        # Encontrar el nodo no visitado con la distancia mínima
-        current = None
-        min_dist = float('inf')
-        for node in unvisited:
-            if distances[node] < min_dist:
-                min_dist = distances[node]
-                current = node
-
-        if current is None or current == end_node:
-            break
-
-        unvisited.remove(current)
-
-        # Actualizar distancias a los vecinos
-        for neighbor in current.neighbors:
-            # Encontrar el segmento entre current y neighbor
-            segment = None
-            for seg in graph.segments:
-                if (seg.origin == current and seg.destination == neighbor) or \
-                        (seg.origin == neighbor and seg.destination == current):
-                    segment = seg
-                    break
-
-            if segment:
-                alt = distances[current] + segment.cost
-                if alt < distances[neighbor]:
-                    distances[neighbor] = alt
-                    previous[neighbor] = current
-
-    # Reconstruir el camino si existe
-    if previous[end_node] is None and start_node != end_node:
-        return None
-
-    path = []
-    current = end_node
-    while current is not None:
-        path.insert(0, current)
-        current = previous[current]
-
-    return {
-        'path': [node.name for node in path],
-        'cost': distances[end_node]
-    }
+    distances, previous = Dijkstra(graph, start_node, end_node)
+    return BuildPath(previous, distances, end_node)
 
 
 def PlotShortestPath(g, origin_name, destination_name):
@@ -535,8 +567,9 @@ def PlotShortestPath(g, origin_name, destination_name):
                 ha='center', va='center', fontsize=10)
 
     # Draw all segments
+    path_segments = {g.get_segment(a, b) for a, b in zip(path.nodes, path.nodes[1:])}
     for seg in g.segments:
-        if seg in path.segments:
+        if seg in path_segments:
             color, alpha, width = 'red', 0.9, 2
         else:
             color, alpha, width = 'gray', 0.2, 1
@@ -1,10 +1,15 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+from tkinter import filedialog, messagebox, simpledialog, ttk
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from graph import *
 from path import *
 from airspace import *
+from pareto import FindParetoRoutes, FindParetoNavRoutes
+from reachability import ReachableNavPointsWithin
+from spt_cache import ShortestPathTreeCache
+from strong_components import CanReachNavPoint
+from landmarks import LoadLandmarksWithCache
 from kml_generator import KMLGenerator
 import os
 import webbrowser
@@ -34,11 +39,15 @@ class GraphApp:
      self.root.title("Airspace Route Explorer - Final Version")
      self.current_graph = None
      self.current_airspace = None
+     self.current_landmarks = None  # Landmarks ALT del espacio aéreo (para el camino alternativo)
+     self.path_cache = ShortestPathTreeCache()  # Árboles de caminos mínimos por origen
      self.dark_mode = False
      self.selected_nodes = []
      self.current_segments_to_draw = None
      self.current_path = None
+     self.current_route = None  # (origen, destino) del camino más corto mostrado
      self.current_reachable = None
+     self.reachable_distances = None  # Número de NavPoint -> saltos o km (bandas de color)
      self.node_neighbors = None
      self.new_node_mode = False
      self.new_segment_mode = False
@@ -304,6 +313,10 @@ class GraphApp:
                 command=self.find_reachable_interactive).pack(fill=tk.X, pady=2)
      ttk.Button(analysis_frame, text="Find Shortest Path",
                 command=self.find_shortest_path_interactive).pack(fill=tk.X, pady=2)
+     ttk.Button(analysis_frame, text="Reachable Within...",
+                command=self.find_reachable_within).pack(fill=tk.X, pady=2)
+     ttk.Button(analysis_frame, text="Optimize Route",
+                command=self.optimize_route).pack(fill=tk.X, pady=2)
      ttk.Button(analysis_frame, text="Show Node Neighbors",
                 command=self.show_node_neighbors).pack(fill=tk.X, pady=2)
      ttk.Button(analysis_frame, text="Clear Analysis",
@@ -612,7 +625,7 @@ class GraphApp:
 
      # Dibujar solo aeropuertos
      for airport in self.current_airspace.nav_airports:
-         first_sid = airport.get_first_sid_point(self.current_airspace.nav_points)
+         first_sid = airport.get_first_sid_point(self.current_airspace)
          if first_sid:
              # Dibujar aeropuerto
              self.ax.plot(first_sid.longitude, first_sid.latitude, 's',
@@ -626,12 +639,12 @@ class GraphApp:
 
      # Ajustar límites del gráfico
      if self.current_airspace.nav_airports:
-         lons = [p.get_first_sid_point(self.current_airspace.nav_points).longitude
+         lons = [p.get_first_sid_point(self.current_airspace).longitude
                  for p in self.current_airspace.nav_airports
-                 if p.get_first_sid_point(self.current_airspace.nav_points)]
-         lats = [p.get_first_sid_point(self.current_airspace.nav_points).latitude
+                 if p.get_first_sid_point(self.current_airspace)]
+         lats = [p.get_first_sid_point(self.current_airspace).latitude
                  for p in self.current_airspace.nav_airports
-                 if p.get_first_sid_point(self.current_airspace.nav_points)]
+                 if p.get_first_sid_point(self.current_airspace)]
 
 
 
@@ -717,6 +730,7 @@ class GraphApp:
 
          if self.current_graph is None:
              self.current_graph = Graph()
+             self.path_cache.clear()
 
 
 
@@ -726,7 +740,7 @@ class GraphApp:
 
 
          # Verificar si el nodo ya existe
-         if any(node.name == name for node in self.current_graph.nodes):
+         if self.current_graph.get_node(name):
              messagebox.showwarning("Warning", f"Node '{name}' already exists")
              return
 
@@ -823,6 +837,7 @@ class GraphApp:
 
 
          if success:
+             self.reroute_current_path()
              self.plot_graph()
              self.update_status(f"Added segment: {origin.name} - {dest.name}")
          else:
@@ -866,9 +881,8 @@ class GraphApp:
 
 
      # Eliminar el nodo y sus segmentos asociados
-     self.current_graph.nodes = [n for n in self.current_graph.nodes if n != node]
-     self.current_graph.segments = [seg for seg in self.current_graph.segments
-                                    if seg.origin != node and seg.destination != node]
+     RemoveNode(self.current_graph, node.name)
+     self.reroute_current_path()
 
 
 
@@ -931,7 +945,7 @@ class GraphApp:
 
          # Crear nuevo NavPoint
          new_point = NavPoint(new_id, name, lat, lon)
-         self.current_airspace.nav_points.append(new_point)
+         self.current_airspace.add_nav_point(new_point)
          self.plot_airspace()
          dialog.destroy()
 
@@ -962,7 +976,9 @@ class GraphApp:
 
          # Crear nuevo segmento
          new_segment = NavSegment(origin.number, dest.number, distance)
-         self.current_airspace.nav_segments.append(new_segment)
+         self.current_airspace.add_nav_segment(new_segment)
+         self.current_landmarks = None  # Las distancias precalculadas ya no son válidas
+         self.reroute_current_path()
 
 
          self.plot_airspace()
@@ -987,6 +1003,7 @@ class GraphApp:
      try:
          with open(file_path, 'r') as f:
              self.current_graph = Graph()
+             self.path_cache.clear()  # Los árboles guardados son del grafo anterior
              for line_num, line in enumerate(f, 1):
                  line = line.strip()
                  if not line or line.startswith("#"):
@@ -1124,6 +1141,7 @@ class GraphApp:
      """Limpia el grafo actual"""
      self.current_graph = Graph()
      self.current_airspace = None
+     self.path_cache.clear()
      self.clear_analysis()
      self.plot_graph()
      self.update_status("Graph cleared")
@@ -1140,8 +1158,7 @@ class GraphApp:
 
 
      if self.current_airspace:
-         start_point = next((p for p in self.current_airspace.nav_points
-                             if p.number == start_name), None)
+         start_point = self.current_airspace.get_point(start_name)
          if not start_point:
              self.update_info(f"NavPoint {start_name} not found")
              return
@@ -1149,36 +1166,16 @@ class GraphApp:
 
 
 
-         reachable = []
-         visited = set()
-         queue = [start_point.number]
-         segments_to_draw = []
-
-
-
-
-         while queue:
-             current_num = queue.pop(0)
-             if current_num in visited:
-                 continue
-             visited.add(current_num)
-
-
-
-
-             current_point = next((p for p in self.current_airspace.nav_points
-                                   if p.number == current_num), None)
-             if current_point:
-                 reachable.append(current_point)
-                 for seg in self.current_airspace.nav_segments:
-                     if seg.origin_number == current_num and seg.destination_number not in visited:
-                         queue.append(seg.destination_number)
-                         segments_to_draw.append(seg)
+         # BFS compartido (vista CSR del espacio aéreo) y segmentos que salen de los puntos alcanzados
+         reachable = GetReachableNavPoints(self.current_airspace, start_point.number)
+         segments_to_draw = [seg for p in reachable
+                             for seg in self.current_airspace.get_outgoing_segments(p.number)]
 
 
 
 
          self.current_reachable = reachable
+         self.reachable_distances = None
          self.current_segments_to_draw = segments_to_draw
          self.plot_airspace()
          self.update_info(f"Nodes reachable from {start_point.name}:\n" +
@@ -1198,6 +1195,7 @@ class GraphApp:
              if seg.origin.name in reachable_set and seg.destination.name in reachable_set:
                  segments_to_draw.append(seg)
          self.current_reachable = reachable_nodes
+         self.reachable_distances = None
          self.current_segments_to_draw = segments_to_draw
          self.plot_graph()
          self.update_info(f"Nodes reachable from {start_name}:\n" +
@@ -1205,8 +1203,7 @@ class GraphApp:
 
  def find_reachable_in_airspace(self, start_name):
      """Encuentra nodos alcanzables en espacio aéreo"""
-     start_point = next((p for p in self.current_airspace.nav_points
-                         if p.number == start_name), None)
+     start_point = self.current_airspace.get_point(start_name)
      if not start_point:
          self.update_info(f"NavPoint {start_name} not found")
          return
@@ -1219,59 +1216,64 @@ class GraphApp:
 
 
      # Usar BFS para encontrar nodos alcanzables
-     reachable = []
-     visited = set()
-     queue = [start_point.number]
-
-
-
-
-
-
-
-
-     while queue:
-         current_num = queue.pop(0)
-         if current_num in visited:
-             continue
-         visited.add(current_num)
-
-
+     reachable = GetReachableNavPoints(self.current_airspace, start_point.number)
 
 
 
 
 
 
-         current_point = next((p for p in self.current_airspace.nav_points
-                               if p.number == current_num), None)
-         if current_point:
-             reachable.append(current_point)
-
 
 
+     self.current_reachable = reachable
+     self.reachable_distances = None
+     self.plot_airspace()
+     self.update_info(f"Nodes reachable from {start_point.name}:\n" +
+                      "\n".join([f"- {p.name}" for p in reachable]))
 
+ def find_reachable_within(self):
+     """Puntos a un número máximo de segmentos o de km del punto seleccionado, por bandas de distancia"""
+     if not self.current_airspace:
+         messagebox.showwarning("Warning", "Bounded reachability is only available in Airspace mode")
+         return
+     if not self.selected_nodes:
+         messagebox.showwarning("Warning", "Please select a start point first")
+         return
 
 
 
 
-             # Añadir vecinos no visitados
-             for seg in self.current_airspace.nav_segments:
-                 if seg.origin_number == current_num:
-                     if seg.destination_number not in visited:
-                         queue.append(seg.destination_number)
+     limit = simpledialog.askstring("Reachable Within", "Limit (e.g. '500 km' or '4 hops'):", parent=self.root)
+     if not limit:
+         return
+     try:
+         value = limit.lower().replace("km", " km").replace("hops", " hops").split()
+         if len(value) > 1 and value[1] == "km":
+             kwargs = {"max_distance": float(value[0])}
+         else:
+             kwargs = {"max_hops": int(value[0])}
+     except (ValueError, IndexError):
+         messagebox.showerror("Error", f"Invalid limit: {limit}")
+         return
 
 
 
 
+     start_point = self.selected_nodes[0]
+     bands = ReachableNavPointsWithin(self.current_airspace, start_point.number, **kwargs)
+     self.current_reachable = [p for p, _ in bands]
+     self.reachable_distances = {p.number: distance for p, distance in bands}
+     self.current_segments_to_draw = [seg for p in self.current_reachable
+                                      for seg in self.current_airspace.get_outgoing_segments(p.number)
+                                      if seg.destination_number in self.reachable_distances]
+     self.plot_airspace()
 
 
 
 
-     self.current_reachable = reachable
-     self.plot_airspace()
-     self.update_info(f"Nodes reachable from {start_point.name}:\n" +
-                      "\n".join([f"- {p.name}" for p in reachable]))
+     unit = "km" if "max_distance" in kwargs else "hops"
+     self.update_info(f"{len(bands)} points within {limit} of {start_point.name}:\n" +
+                      "\n".join([f"- {p.name} ({round(distance, 1)} {unit})" for p, distance in bands]))
 
  def find_reachable_in_graph(self, start_name):
      """Encuentra nodos alcanzables en grafo normal"""
@@ -1288,6 +1290,7 @@ class GraphApp:
 
 
      self.current_reachable = reachable_nodes
+     self.reachable_distances = None
      self.plot_graph()
      self.update_info(f"Nodes reachable from {start_name}:\n" +
                       "\n".join([f"- {node.name}" for node in reachable_nodes]))
@@ -1296,10 +1299,8 @@ class GraphApp:
      """Encuentra y dibuja el camino más corto entre dos puntos"""
      if self.current_airspace:
          # 1. Obtener los puntos de inicio y fin
-         start_point = next((p for p in self.current_airspace.nav_points
-                             if p.number == start_name), None)
-         end_point = next((p for p in self.current_airspace.nav_points
-                           if p.number == end_name), None)
+         start_point = self.current_airspace.get_point(start_name)
+         end_point = self.current_airspace.get_point(end_name)
 
 
          if not start_point or not end_point:
@@ -1307,82 +1308,67 @@ class GraphApp:
              return
 
 
-         # 2. Implementación del algoritmo A*
-         open_set = {start_point.number}
-         came_from = {}
-         g_score = {p.number: float('inf') for p in self.current_airspace.nav_points}
-         g_score[start_point.number] = 0
-         f_score = {p.number: float('inf') for p in self.current_airspace.nav_points}
-         f_score[start_point.number] = self.heuristic(start_point, end_point)
-
-
-         while open_set:
-             current_num = min(open_set, key=lambda x: f_score[x])
-             if current_num == end_point.number:
-                 # Reconstruir el camino
-                 path_points = []
-                 current = end_point.number
-                 while current in came_from:
-                     path_points.append(next(p for p in self.current_airspace.nav_points
-                                             if p.number == current))
-                     current = came_from[current]
-                 path_points.append(start_point)
-                 path_points.reverse()
-
-
-                 # Crear objeto Path
-                 path = Path()
-                 path.points = path_points
-                 path.cost = g_score[end_point.number]
-
-
-                 self.current_path = path
-                 self.plot_airspace()
-                 self.update_info(f"Camino más corto:\n{' -> '.join([p.name for p in path_points])}\n"
-                                  f"Distancia total: {path.cost:.2f} km")
-                 return
-
-
-             open_set.remove(current_num)
-
-
-             # Explorar vecinos
-             for seg in self.current_airspace.nav_segments:
-                 if seg.origin_number == current_num:
-                     neighbor_num = seg.destination_number
-                     tentative_g = g_score[current_num] + seg.distance
+         # 2. Comprobación O(1) con los componentes fuertemente conexos antes de buscar
+         if not CanReachNavPoint(self.current_airspace, start_point.number, end_point.number):
+             self.update_info(f"No hay camino de {start_point.name} a {end_point.name} " +
+                              "(el destino no es alcanzable desde el origen)")
+             return
 
 
-                     if tentative_g < g_score.get(neighbor_num, float('inf')):
-                         came_from[neighbor_num] = current_num
-                         g_score[neighbor_num] = tentative_g
-                         neighbor_point = next((p for p in self.current_airspace.nav_points
-                                                if p.number == neighbor_num), None)
-                         if neighbor_point:
-                             f_score[neighbor_num] = tentative_g + self.heuristic(neighbor_point, end_point)
-                             if neighbor_num not in open_set:
-                                 open_set.add(neighbor_num)
+         # 3. Árbol de caminos mínimos del origen (se reutiliza mientras el origen se repita)
+         path = self.path_cache.shortest_nav_path(self.current_airspace, start_point.number, end_point.number)
+         self.update_status(f"Path cache: {self.path_cache.hits} hits, {self.path_cache.misses} misses")
+         if path:
+             self.current_path = path
+             self.current_route = (start_point.number, end_point.number)
+             self.plot_airspace()
+             self.update_info(f"Camino más corto:\n{' -> '.join([p.name for p in path.points])}\n"
+                              f"Distancia total: {path.cost:.2f} km")
+             return
 
 
          self.update_info("No hay camino entre los puntos seleccionados")
      else:
-         path = FindShortestPath(self.current_graph, start_name, end_name)
+         # Sin conexión ni siquiera ignorando el sentido de los segmentos: no hace falta buscar
+         if not AreConnected(self.current_graph, start_name, end_name):
+             self.update_info(f"No existe camino entre {start_name} y {end_name}")
+             return
+         path = self.path_cache.shortest_path(self.current_graph, start_name, end_name)
+         self.update_status(f"Path cache: {self.path_cache.hits} hits, {self.path_cache.misses} misses")
          if path:
              self.current_path = path
+             self.current_route = (start_name, end_name)
              self.plot_graph()
              path_names = [node.name for node in path.nodes]
              self.update_info(f"Camino más corto:\n{' -> '.join(path_names)}\nCosto total: {path.cost:.2f}")
          else:
              self.update_info(f"No existe camino entre {start_name} y {end_name}")
 
+ def reroute_current_path(self):
+     """Recalcula el camino más corto mostrado tras una edición (se repara el árbol del origen)"""
+     if not self.current_route or not self.current_path:
+         return
+
+     start, end = self.current_route
+     if self.current_airspace:
+         path = self.path_cache.shortest_nav_path(self.current_airspace, start, end)
+     else:
+         path = self.path_cache.shortest_path(self.current_graph, start, end)
+
+     self.current_path = path
+     if path is None:
+         self.current_route = None
+         self.update_info(f"No hay camino entre {start} y {end} después del cambio")
+     elif self.current_airspace:
+         self.update_info(f"Camino recalculado:\n{' -> '.join([p.name for p in path.points])}\n"
+                          f"Distancia total: {path.cost:.2f} km")
+     else:
+         self.update_info(f"Camino recalculado:\n{' -> '.join([n.name for n in path.nodes])}\n"
+                          f"Costo total: {path.cost:.2f}")
+
  def find_shortest_path_in_graph(self, start_name, end_name):
      path = FindShortestPath(self.current_graph, start_name, end_name)
 
- def heuristic(self, point1, point2):
-     """Distancia euclidiana entre dos puntos para A*"""
-     return ((point1.longitude - point2.longitude) ** 2 +
-             (point1.latitude - point2.latitude) ** 2) ** 0.5
-
  def show_node_neighbors(self):
      """Muestra los vecinos de un nodo seleccionado y resalta solo los segmentos conectados"""
      if not self.selected_nodes:
@@ -1401,19 +1387,16 @@ class GraphApp:
          node = self.selected_nodes[0]
          neighbors = []
          segments_to_draw = []
-         for seg in self.current_airspace.nav_segments:
-             if seg.origin_number == node.number:
-                 dest = next((p for p in self.current_airspace.nav_points
-                              if p.number == seg.destination_number), None)
-                 if dest:
-                     neighbors.append(f"{dest.name} (distance: {seg.distance:.1f} km)")
-                     segments_to_draw.append(seg)
-             elif seg.destination_number == node.number:
-                 orig = next((p for p in self.current_airspace.nav_points
-                              if p.number == seg.origin_number), None)
-                 if orig:
-                     neighbors.append(f"{orig.name} (distance: {seg.distance:.1f} km)")
-                     segments_to_draw.append(seg)
+         for seg in self.current_airspace.get_outgoing_segments(node.number):
+             dest = self.current_airspace.get_point(seg.destination_number)
+             if dest:
+                 neighbors.append(f"{dest.name} (distance: {seg.distance:.1f} km)")
+                 segments_to_draw.append(seg)
+         for seg in self.current_airspace.get_incoming_segments(node.number):
+             orig = self.current_airspace.get_point(seg.origin_number)
+             if orig and seg.origin_number != node.number:
+                 neighbors.append(f"{orig.name} (distance: {seg.distance:.1f} km)")
+                 segments_to_draw.append(seg)
          self.node_neighbors = neighbors
          self.current_segments_to_draw = segments_to_draw
          self.plot_airspace()
@@ -1441,7 +1424,9 @@ class GraphApp:
  def clear_analysis(self):
      """Limpia los resultados del análisis"""
      self.current_path = None
+     self.current_route = None
      self.current_reachable = None
+     self.reachable_distances = None
      self.node_neighbors = None
      self.selected_nodes = []
 
@@ -1660,8 +1645,8 @@ class GraphApp:
      # 1. Dibujar segmentos
      segments_to_draw = self.current_segments_to_draw if self.current_segments_to_draw is not None else self.current_airspace.nav_segments
      for segment in segments_to_draw:
-         origin = next((p for p in self.current_airspace.nav_points if p.number == segment.origin_number), None)
-         dest = next((p for p in self.current_airspace.nav_points if p.number == segment.destination_number), None)
+         origin = self.current_airspace.get_point(segment.origin_number)
+         dest = self.current_airspace.get_point(segment.destination_number)
          if origin and dest:
              is_path_segment = False
              if self.current_path and hasattr(self.current_path, 'points'):
@@ -1695,6 +1680,13 @@ class GraphApp:
 
 
 
+     # Bandas de distancia de un alcance acotado: 4 colores de cerca a lejos
+     if self.reachable_distances:
+         farthest = max(self.reachable_distances.values()) or 1
+
+
+
+
      for point in self.current_airspace.nav_points:
          # Si está activado el filtro, solo mostrar los puntos que son primer SID de un aeropuerto
          if only_airports and point.number not in airport_sid_numbers:
@@ -1712,6 +1704,10 @@ class GraphApp:
          elif point.number in self.avoid_nodes:
              color = 'black'
              size = 6
+         elif self.reachable_distances and point.number in self.reachable_distances:
+             band = min(3, int(4 * self.reachable_distances[point.number] / farthest))
+             color = plt.cm.viridis(band / 3)
+             size = 8
          elif self.current_reachable and any(p.number == point.number for p in self.current_reachable):
              color = 'green'
              size = 8
@@ -1734,9 +1730,9 @@ class GraphApp:
      for airport in self.current_airspace.nav_airports:
          # Usar método get_first_sid_point si existe, si no, usa el primer SID manualmente
          if hasattr(airport, "get_first_sid_point"):
-             first_sid = airport.get_first_sid_point(self.current_airspace.nav_points)
+             first_sid = airport.get_first_sid_point(self.current_airspace)
          elif hasattr(airport, "sids") and airport.sids:
-             first_sid = next((p for p in self.current_airspace.nav_points if p.number == airport.sids[0]), None)
+             first_sid = self.current_airspace.get_point(airport.sids[0])
          else:
              first_sid = None
 
@@ -1822,7 +1818,14 @@ class GraphApp:
 
 
 
-         self.current_airspace = LoadAirspace(nav_file, seg_file, airport_file)
+         # Caché binaria junto a los datos: recargar una región ya vista es casi instantáneo
+         cache_file = nav_file.replace("_nav.txt", "_airspace.cache")
+         self.current_airspace = LoadAirspace(nav_file, seg_file, airport_file, cache_file)
+         self.path_cache.clear()
+         # Landmarks ALT precalculados (también se guardan junto a los datos)
+         landmarks_file = nav_file.replace("_nav.txt", "_landmarks.cache")
+         self.current_landmarks = LoadLandmarksWithCache(self.current_airspace, landmarks_file,
+                                                         [nav_file, seg_file, airport_file])
          self.current_graph = None
          self.clear_analysis()
          self.plot_airspace()
@@ -1843,31 +1846,10 @@ class GraphApp:
 
 
 
-     closest = None
-     min_dist = float('inf')
-
-
-
-
-
-
-
-
-     for point in self.current_airspace.nav_points:
-         dist = (point.longitude - lon) ** 2 + (point.latitude - lat) ** 2
-         if dist < min_dist:
-             min_dist = dist
-             closest = point
-
-
-
-
-
-
-
-
-     # Solo devolver si está suficientemente cerca (umbral de 0.01 grados)
-     return closest if min_dist < 0.01 else None
+     # Índice espacial (rejilla) en lugar de recorrer todos los puntos en cada clic.
+     # Solo devolver si está suficientemente cerca (umbral de 0.01 grados²)
+     number = self.current_airspace.spatial_index().nearest(lon, lat, max_distance=0.1)
+     return None if number is None else self.current_airspace.get_point(number)
 
  def select_navpoint(self, navpoint):
      """Maneja la selección de un punto de navegación"""
@@ -2185,9 +2167,31 @@ class GraphApp:
 
 
 
-         # Implementar búsqueda de camino alternativo para airspace
-         # (similar a A* pero evitando los nodos en avoid_nodes)
-         pass
+         # A* (con landmarks) sobre los segmentos salientes filtrados (avoid_nodes guarda números de NavPoint);
+         # si no hay camino ni sin evitar nada, no hace falta buscar
+         path = None
+         if CanReachNavPoint(self.current_airspace, start_id, end_id):
+             heuristic = self.current_landmarks.lower_bound if self.current_landmarks else None
+             path = FindAlternativeNavPath(self.current_airspace, start_id, end_id, self.avoid_nodes,
+                                           heuristic=heuristic)
+
+
+
+
+
+
+
+
+         if path:
+             self.current_path = path
+             self.current_route = None
+             self.plot_airspace()
+             self.update_info(f"Alternative path (avoiding {len(self.avoid_nodes)} points):\n" +
+                              f"{' -> '.join([p.name for p in path.points])}\n" +
+                              f"Total distance: {path.cost:.2f} km")
+         else:
+             self.update_info(f"No alternative path exists between {start_id} and {end_id} " +
+                              f"while avoiding {len(self.avoid_nodes)} points")
      else:
          start_name = self.selected_nodes[0].name
          end_name = self.selected_nodes[1].name
@@ -2211,6 +2215,7 @@ class GraphApp:
 
          if path:
              self.current_path = path
+             self.current_route = None
              self.plot_graph()
              path_names = [node.name for node in path.nodes]
              self.update_info(f"Alternative path (avoiding {len(self.avoid_nodes)} nodes):\n" +
@@ -2232,9 +2237,66 @@ class GraphApp:
 
 
 
-     # Implementar lógica de optimización según criterios específicos
-     # (por ejemplo, menor número de segmentos, menor costo total, etc.)
-     pass
+     # Frente de Pareto: rutas que no empeoran a otra en distancia y número de segmentos a la vez
+     if self.current_airspace:
+         start = self.selected_nodes[0].number
+         end = self.selected_nodes[1].number
+         routes = FindParetoNavRoutes(self.current_airspace, start, end)
+     else:
+         start = self.selected_nodes[0].name
+         end = self.selected_nodes[1].name
+         routes = FindParetoRoutes(self.current_graph, start, end)
+
+
+
+
+     if not routes:
+         self.update_info(f"No existe camino entre {start} y {end}")
+         return
+
+
+
+
+     def describe(route):
+         names = [p.name for p in route.points] if self.current_airspace else [n.name for n in route.nodes]
+         return (f"Ruta óptima ({route.criteria['hops']} segmentos, costo {route.cost:.2f}):\n" +
+                 f"{' -> '.join(names)}")
+
+     def show_route(index):
+         self.current_path = routes[index]
+         self.current_route = None
+         if self.current_airspace:
+             self.plot_airspace()
+         else:
+             self.plot_graph()
+         self.update_info(describe(routes[index]))
+
+
+
+
+     # Diálogo con el frente para elegir la ruta que se dibuja
+     dialog = tk.Toplevel(self.root)
+     dialog.title("Pareto Routes")
+     ttk.Label(dialog, text=f"{len(routes)} non-dominated routes (cost / segments):").pack(padx=10, pady=5)
+     listbox = tk.Listbox(dialog, width=40, height=min(len(routes), 10))
+     for i, route in enumerate(routes):
+         listbox.insert(tk.END, f"{i + 1}. {route.cost:.2f} - {route.criteria['hops']} segments")
+     listbox.pack(padx=10, pady=5)
+
+     def on_select(event):
+         selection = listbox.curselection()
+         if selection:
+             show_route(selection[0])
+
+     listbox.bind("<<ListboxSelect>>", on_select)
+     ttk.Button(dialog, text="Close", command=dialog.destroy).pack(pady=5)
+
+
+
+
+     listbox.selection_set(0)
+     show_route(0)
+     self.update_status(f"Pareto front: {len(routes)} routes between {start} and {end}")
 
  # =============================================
  # Métodos auxiliares
@@ -2245,6 +2307,7 @@ class GraphApp:
      self.update_status("Loading example graph 1...")
      self.current_graph = CreateGraph_1()
      self.current_airspace = None
+     self.path_cache.clear()
      self.clear_analysis()
      self.plot_graph()
 
@@ -2253,6 +2316,7 @@ class GraphApp:
      self.update_status("Loading example graph 2...")
      self.current_graph = CreateGraph_2()
      self.current_airspace = None
+     self.path_cache.clear()
      self.clear_analysis()
      self.plot_graph()
 
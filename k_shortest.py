@@ -0,0 +1,180 @@
+import heapq
+from itertools import count
+
+from path import Path
+
+INFINITY = float('inf')
+
+
+def _DistancesTo(end, edges_in):
+    """Dijkstra hacia atrás: distancia de cada nodo hasta end"""
+    distances = {end: 0}
+    heap = [(0, 0, end)]
+    counter = count(1)
+    done = set()
+    while heap:
+        dist, _, current = heapq.heappop(heap)
+        if current in done:
+            continue
+        done.add(current)
+        for origin, cost in edges_in(current):
+            alt = dist + cost
+            if alt < distances.get(origin, INFINITY):
+                distances[origin] = alt
+                heapq.heappush(heap, (alt, next(counter), origin))
+    return distances
+
+
+def _SpurPath(start, end, edges_out, to_end, blocked_nodes, blocked_edges):
+    """
+    A* de start a end sin pasar por blocked_nodes ni por los segmentos blocked_edges
+
+    La heurística es la distancia exacta hasta end en el grafo completo, que sigue
+    siendo una cota inferior al quitar nodos y segmentos.
+
+    Returns:
+        tuple: (nodos, costos de cada segmento) o None si no hay camino
+    """
+    if start not in to_end:
+        return None
+    g_scores = {start: 0}
+    came_from = {start: (None, 0)}
+    closed = set()
+    counter = count(1)
+    heap = [(to_end[start], 0, start)]
+
+    while heap:
+        _, _, current = heapq.heappop(heap)
+        if current in closed:
+            continue
+        if current == end:
+            nodes, costs = [], []
+            while current is not None:
+                parent, cost = came_from[current]
+                nodes.append(current)
+                if parent is not None:
+                    costs.append(cost)
+                current = parent
+            nodes.reverse()
+            costs.reverse()
+            return nodes, costs
+        closed.add(current)
+
+        for neighbor, cost in edges_out(current):
+            if neighbor in closed or neighbor in blocked_nodes or (current, neighbor) in blocked_edges:
+                continue
+            h = to_end.get(neighbor)
+            if h is None:
+                continue  # Desde ahí no se llega al destino
+            tentative = g_scores[current] + cost
+            if tentative < g_scores.get(neighbor, INFINITY):
+                g_scores[neighbor] = tentative
+                came_from[neighbor] = (current, cost)
+                heapq.heappush(heap, (tentative + h, next(counter), neighbor))
+    return None
+
+
+def _Yen(start, end, k, edges_out, edges_in):
+    """
+    Algoritmo de Yen: los k caminos sin ciclos más cortos de start a end
+
+    Returns:
+        list: Lista de (nodos, costos de cada segmento), de menor a mayor costo total
+    """
+    to_end = _DistancesTo(end, edges_in)
+    first = _SpurPath(start, end, edges_out, to_end, set(), set())
+    if first is None:
+        return []
+
+    accepted = [first]
+    seen = {tuple(first[0])}
+    candidates = []  # Heap de (costo, desempate, nodos, costos)
+    counter = count()
+
+    while len(accepted) < k:
+        nodes, costs = accepted[-1]
+        for i in range(len(nodes) - 1):
+            root = nodes[:i + 1]
+            # Segmentos que ya usan, a partir de esta raíz, los caminos aceptados
+            blocked_edges = {(p[i], p[i + 1]) for p, _ in accepted if len(p) > i + 1 and p[:i + 1] == root}
+            spur = _SpurPath(nodes[i], end, edges_out, to_end, set(root[:-1]), blocked_edges)
+            if spur is None:
+                continue
+            candidate = root[:-1] + spur[0]
+            key = tuple(candidate)
+            if key in seen:
+                continue
+            seen.add(key)
+            candidate_costs = costs[:i] + spur[1]
+            heapq.heappush(candidates, (sum(candidate_costs), next(counter), candidate, candidate_costs))
+
+        if not candidates:
+            break
+        _, _, candidate, candidate_costs = heapq.heappop(candidates)
+        accepted.append((candidate, candidate_costs))
+
+    return accepted
+
+
+def FindKShortestPaths(graph, start_name, end_name, k):
+    """
+    Encuentra los k caminos sin ciclos más cortos entre dos nodos de un Graph (Yen)
+
+    Args:
+        graph (Graph): Grafo a analizar
+        start_name (str): Nombre del nodo inicial
+        end_name (str): Nombre del nodo destino
+        k (int): Número máximo de caminos
+
+    Returns:
+        list: Lista de Path ordenada por costo (puede tener menos de k caminos)
+    """
+    start_node = graph.get_node(start_name)
+    end_node = graph.get_node(end_name)
+    if not start_node or not end_node or k <= 0:
+        return []
+
+    def edges_out(node):
+        return [(neighbor, segment.cost) for neighbor, segment in graph.adjacency[node]]
+
+    def edges_in(node):
+        return [(origin, segment.cost) for origin, segment in graph.reverse_adjacency[node]]
+
+    paths = []
+    for nodes, costs in _Yen(start_node, end_node, k, edges_out, edges_in):
+        path = Path()
+        path.nodes = nodes
+        path.cost = sum(costs)
+        paths.append(path)
+    return paths
+
+
+def FindKShortestNavPaths(airspace, start_id, end_id, k):
+    """
+    Encuentra los k caminos sin ciclos más cortos entre dos puntos del espacio aéreo (Yen)
+
+    Args:
+        airspace (AirSpace): El espacio aéreo completo
+        start_id (int): Número del punto de inicio
+        end_id (int): Número del punto de destino
+        k (int): Número máximo de caminos
+
+    Returns:
+        list: Lista de Path (con points) ordenada por costo (puede tener menos de k caminos)
+    """
+    if not airspace.get_point(start_id) or not airspace.get_point(end_id) or k <= 0:
+        return []
+
+    def edges_out(number):
+        return [(s.destination_number, s.distance) for s in airspace.get_outgoing_segments(number)]
+
+    def edges_in(number):
+        return [(s.origin_number, s.distance) for s in airspace.get_incoming_segments(number)]
+
+    paths = []
+    for numbers, costs in _Yen(start_id, end_id, k, edges_out, edges_in):
+        path = Path()
+        path.points = [airspace.get_point(n) for n in numbers]
+        path.cost = sum(costs)
+        paths.append(path)
+    return paths
@@ -127,8 +127,8 @@ class KMLGenerator:
                 description=f"NavPoint {point.name} at ({point.latitude:.6f}, {point.longitude:.6f})"
             )
         for seg in airspace.nav_segments:
-            origin = next(p for p in airspace.nav_points if p.number == seg.origin_number)
-            dest = next(p for p in airspace.nav_points if p.number == seg.destination_number)
+            origin = airspace.get_point(seg.origin_number)
+            dest = airspace.get_point(seg.destination_number)
             self.add_line(
                 name=f"{origin.name}-{dest.name}",
                 points=[
@@ -139,14 +139,14 @@ class KMLGenerator:
             )
         for airport in airspace.nav_airports:
             if airport.sids:
-                first_sid = next(p for p in airspace.nav_points if p.number == airport.sids[0])
+                first_sid = airspace.get_point(airport.sids[0])
                 sids_data = [
                     {'name': p.name, 'lon': p.longitude, 'lat': p.latitude}
-                    for p in airspace.nav_points if p.number in airport.sids
+                    for p in map(airspace.get_point, airport.sids) if p
                 ]
                 stars_data = [
                     {'name': p.name, 'lon': p.longitude, 'lat': p.latitude}
-                    for p in airspace.nav_points if p.number in airport.stars
+                    for p in map(airspace.get_point, airport.stars) if p
                 ]
                 self.add_airport(
                     name=airport.name,
@@ -0,0 +1,292 @@
+import heapq
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from airspace import HaversineDistance
+from compact_airspace import _SourceSignature, _SourcesUnchanged
+
+LANDMARKS_MAGIC = b'LANDMARK'
+LANDMARKS_VERSION = 1
+LANDMARKS_HEADER = struct.Struct('<8sII')
+LANDMARKS_SECTIONS = ('numbers', 'landmarks', 'forward', 'backward')
+INFINITY = float('inf')
+
+
+class Landmarks:
+    def __init__(self, numbers, landmarks, forward, backward):
+        """
+        Tablas de distancias a unos pocos puntos de referencia (ALT: A*, landmarks y
+        desigualdad triangular)
+
+        Las tablas están ordenadas por punto: las distancias del punto de la fila i
+        son forward[i * k:(i + 1) * k], con k el número de landmarks.
+
+        Args:
+            numbers (array): Número de NavPoint de cada fila
+            landmarks (array): Número de NavPoint de cada landmark
+            forward (array): forward[i * k + l] = distancia del landmark l al punto i
+            backward (array): backward[i * k + l] = distancia del punto i al landmark l
+        """
+        self.numbers = numbers
+        self.landmarks = landmarks
+        self.forward = forward
+        self.backward = backward
+        self.row_of = dict(zip(numbers, range(len(numbers))))
+        self._target = None  # Último destino consultado y sus filas de las tablas
+        self._target_rows = None
+
+    def __repr__(self):
+        return f"Landmarks({len(self.landmarks)} landmarks over {len(self.numbers)} points)"
+
+    def lower_bound(self, point, end_point):
+        """
+        Cota inferior en km de la distancia por aerovía de point a end_point
+
+        Combina la distancia de círculo máximo con la desigualdad triangular para cada
+        landmark L: d(L, t) - d(L, v) y d(v, L) - d(t, L). Se puede pasar directamente
+        como heurística a FindShortestNavPath.
+
+        Args:
+            point (NavPoint): Punto actual
+            end_point (NavPoint): Punto de destino
+
+        Returns:
+            float: Cota inferior (admisible y consistente) en km
+        """
+        bound = HaversineDistance(point, end_point)
+        v = self.row_of.get(point.number)
+        if v is None or self.row_of.get(end_point.number) is None:
+            return bound  # Punto añadido después del preprocesado
+
+        k = len(self.landmarks)
+        if self._target != end_point.number:
+            # El destino no cambia durante una búsqueda: sus distancias se leen una vez
+            t = self.row_of[end_point.number]
+            self._target = end_point.number
+            self._target_rows = (self.forward[t * k:t * k + k].tolist(), self.backward[t * k:t * k + k].tolist())
+        to_target, from_target = self._target_rows
+        for to_t, to_v in zip(to_target, self.forward[v * k:v * k + k]):
+            # Las restas con infinito (puntos inalcanzables) se descartan
+            if bound < to_t - to_v < INFINITY:
+                bound = to_t - to_v
+        for from_v, from_t in zip(self.backward[v * k:v * k + k], from_target):
+            if bound < from_v - from_t < INFINITY:
+                bound = from_v - from_t
+        return bound
+
+
+def _NavDistances(airspace, row_of, source, reverse=False):
+    """
+    Dijkstra completo desde un punto sobre los índices del espacio aéreo
+
+    Args:
+        airspace (AirSpace): Espacio aéreo
+        row_of (dict): Número de NavPoint -> fila
+        source (int): Número del punto de inicio
+        reverse (bool): Seguir los segmentos entrantes (distancias hacia source)
+
+    Returns:
+        array: Distancia de cada fila (infinito si no se alcanza)
+    """
+    distances = array('d', [INFINITY]) * len(row_of)
+    distances[row_of[source]] = 0
+    heap = [(0, source)]
+
+    while heap:
+        dist, current = heapq.heappop(heap)
+        if dist > distances[row_of[current]]:
+            continue  # Entrada obsoleta
+        if reverse:
+            edges = ((seg.origin_number, seg.distance) for seg in airspace.get_incoming_segments(current))
+        else:
+            edges = ((seg.destination_number, seg.distance) for seg in airspace.get_outgoing_segments(current))
+        for neighbor, distance in edges:
+            row = row_of.get(neighbor)
+            if row is None:
+                continue
+            alt = dist + distance
+            if alt < distances[row]:
+                distances[row] = alt
+                heapq.heappush(heap, (alt, neighbor))
+
+    return distances
+
+
+def BuildLandmarks(airspace, count=8):
+    """
+    Elige landmarks por selección del punto más lejano y calcula sus tablas de distancias
+
+    El primer landmark es el punto más alejado del primer NavPoint; cada uno de los
+    siguientes es el punto más alejado de los landmarks ya elegidos.
+
+    Args:
+        airspace (AirSpace): Espacio aéreo a preprocesar
+        count (int): Número de landmarks (opcional)
+
+    Returns:
+        Landmarks: Tablas de distancias. Hay que volver a calcularlas si el espacio aéreo cambia
+    """
+    numbers = array('q', (p.number for p in airspace.nav_points))
+    row_of = dict(zip(numbers, range(len(numbers))))
+    n = len(numbers)
+    landmarks = array('q')
+    columns = []  # (forward, backward) de cada landmark
+    if n == 0:
+        return Landmarks(numbers, landmarks, array('d'), array('d'))
+
+    closeness = _NavDistances(airspace, row_of, numbers[0])
+    while len(landmarks) < min(count, n):
+        # Punto alcanzable más alejado de todos los landmarks elegidos
+        candidates = [(c, i) for i, c in enumerate(closeness) if c < INFINITY and numbers[i] not in landmarks]
+        if not candidates:
+            break
+        _, row = max(candidates)
+        landmarks.append(numbers[row])
+
+        forward = _NavDistances(airspace, row_of, numbers[row])
+        backward = _NavDistances(airspace, row_of, numbers[row], reverse=True)
+        columns.append((forward, backward))
+        if len(landmarks) == 1:
+            closeness = array('d', map(min, forward, backward))
+        else:
+            closeness = array('d', map(min, closeness, forward, backward))
+
+    # Pasar a tablas ordenadas por punto
+    k = len(landmarks)
+    forward_table = array('d', [INFINITY]) * (n * k)
+    backward_table = array('d', [INFINITY]) * (n * k)
+    for l, (forward, backward) in enumerate(columns):
+        forward_table[l::k] = forward
+        backward_table[l::k] = backward
+    return Landmarks(numbers, landmarks, forward_table, backward_table)
+
+
+def SaveLandmarks(landmarks, filename, source_files):
+    """
+    Guarda las tablas de landmarks en un archivo binario junto a los datos
+
+    Args:
+        landmarks (Landmarks): Tablas a guardar
+        filename (str): Ruta del archivo
+        source_files (list): Archivos de texto de los que procede el espacio aéreo
+
+    Returns:
+        bool: True si se guardó correctamente, False si no
+    """
+    header = {
+        'byteorder': sys.byteorder,
+        'sources': [_SourceSignature(f) for f in source_files],
+        'sections': {},
+    }
+    offset = 0
+    for name in LANDMARKS_SECTIONS:
+        values = getattr(landmarks, name)
+        typecode = values.format if isinstance(values, memoryview) else values.typecode
+        header['sections'][name] = [offset, len(values), typecode]
+        offset += len(values) * values.itemsize
+    header_bytes = json.dumps(header).encode('utf-8')
+    padding = -(LANDMARKS_HEADER.size + len(header_bytes)) % 8
+
+    tmp_file = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(LANDMARKS_HEADER.pack(LANDMARKS_MAGIC, LANDMARKS_VERSION, len(header_bytes) + padding))
+            f.write(header_bytes + b' ' * padding)
+            for name in LANDMARKS_SECTIONS:
+                f.write(getattr(landmarks, name))
+        os.replace(tmp_file, filename)
+        return True
+    except OSError as e:
+        print(f"Error saving landmarks: {e}")
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        return False
+
+
+def _CheckLandmarkSections(sections, start, file_size):
+    """
+    Comprueba que las tablas caben en el archivo y que su tamaño es puntos × landmarks
+
+    Returns:
+        dict: Nombre -> (byte inicial, byte final, typecode) de cada sección
+
+    Raises:
+        ValueError: Si falta alguna sección, se sale del archivo o su longitud no cuadra
+    """
+    layout = {}
+    lengths = {}
+    for name in LANDMARKS_SECTIONS:
+        offset, length, typecode = sections[name]
+        if typecode != ('d' if name in ('forward', 'backward') else 'q'):
+            raise ValueError(f"La sección {name} tiene un tipo inesperado ({typecode})")
+        begin = start + offset
+        end = begin + length * array(typecode).itemsize
+        if offset < 0 or length < 0 or end > file_size:
+            raise ValueError(f"La sección {name} se sale del archivo")
+        layout[name] = (begin, end, typecode)
+        lengths[name] = length
+
+    table = lengths['numbers'] * lengths['landmarks']
+    if lengths['forward'] != table or lengths['backward'] != table:
+        raise ValueError("Las tablas de distancias no tienen puntos × landmarks valores")
+    return layout
+
+
+def LoadLandmarks(filename, source_files=None):
+    """
+    Abre un archivo de landmarks mapeándolo en memoria
+
+    Args:
+        filename (str): Ruta del archivo
+        source_files (list): Si se indica, el archivo se descarta si estos archivos han cambiado
+
+    Returns:
+        Landmarks: Tablas cargadas, o None si el archivo no existe o no es válido
+    """
+    if not os.path.exists(filename):
+        return None
+    try:
+        with open(filename, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        magic, version, header_size = LANDMARKS_HEADER.unpack_from(mapping, 0)
+        if magic != LANDMARKS_MAGIC or version != LANDMARKS_VERSION:
+            raise ValueError("Formato de landmarks desconocido")
+        start = LANDMARKS_HEADER.size + header_size
+        if start > len(mapping):
+            raise ValueError("Cabecera incompleta")
+        header = json.loads(mapping[LANDMARKS_HEADER.size:start].decode('utf-8'))
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError("Orden de bytes distinto")
+        if source_files is not None and not _SourcesUnchanged(header['sources'], source_files):
+            raise ValueError("Los archivos de origen han cambiado")
+        layout = _CheckLandmarkSections(header['sections'], start, len(mapping))
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        mapping.close()
+        return None
+
+    data = memoryview(mapping)
+    sections = {name: data[begin:end].cast(typecode) for name, (begin, end, typecode) in layout.items()}
+    landmarks = Landmarks(sections['numbers'], sections['landmarks'], sections['forward'], sections['backward'])
+    landmarks._mapping = mapping  # Mantener el archivo mapeado mientras se use
+    return landmarks
+
+
+def LoadLandmarksWithCache(airspace, filename, source_files, count=8):
+    """
+    Carga los landmarks del archivo si sigue siendo válido; si no, los calcula y lo vuelve a crear
+
+    Returns:
+        Landmarks: Tablas de distancias del espacio aéreo
+    """
+    landmarks = LoadLandmarks(filename, source_files)
+    if landmarks is None or len(landmarks.landmarks) != min(count, len(airspace.nav_points)):
+        landmarks = BuildLandmarks(airspace, count)
+        SaveLandmarks(landmarks, filename, source_files)
+    return landmarks
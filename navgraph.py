@@ -0,0 +1,190 @@
+import heapq
+import math
+import weakref
+from array import array
+from collections import Counter
+from itertools import accumulate
+
+from airspace import EARTH_RADIUS_KM
+from path import Path
+from reachability import BreadthFirstOrder
+
+
+class NavGraph:
+    def __init__(self, airspace, numbers, latitudes, longitudes, origins, destinations, weights):
+        """
+        Vista inmutable de un espacio aéreo en formato CSR (compressed sparse row)
+
+        Los puntos se identifican por su índice 0..n-1. Los segmentos que salen del
+        punto i son targets[offsets[i]:offsets[i + 1]], con su distancia en weights.
+
+        La vista solo guarda una referencia débil al espacio aéreo, así que se puede
+        guardar en cachés indexadas por el propio espacio aéreo sin mantenerlo vivo.
+
+        Args:
+            airspace (AirSpace): Espacio aéreo de origen (para devolver NavPoint)
+            numbers (array): Número de NavPoint de cada índice
+            latitudes, longitudes (array): Coordenadas en grados de cada índice
+            origins, destinations (array): Índices de origen y destino de cada segmento
+            weights (array): Distancia en km de cada segmento
+        """
+        self._airspace = weakref.ref(airspace)
+        self.version = airspace.version  # Versión del espacio aéreo con la que se construyó
+        self.numbers = numbers
+        self.index_of = dict(zip(numbers, range(len(numbers))))
+
+        # Valores precalculados para la heurística de círculo máximo
+        self.lat_rad = array('d', map(math.radians, latitudes))
+        self.lon_rad = array('d', map(math.radians, longitudes))
+        self.cos_lat = array('d', map(math.cos, self.lat_rad))
+
+        # Ordenación estable por origen: se conserva el orden de los segmentos de cada punto
+        order = sorted(range(len(origins)), key=origins.__getitem__)
+        counts = Counter(origins)
+        self.offsets = array('q', accumulate((counts.get(i, 0) for i in range(len(numbers))), initial=0))
+        self.targets = array('q', map(destinations.__getitem__, order))
+        self.weights = array('d', map(weights.__getitem__, order))
+
+    def __repr__(self):
+        return f"NavGraph with {len(self.numbers)} points and {len(self.targets)} segments"
+
+    @property
+    def airspace(self):
+        """Espacio aéreo de origen, o None si ya no existe"""
+        return self._airspace()
+
+    def is_current(self):
+        """True si el espacio aéreo sigue existiendo y no ha cambiado desde que se construyó la vista"""
+        airspace = self.airspace
+        return airspace is not None and airspace.version == self.version
+
+    def point(self, index):
+        """Devuelve el NavPoint del índice indicado"""
+        return self.airspace.get_point(self.numbers[index])
+
+    def distance_bound(self, i, j):
+        """Distancia de círculo máximo (cota inferior en km) entre dos índices"""
+        sin_dlat = math.sin((self.lat_rad[j] - self.lat_rad[i]) / 2)
+        sin_dlon = math.sin((self.lon_rad[j] - self.lon_rad[i]) / 2)
+        a = sin_dlat * sin_dlat + self.cos_lat[i] * self.cos_lat[j] * sin_dlon * sin_dlon
+        return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def BuildNavGraph(airspace):
+    """
+    Construye la vista CSR de un AirSpace (o de un CompactAirSpace)
+
+    Args:
+        airspace (AirSpace): Espacio aéreo a convertir
+
+    Returns:
+        NavGraph: Vista CSR inmutable. Hay que volver a construirla si el espacio aéreo cambia (ver is_current)
+    """
+    if hasattr(airspace, 'origin_rows'):
+        # CompactAirSpace: las columnas ya tienen el formato necesario
+        return NavGraph(airspace, array('q', airspace.numbers), airspace.latitudes, airspace.longitudes,
+                        airspace.origin_rows, airspace.destination_rows, airspace.distances)
+
+    numbers = array('q', (p.number for p in airspace.nav_points))
+    index_of = dict(zip(numbers, range(len(numbers))))
+    origins, destinations, weights = array('q'), array('q'), array('d')
+    for seg in airspace.nav_segments:
+        origin = index_of.get(seg.origin_number)
+        destination = index_of.get(seg.destination_number)
+        if origin is None or destination is None:
+            continue  # Segmento con puntos desconocidos
+        origins.append(origin)
+        destinations.append(destination)
+        weights.append(seg.distance)
+    return NavGraph(airspace, numbers,
+                    array('d', (p.latitude for p in airspace.nav_points)),
+                    array('d', (p.longitude for p in airspace.nav_points)),
+                    origins, destinations, weights)
+
+
+def GetReachableNavPointsCSR(navgraph, start_id):
+    """
+    Obtiene todos los puntos de navegación alcanzables desde un punto inicial (BFS sobre CSR)
+
+    Args:
+        navgraph (NavGraph): Vista CSR del espacio aéreo
+        start_id (int): Número del punto de inicio
+
+    Returns:
+        list: Lista de NavPoint alcanzables, en el mismo orden que GetReachableNavPoints
+    """
+    start = navgraph.index_of.get(start_id)
+    if start is None:
+        return []
+
+    order = BreadthFirstOrder(navgraph.offsets, navgraph.targets, start)
+    return [navgraph.point(i) for i in order]
+
+
+def _PathFromParents(navgraph, parents, end, cost):
+    """Construye el Path hasta end siguiendo los punteros al padre"""
+    indices = []
+    current = end
+    while current is not None:
+        indices.append(current)
+        current = parents[current]
+    indices.reverse()
+
+    path = Path()
+    path.points = [navgraph.point(i) for i in indices]
+    path.cost = cost
+    return path
+
+
+def FindShortestNavPathCSR(navgraph, start_id, end_id, stats=None):
+    """
+    Encuentra el camino más corto entre dos puntos usando A* sobre la vista CSR
+
+    Args:
+        navgraph (NavGraph): Vista CSR del espacio aéreo
+        start_id (int): Número del punto de inicio
+        end_id (int): Número del punto de destino
+        stats (dict): Si se indica, se guarda en stats['expanded'] el número de puntos expandidos
+
+    Returns:
+        Path: Objeto con los puntos del camino y el costo total, o None si no hay camino
+    """
+    start = navgraph.index_of.get(start_id)
+    end = navgraph.index_of.get(end_id)
+    if start is None or end is None:
+        return None
+
+    offsets, targets, weights = navgraph.offsets, navgraph.targets, navgraph.weights
+    bound = navgraph.distance_bound
+    closed = bytearray(len(navgraph.numbers))
+    g_scores = {start: 0}
+    parents = {start: None}
+    open_set = [(bound(start, end), start)]
+    expanded = 0
+
+    while open_set:
+        _, current = heapq.heappop(open_set)
+        if closed[current]:
+            continue
+        closed[current] = 1
+        expanded += 1
+
+        if current == end:
+            if stats is not None:
+                stats['expanded'] = expanded
+            return _PathFromParents(navgraph, parents, end, g_scores[end])
+
+        g_current = g_scores[current]
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[k]
+            if closed[neighbor]:
+                continue
+            tentative = g_current + weights[k]
+            if tentative < g_scores.get(neighbor, math.inf):
+                g_scores[neighbor] = tentative
+                parents[neighbor] = current
+                heapq.heappush(open_set, (tentative + bound(neighbor, end), neighbor))
+
+    if stats is not None:
+        stats['expanded'] = expanded
+    return None
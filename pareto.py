@@ -0,0 +1,159 @@
+import heapq
+
+from k_shortest import _DistancesTo
+from path import Path
+
+
+def _Dominated(costs, labels):
+    """True si alguna etiqueta de labels es igual o mejor que costs en todos los criterios"""
+    for other in labels:
+        if all(a <= b for a, b in zip(other, costs)):
+            return True
+    return False
+
+
+def _ParetoLabels(start, end, edges_out, edges_in, criteria):
+    """
+    Búsqueda multicriterio por etiquetas (Martins) de start a end
+
+    Cada etiqueta guarda el vector de costos de un camino. Las etiquetas se procesan
+    en orden lexicográfico de costo + cota inferior hasta end, y se descartan las
+    dominadas por otra etiqueta del mismo nodo o por el frente ya encontrado en end.
+    Las cotas de los dos primeros criterios (distancia y saltos) son las exactas del
+    grafo completo; para el resto se usa 0.
+
+    Args:
+        edges_out: Función nodo -> lista de (vecino, segmento)
+        edges_in: Función nodo -> lista de (origen, segmento)
+        criteria (list): Funciones segmento -> costo (no negativo), la primera la distancia
+
+    Returns:
+        list: Lista de (costos, nodos del camino) del frente de Pareto, por distancia
+    """
+    distance = criteria[0]
+    to_end = _DistancesTo(end, lambda node: [(o, distance(s)) for o, s in edges_in(node)])
+    hops_to_end = _DistancesTo(end, lambda node: [(o, 1) for o, _ in edges_in(node)])
+    if start not in to_end:
+        return []
+    padding = (0,) * (len(criteria) - 2)
+
+    def estimate(costs, node):
+        bound = (to_end[node], hops_to_end[node]) + padding
+        return tuple(c + b for c, b in zip(costs, bound))
+
+    labels = [((0,) * len(criteria), start, -1)]  # (costos, nodo, índice de la etiqueta padre)
+    heap = [(estimate(labels[0][0], start), 0)]
+    permanent = {}  # Nodo -> lista de costos de sus etiquetas definitivas
+    front = []
+
+    while heap:
+        _, index = heapq.heappop(heap)
+        costs, node, _ = labels[index]
+        node_labels = permanent.setdefault(node, [])
+        if _Dominated(costs, node_labels) or _Dominated(estimate(costs, node), front):
+            continue
+        node_labels.append(costs)
+        if node == end:
+            front.append(costs)
+            continue  # Un camino que pasa por end y vuelve no es un camino simple
+
+        for neighbor, segment in edges_out(node):
+            if neighbor not in to_end:
+                continue  # Desde ahí no se llega al destino
+            new_costs = tuple(c + f(segment) for c, f in zip(costs, criteria))
+            if _Dominated(new_costs, permanent.get(neighbor, ())):
+                continue
+            key = estimate(new_costs, neighbor)
+            if _Dominated(key, front):
+                continue
+            labels.append((new_costs, neighbor, index))
+            heapq.heappush(heap, (key, len(labels) - 1))
+
+    # Reconstruir los caminos de las etiquetas del frente
+    result = []
+    for index, (costs, node, _) in enumerate(labels):
+        if node != end or costs not in front:
+            continue
+        front.remove(costs)  # Una sola ruta por vector de costos
+        nodes = []
+        while index >= 0:
+            _, node, index = labels[index]
+            nodes.append(node)
+        nodes.reverse()
+        result.append((costs, nodes))
+    result.sort(key=lambda item: item[0])
+    return result
+
+
+def _Criteria(distance, extra_criteria):
+    names = ['distance', 'hops'] + list(extra_criteria or {})
+    functions = [distance, lambda segment: 1] + list((extra_criteria or {}).values())
+    return names, functions
+
+
+def FindParetoRoutes(graph, start_name, end_name, extra_criteria=None):
+    """
+    Frente de Pareto de rutas entre dos nodos de un Graph: ninguna ruta del frente es
+    peor que otra en todos los criterios a la vez
+
+    Args:
+        graph (Graph): Grafo a analizar
+        start_name (str): Nombre del nodo inicial
+        end_name (str): Nombre del nodo destino
+        extra_criteria (dict): Criterios adicionales, nombre -> función Segment -> costo
+            no negativo que se suma a lo largo del camino (opcional)
+
+    Returns:
+        list: Lista de Path ordenada por costo; cada Path tiene además criteria, un
+        diccionario con el valor de cada criterio ('distance', 'hops' y los extra)
+    """
+    start_node = graph.get_node(start_name)
+    end_node = graph.get_node(end_name)
+    if not start_node or not end_node:
+        return []
+    names, functions = _Criteria(lambda segment: segment.cost, extra_criteria)
+
+    paths = []
+    for costs, nodes in _ParetoLabels(start_node, end_node, lambda node: graph.adjacency[node],
+                                      lambda node: graph.reverse_adjacency[node], functions):
+        path = Path()
+        path.nodes = nodes
+        path.cost = costs[0]
+        path.criteria = dict(zip(names, costs))
+        paths.append(path)
+    return paths
+
+
+def FindParetoNavRoutes(airspace, start_id, end_id, extra_criteria=None):
+    """
+    Frente de Pareto de rutas entre dos puntos del espacio aéreo (distancia, número de
+    segmentos y criterios adicionales)
+
+    Args:
+        airspace (AirSpace): El espacio aéreo completo
+        start_id (int): Número del punto de inicio
+        end_id (int): Número del punto de destino
+        extra_criteria (dict): Criterios adicionales, nombre -> función NavSegment ->
+            costo no negativo que se suma a lo largo del camino (opcional)
+
+    Returns:
+        list: Lista de Path (con points) ordenada por distancia, cada uno con criteria
+    """
+    if not airspace.get_point(start_id) or not airspace.get_point(end_id):
+        return []
+    names, functions = _Criteria(lambda segment: segment.distance, extra_criteria)
+
+    def edges_out(number):
+        return [(s.destination_number, s) for s in airspace.get_outgoing_segments(number)]
+
+    def edges_in(number):
+        return [(s.origin_number, s) for s in airspace.get_incoming_segments(number)]
+
+    paths = []
+    for costs, numbers in _ParetoLabels(start_id, end_id, edges_out, edges_in, functions):
+        path = Path()
+        path.points = [airspace.get_point(n) for n in numbers]
+        path.cost = costs[0]
+        path.criteria = dict(zip(names, costs))
+        paths.append(path)
+    return paths
@@ -1,4 +1,6 @@
+import heapq
 from node import Distance
+from reachability import ReachableNodes
 
 
 class Path:
@@ -51,77 +53,84 @@ def GetReachableNodes(graph, start_node_name):
         list: Lista de nodos alcanzables
     """
     # Encontrar el nodo inicial
-    start_node = next((n for n in graph.nodes if n.name == start_node_name), None)
+    start_node = graph.get_node(start_node_name)
     if not start_node:
         return []
 
-    visited = set()
-    queue = [start_node]
-    reachable = []
+    # Los vecinos son los de graph.get_neighbors: segmentos salientes y entrantes
+    return ReachableNodes(graph, start_node, undirected=True)
 
-    while queue:
-        current = queue.pop(0)
 
-        if current in visited:
-            continue
+def Dijkstra(graph, start_node, end_node=None, avoid_nodes=None):
+    """
+    Algoritmo de Dijkstra con cola de prioridad (heap) sobre los segmentos salientes
 
-        visited.add(current)
-        reachable.append(current)
+    Args:
+        graph (Graph): Grafo a analizar
+        start_node (Node): Nodo inicial
+        end_node (Node): Nodo destino; la búsqueda termina al extraerlo (opcional)
+        avoid_nodes (set): Nombres de nodos que no se pueden atravesar (opcional)
 
-        # Obtener vecinos usando el método del grafo
-        for neighbor in graph.get_neighbors(current):
-            if neighbor not in visited and neighbor not in queue:
-                queue.append(neighbor)
+    Returns:
+        tuple: (distances, previous) con las distancias y el predecesor de cada nodo alcanzado
+    """
+    avoid_nodes = avoid_nodes or set()
+    distances = {start_node: 0}
+    previous = {start_node: None}
+    visited = set()
+    heap = [(0, 0, start_node)]  # (distancia, desempate, nodo)
+    counter = 1
 
-    return reachable
+    while heap:
+        dist, _, current = heapq.heappop(heap)
+        if current in visited:
+            continue  # Entrada obsoleta (decrease-key perezoso)
+        visited.add(current)
 
+        if current == end_node:
+            break
 
-def FindAlternativePath(graph, start_name, end_name, avoid_nodes):
-    """Encuentra un camino alternativo evitando nodos específicos (usa Dijkstra modificado)."""
-    start_node = next((node for node in graph.nodes if node.name == start_name), None)
-    end_node = next((node for node in graph.nodes if node.name == end_name), None)
+        for neighbor, segment in graph.adjacency[current]:
+            if neighbor in visited or neighbor.name in avoid_nodes:
+                continue
+            alt = dist + segment.cost
+            if alt < distances.get(neighbor, float('inf')):
+                distances[neighbor] = alt
+                previous[neighbor] = current
+                heapq.heappush(heap, (alt, counter, neighbor))
+                counter += 1
 
-    if not start_node or not end_node:
-        return None
+    return distances, previous
 
-    # Inicialización
-    distances = {node.name: float('inf') for node in graph.nodes}
-    distances[start_name] = 0
-    previous = {node.name: None for node in graph.nodes}
-    unvisited = set(node.name for node in graph.nodes if node.name not in avoid_nodes)  # Ignorar nodos a evitar
 
-    while unvisited:
-        current_name = min(unvisited, key=lambda name: distances[name])
-        unvisited.remove(current_name)
+def BuildPath(previous, distances, end_node):
+    """Reconstruye el Path hasta end_node a partir de los predecesores, o None si no se alcanzó"""
+    if end_node not in distances:
+        return None
 
-        if current_name == end_name:
-            path = Path()
-            path.nodes = []
-            path.cost = distances[end_name]
+    path = Path()
+    current = end_node
+    while current is not None:
+        path.nodes.append(current)
+        current = previous[current]
+    path.nodes.reverse()
+    path.cost = distances[end_node]
+    return path
 
-            current = end_name
-            while current:
-                node = next((n for n in graph.nodes if n.name == current), None)
-                path.nodes.insert(0, node)
-                current = previous[current]
 
-            return path
+def FindAlternativePath(graph, start_name, end_name, avoid_nodes):
+    """Encuentra un camino alternativo evitando nodos específicos (usa Dijkstra modificado)."""
+    start_node = graph.get_node(start_name)
+    end_node = graph.get_node(end_name)
 
-        current_node = next((node for node in graph.nodes if node.name == current_name), None)
-        for neighbor in current_node.neighbors:
-            if neighbor.name in avoid_nodes:  # Saltar nodos prohibidos
-                continue
+    if not start_node or not end_node:
+        return None
 
-            segment = next((seg for seg in graph.segments
-                            if (seg.origin == current_node and seg.destination == neighbor) or
-                            (seg.origin == neighbor and seg.destination == current_node)), None)
-            if segment:
-                distance = distances[current_name] + segment.cost
-                if distance < distances[neighbor.name]:
-                    distances[neighbor.name] = distance
-                    previous[neighbor.name] = current_name
+    if start_name in avoid_nodes or end_name in avoid_nodes:
+        return None  # No hay camino válido
 
-    return None  # No hay camino válido
+    distances, previous = Dijkstra(graph, start_node, end_node, avoid_nodes)
+    return BuildPath(previous, distances, end_node)
 
 
 def FindShortestPath(graph, start_node_name, end_node_name):
@@ -135,8 +144,8 @@ def FindShortestPath(graph, start_node_name, end_node_name):
         Objeto Path con los nodos del camino y el costo total, o None si no hay camino
     """
     # 1. Obtener los nodos de inicio y fin
-    start_node = next((n for n in graph.nodes if n.name == start_node_name), None)
-    end_node = next((n for n in graph.nodes if n.name == end_node_name), None)
+    start_node = graph.get_node(start_node_name)
+    end_node = graph.get_node(end_node_name)
 
     if not start_node or not end_node:
         return None  # No existe alguno de los nodos
@@ -145,55 +154,40 @@ def FindShortestPath(graph, start_node_name, end_node_name):
     def heuristic(node):
         return ((node.x - end_node.x) ** 2 + (node.y - end_node.y) ** 2) ** 0.5
 
-    # 3. Inicializar estructuras de datos
-    open_set = {start_node}  # Nodos por explorar
-    came_from = {}  # Diccionario para reconstruir el camino
-
-    # g_score[n] = costo real desde el inicio hasta n
-    g_score = {node: float('inf') for node in graph.nodes}
-    g_score[start_node] = 0
-
-    # f_score[n] = g_score[n] + heurística estimada al destino
-    f_score = {node: float('inf') for node in graph.nodes}
-    f_score[start_node] = heuristic(start_node)
+    # 3. Inicializar estructuras de datos (solo para los nodos que se van alcanzando)
+    open_heap = [(heuristic(start_node), 0, start_node)]  # (f_score, desempate, nodo)
+    closed_set = set()  # Nodos ya expandidos
+    came_from = {start_node: None}  # Punteros al padre para reconstruir el camino
+    g_score = {start_node: 0}  # g_score[n] = costo real desde el inicio hasta n
+    counter = 1
 
     # 4. Bucle principal del algoritmo A*
-    while open_set:
+    while open_heap:
         # Seleccionar nodo con menor f_score
-        current = min(open_set, key=lambda node: f_score[node])
+        _, _, current = heapq.heappop(open_heap)
+        if current in closed_set:
+            continue  # Entrada obsoleta en el heap
 
         # Si llegamos al destino, reconstruir el camino
         if current == end_node:
-            path_nodes = []
-            while current in came_from:
-                path_nodes.insert(0, current)
-                current = came_from[current]
-            path_nodes.insert(0, start_node)
-
-            # Crear objeto Path con el camino encontrado
-            path = Path()
-            path.nodes = path_nodes
-            path.cost = g_score[end_node]
-            return path
+            return BuildPath(came_from, g_score, end_node)
 
-        open_set.remove(current)
+        closed_set.add(current)
 
         # Explorar vecinos
-        for neighbor in current.neighbors:
-            # Calcular nuevo g_score tentativo
-            segment_cost = graph.get_segment_cost(current, neighbor)
-            if segment_cost is None:
-                continue  # No hay segmento entre estos nodos
+        for neighbor, segment in graph.adjacency[current]:
+            if neighbor in closed_set:
+                continue
 
-            tentative_g = g_score[current] + segment_cost
+            # Calcular nuevo g_score tentativo
+            tentative_g = g_score[current] + segment.cost
 
             # Si encontramos un mejor camino al vecino
-            if tentative_g < g_score[neighbor]:
+            if tentative_g < g_score.get(neighbor, float('inf')):
                 came_from[neighbor] = current
                 g_score[neighbor] = tentative_g
-                f_score[neighbor] = tentative_g + heuristic(neighbor)
-                if neighbor not in open_set:
-                    open_set.add(neighbor)
+                heapq.heappush(open_heap, (tentative_g + heuristic(neighbor), counter, neighbor))
+                counter += 1
 
     # Si llegamos aquí, no hay camino
     return None
@@ -221,11 +215,7 @@ def PlotPath(graph, path):
             end = path.nodes[i + 1]
 
             # Find the segment between these nodes
-            seg = None
-            for s in graph.segments:
-                if s.origin == start and s.destination == end:
-                    seg = s
-                    break
+            seg = graph.get_segment(start, end)
 
             if seg:
                 plt.plot([start.x, end.x], [start.y, end.y],
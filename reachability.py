@@ -0,0 +1,268 @@
+import heapq
+from array import array
+from collections import deque
+
+BATCH_WIDTH = 256  # Orígenes por grupo en ReachableNavPointsWithinBatch (bits de cada máscara)
+
+
+def BreadthFirstOrder(offsets, targets, start):
+    """
+    BFS sobre una adyacencia CSR con índices enteros
+
+    Los vecinos de i son targets[offsets[i]:offsets[i + 1]]. Cada índice se marca en
+    un bytearray al entrar en la cola, así que se encola una sola vez.
+
+    Args:
+        offsets (array): Inicio de los vecinos de cada índice (n + 1 valores)
+        targets (array): Índices de los vecinos
+        start (int): Índice inicial
+
+    Returns:
+        list: Índices alcanzables en orden de visita (empezando por start)
+    """
+    visited = bytearray(len(offsets) - 1)
+    visited[start] = 1
+    queue = deque([start])
+    order = []
+
+    while queue:
+        current = queue.popleft()
+        order.append(current)
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[k]
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                queue.append(neighbor)
+
+    return order
+
+
+class GraphIndex:
+    def __init__(self, graph, undirected=False):
+        """
+        Vista CSR de un Graph con los nodos numerados 0..n-1
+
+        Args:
+            graph (Graph): Grafo de origen
+            undirected (bool): Incluir también los segmentos entrantes de cada nodo (opcional)
+        """
+        self.version = graph.version  # Versión del grafo con la que se construyó
+        self.nodes = list(graph.adjacency)
+        self.index_of = {node: i for i, node in enumerate(self.nodes)}
+        self.offsets = array('q', [0])
+        self.targets = array('q')
+        for node in self.nodes:
+            self.targets.extend(self.index_of[neighbor] for neighbor, _ in graph.adjacency[node])
+            if undirected:
+                self.targets.extend(self.index_of[origin] for origin, _ in graph.reverse_adjacency[node])
+            self.offsets.append(len(self.targets))
+
+    def __repr__(self):
+        return f"GraphIndex with {len(self.nodes)} nodes and {len(self.targets)} segments"
+
+
+def _View(data, kind):
+    """Vista CSR de data reutilizada mientras su versión no cambie (guardada en data._views)"""
+    views = data._views
+    view = views.get(kind)
+    if view is None or view.version != data.version:
+        if kind == 'airspace':
+            from navgraph import BuildNavGraph
+            view = BuildNavGraph(data)
+        else:
+            view = GraphIndex(data, undirected=kind == 'undirected')
+        views[kind] = view
+    return view
+
+
+def ReachableNodes(graph, start_node, undirected=False):
+    """
+    Nodos de un Graph alcanzables desde start_node
+
+    Args:
+        graph (Graph): Grafo a analizar
+        start_node (Node): Nodo inicial
+        undirected (bool): Seguir los segmentos en los dos sentidos (opcional)
+
+    Returns:
+        list: Lista de Node en orden BFS
+    """
+    view = _View(graph, 'undirected' if undirected else 'directed')
+    start = view.index_of.get(start_node)
+    if start is None:
+        return []
+    return [view.nodes[i] for i in BreadthFirstOrder(view.offsets, view.targets, start)]
+
+
+def ReachableNavPoints(airspace, start_id):
+    """
+    Puntos de navegación alcanzables desde start_id siguiendo los segmentos
+
+    Args:
+        airspace (AirSpace): Espacio aéreo (o CompactAirSpace)
+        start_id (int): Número del punto de inicio
+
+    Returns:
+        list: Lista de NavPoint en orden BFS
+    """
+    view = _View(airspace, 'airspace')
+    start = view.index_of.get(start_id)
+    if start is None:
+        return []
+    return [view.point(i) for i in BreadthFirstOrder(view.offsets, view.targets, start)]
+
+
+def BoundedBreadthFirst(offsets, targets, start, max_hops):
+    """
+    BFS truncado: solo avanza max_hops niveles desde start
+
+    Returns:
+        dict: Índice -> número de segmentos desde start (como máximo max_hops)
+    """
+    hops = {start: 0}
+    frontier = [start]
+    for level in range(1, max_hops + 1):
+        next_frontier = []
+        for current in frontier:
+            for k in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[k]
+                if neighbor not in hops:
+                    hops[neighbor] = level
+                    next_frontier.append(neighbor)
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    return hops
+
+
+def BoundedBreadthFirstBatch(offsets, targets, starts, max_hops):
+    """
+    BFS truncado desde varios orígenes a la vez (un bit por origen)
+
+    Cada índice guarda en un entero los orígenes que ya lo han alcanzado, así que cada
+    segmento se recorre una vez por nivel para todos los orígenes que comparten zona.
+
+    Returns:
+        list: Para cada origen, lista de (índice, saltos) ordenada por saltos e índice
+    """
+    reached = [0] * (len(offsets) - 1)  # Índice -> máscara de orígenes que ya lo alcanzaron
+    frontier = {}
+    for bit, start in enumerate(starts):
+        reached[start] |= 1 << bit
+        frontier[start] = frontier.get(start, 0) | 1 << bit
+    results = [[] for _ in starts]
+
+    level = 0
+    while frontier:
+        for index in sorted(frontier):
+            mask = frontier[index]
+            while mask:
+                low = mask & -mask
+                results[low.bit_length() - 1].append((index, level))
+                mask ^= low
+        if level == max_hops:
+            break
+        level += 1
+        next_frontier = {}
+        for current, mask in frontier.items():
+            for k in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[k]
+                new = mask & ~reached[neighbor]
+                if new:
+                    reached[neighbor] |= new
+                    next_frontier[neighbor] = next_frontier.get(neighbor, 0) | new
+        frontier = next_frontier
+    return results
+
+
+def BoundedDijkstra(offsets, targets, weights, start, max_distance):
+    """
+    Dijkstra truncado: no encola los puntos a más de max_distance de start
+
+    Returns:
+        dict: Índice -> distancia mínima desde start (como máximo max_distance)
+    """
+    distances = {start: 0}
+    settled = {}
+    heap = [(0, start)]
+    while heap:
+        dist, current = heapq.heappop(heap)
+        if current in settled:
+            continue
+        settled[current] = dist
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[k]
+            alt = dist + weights[k]
+            if alt <= max_distance and alt < distances.get(neighbor, float('inf')):
+                distances[neighbor] = alt
+                heapq.heappush(heap, (alt, neighbor))
+    return settled
+
+
+def _Bands(view, found):
+    """Lista de (NavPoint, distancia) ordenada por distancia (y por índice en caso de empate)"""
+    return [(view.point(i), d) for i, d in sorted(found.items(), key=lambda item: (item[1], item[0]))]
+
+
+def _CheckLimits(max_hops, max_distance):
+    if (max_hops is None) == (max_distance is None):
+        raise ValueError("Hay que indicar max_hops o max_distance (solo uno de los dos)")
+
+
+def ReachableNavPointsWithin(airspace, start_id, max_hops=None, max_distance=None):
+    """
+    Puntos de navegación a como máximo max_hops segmentos o max_distance km por aerovía
+
+    Args:
+        airspace (AirSpace): Espacio aéreo (o CompactAirSpace)
+        start_id (int): Número del punto de inicio
+        max_hops (int): Número máximo de segmentos (opcional)
+        max_distance (float): Distancia máxima en km (opcional)
+
+    Returns:
+        list: Lista de (NavPoint, saltos o km desde el inicio) ordenada por distancia
+    """
+    _CheckLimits(max_hops, max_distance)
+    view = _View(airspace, 'airspace')
+    start = view.index_of.get(start_id)
+    if start is None:
+        return []
+    if max_hops is not None:
+        return _Bands(view, BoundedBreadthFirst(view.offsets, view.targets, start, max_hops))
+    return _Bands(view, BoundedDijkstra(view.offsets, view.targets, view.weights, start, max_distance))
+
+
+def ReachableNavPointsWithinBatch(airspace, start_ids, max_hops):
+    """
+    ReachableNavPointsWithin(max_hops=...) para muchos puntos de inicio
+
+    Todos los orígenes avanzan juntos nivel a nivel (ver BoundedBreadthFirstBatch, en
+    grupos de BATCH_WIDTH orígenes) y cada NavPoint se crea una sola vez para todos.
+    Solo existe para saltos: con max_distance no hay trabajo que compartir y basta con
+    llamar a ReachableNavPointsWithin para cada origen.
+
+    Args:
+        airspace (AirSpace): Espacio aéreo (o CompactAirSpace)
+        start_ids (list): Números de los puntos de inicio
+        max_hops (int): Número máximo de segmentos
+
+    Returns:
+        dict: Número de inicio -> lista de (NavPoint, saltos), igual que
+        ReachableNavPointsWithin; los números que no existen no aparecen
+    """
+    view = _View(airspace, 'airspace')
+    starts = [start_id for start_id in dict.fromkeys(start_ids) if start_id in view.index_of]
+    points = {}
+    found = {}
+    for first in range(0, len(starts), BATCH_WIDTH):
+        group = starts[first:first + BATCH_WIDTH]
+        indices = [view.index_of[start_id] for start_id in group]
+        for start_id, result in zip(group, BoundedBreadthFirstBatch(view.offsets, view.targets, indices, max_hops)):
+            bands = []
+            for index, hops in result:
+                point = points.get(index)
+                if point is None:
+                    point = points[index] = view.point(index)
+                bands.append((point, hops))
+            found[start_id] = bands
+    return found
@@ -0,0 +1,167 @@
+import heapq
+from itertools import count
+
+from airspace import NavDijkstra, BuildNavPath
+from path import Dijkstra, BuildPath
+
+INFINITY = float('inf')
+
+
+def SegmentEnds(segment):
+    """(origen, destino, costo) de un Segment de Graph o de un NavSegment, con las claves del árbol"""
+    if hasattr(segment, 'origin_number'):
+        return segment.origin_number, segment.destination_number, segment.distance
+    return segment.origin, segment.destination, segment.cost
+
+
+class ShortestPathTree:
+    def __init__(self, data, origin):
+        """
+        Árbol de caminos mínimos desde un origen que se repara tras los cambios del grafo
+
+        update() lee el registro de cambios (data.changes) y solo vuelve a procesar los
+        nodos afectados: los que mejoran con un segmento nuevo o más barato y el
+        subárbol que colgaba de un segmento eliminado o más caro.
+
+        Args:
+            data (Graph): Graph o AirSpace
+            origin: Node de origen (Graph) o número del NavPoint de origen (AirSpace)
+        """
+        self.data = data
+        self.origin = origin
+        self.is_airspace = hasattr(data, 'get_outgoing_segments')
+        self.version = data.version
+        self.repaired = 0  # Nodos reprocesados en la última actualización
+        self._counter = count()  # Desempate en el heap (los Node no se pueden comparar)
+        self._compute()
+
+    def __repr__(self):
+        return f"ShortestPathTree({len(self.distances)} reached, version {self.version})"
+
+    def _compute(self):
+        """Calcula el árbol completo desde cero"""
+        if self.is_airspace:
+            self.distances, self.previous = NavDijkstra(self.data, self.origin)
+        elif self.origin in self.data.adjacency:
+            self.distances, self.previous = Dijkstra(self.data, self.origin)
+        else:
+            self.distances, self.previous = {}, {}  # El nodo de origen ya no existe
+        self.children = {}
+        for node, parent in self.previous.items():
+            if parent is not None:
+                self.children.setdefault(parent, set()).add(node)
+
+    def _edges_out(self, node):
+        if self.is_airspace:
+            return [(s.destination_number, s.distance) for s in self.data.get_outgoing_segments(node)]
+        return [(neighbor, s.cost) for neighbor, s in self.data.adjacency.get(node, [])]
+
+    def _edges_in(self, node):
+        if self.is_airspace:
+            return [(s.origin_number, s.distance) for s in self.data.get_incoming_segments(node)]
+        return [(origin, s.cost) for origin, s in self.data.reverse_adjacency.get(node, [])]
+
+    def _set_parent(self, node, parent):
+        old = self.previous.get(node)
+        if old is not None:
+            self.children[old].discard(node)
+        self.previous[node] = parent
+        self.children.setdefault(parent, set()).add(node)
+
+    def _propagate(self, heap):
+        """Dijkstra a partir de las etiquetas del heap (solo avanza por donde algo mejora)"""
+        distances = self.distances
+        while heap:
+            dist, _, node = heapq.heappop(heap)
+            if dist > distances.get(node, INFINITY):
+                continue
+            self.repaired += 1
+            for neighbor, cost in self._edges_out(node):
+                alt = dist + cost
+                if alt < distances.get(neighbor, INFINITY):
+                    distances[neighbor] = alt
+                    self._set_parent(neighbor, node)
+                    heapq.heappush(heap, (alt, next(self._counter), neighbor))
+
+    def _decrease(self, origin, destination, cost):
+        """Un segmento nuevo o más barato acorta el camino a destination"""
+        self.distances[destination] = self.distances[origin] + cost
+        self._set_parent(destination, origin)
+        self._propagate([(self.distances[destination], next(self._counter), destination)])
+
+    def _repair(self, root):
+        """Recalcula el subárbol de root después de perder (o encarecer) su segmento de entrada"""
+        affected = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            affected.append(node)
+            stack.extend(self.children.pop(node, ()))
+        affected_set = set(affected)
+        for node in affected:
+            parent = self.previous.pop(node, None)
+            if parent is not None and parent not in affected_set:
+                self.children[parent].discard(node)
+            self.distances.pop(node, None)
+
+        # Mejor entrada desde la parte del árbol que no ha cambiado
+        heap = []
+        for node in affected:
+            best, best_parent = INFINITY, None
+            for origin, cost in self._edges_in(node):
+                if origin in self.distances and self.distances[origin] + cost < best:
+                    best, best_parent = self.distances[origin] + cost, origin
+            if best_parent is not None:
+                self.distances[node] = best
+                self._set_parent(node, best_parent)
+                heapq.heappush(heap, (best, next(self._counter), node))
+        self.repaired += len(affected)
+        self._propagate(heap)
+
+    def update(self):
+        """
+        Aplica los cambios del grafo desde la última versión vista
+
+        Returns:
+            int: Número de nodos reprocesados (0 si el árbol no ha cambiado)
+        """
+        changes = self.data.changes.since(self.version)
+        self.version = self.data.version
+        self.repaired = 0
+        if changes is None:
+            self._compute()  # El registro ya no llega tan atrás
+            self.repaired = len(self.distances)
+            return self.repaired
+
+        for _, kind, item in changes:
+            if kind == 'remove_node':
+                if item == self.origin:
+                    self.distances, self.previous, self.children = {}, {}, {}
+                elif item in self.distances:
+                    self._repair(item)
+            elif kind in ('add_segment', 'remove_segment', 'change_segment'):
+                origin, destination, cost = SegmentEnds(item)
+                tree_edge = destination != self.origin and self.previous.get(destination) == origin
+                if kind == 'remove_segment':
+                    if tree_edge:
+                        self._repair(destination)
+                elif tree_edge and self.distances[origin] + cost > self.distances[destination]:
+                    self._repair(destination)  # La rama del árbol se ha encarecido
+                elif origin in self.distances and \
+                        self.distances[origin] + cost < self.distances.get(destination, INFINITY):
+                    self._decrease(origin, destination, cost)
+        return self.repaired
+
+    def path_to(self, end):
+        """
+        Camino mínimo hasta end según el árbol actual
+
+        Args:
+            end: Node (Graph) o número de NavPoint (AirSpace)
+
+        Returns:
+            Path: Objeto con el camino y el costo total, o None si no se alcanza
+        """
+        if self.is_airspace:
+            return BuildNavPath(self.data, self.previous, self.distances, end)
+        return BuildPath(self.previous, self.distances, end)
@@ -0,0 +1,176 @@
+import heapq
+import math
+from array import array
+
+
+class GridIndex:
+    def __init__(self, items=(), xs=(), ys=()):
+        """
+        Índice espacial de rejilla uniforme para buscar vecinos en el plano
+
+        Cada celda guarda los identificadores de sus puntos. El tamaño de celda se
+        elige para que haya del orden de un punto por celda y se recalcula cuando el
+        número de puntos se duplica. Las distancias son euclídeas sobre (x, y), igual
+        que al buscar el nodo o NavPoint más cercano a un clic (longitud y latitud en
+        grados). Con distancias iguales gana el punto añadido antes.
+
+        Args:
+            items (list): Objetos a indexar (opcional)
+            xs, ys: Coordenadas de cada objeto (opcional)
+        """
+        self.items = list(items)
+        self.xs = array('d', xs)
+        self.ys = array('d', ys)
+        self._rebuild()
+
+    def __repr__(self):
+        return f"GridIndex({self.count} points, {len(self.cells)} cells of size {self.size:.4g})"
+
+    def __len__(self):
+        return self.count
+
+    def _cell(self, x, y):
+        return int(x // self.size), int(y // self.size)
+
+    def _rebuild(self):
+        """Reparte los puntos (sin los eliminados) en celdas de un tamaño nuevo"""
+        keep = [i for i, item in enumerate(self.items) if item is not None]
+        if len(keep) < len(self.items):
+            self.items = [self.items[i] for i in keep]
+            self.xs = array('d', (self.xs[i] for i in keep))
+            self.ys = array('d', (self.ys[i] for i in keep))
+        self.count = self.built_count = len(self.items)
+
+        # Tamaño de celda: área del rectángulo que los contiene / número de puntos
+        self.size = 1.0
+        if self.count > 1:
+            width = max(self.xs) - min(self.xs)
+            height = max(self.ys) - min(self.ys)
+            if width > 0 and height > 0:
+                self.size = math.sqrt(width * height / self.count)
+            elif width > 0 or height > 0:
+                self.size = max(width, height) / self.count
+
+        self.cells = {}
+        self.min_cx = self.min_cy = math.inf
+        self.max_cx = self.max_cy = -math.inf
+        for i in range(self.count):
+            self._place(i)
+
+    def _place(self, i):
+        cx, cy = self._cell(self.xs[i], self.ys[i])
+        self.cells.setdefault((cx, cy), []).append(i)
+        self.min_cx, self.max_cx = min(self.min_cx, cx), max(self.max_cx, cx)
+        self.min_cy, self.max_cy = min(self.min_cy, cy), max(self.max_cy, cy)
+
+    def add(self, item, x, y):
+        """Añade un punto (sin reconstruir el índice salvo que el número de puntos se duplique)"""
+        self.items.append(item)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.count += 1
+        if self.count > 2 * self.built_count:
+            self._rebuild()
+        else:
+            self._place(len(self.items) - 1)
+
+    def remove(self, item, x, y):
+        """
+        Elimina un punto añadido con esas coordenadas
+
+        Returns:
+            bool: True si estaba en el índice
+        """
+        cell = self.cells.get(self._cell(x, y), [])
+        for i in cell:
+            if self.items[i] is item:
+                cell.remove(i)
+                self.items[i] = None
+                self.count -= 1
+                return True
+        return False
+
+    def _ring(self, cx, cy, r):
+        """Identificadores de las celdas a distancia r (en celdas) de (cx, cy), dentro del área ocupada"""
+        x0, x1 = max(cx - r, self.min_cx), min(cx + r, self.max_cx)
+        y0, y1 = max(cy - r, self.min_cy), min(cy + r, self.max_cy)
+        cells = self.cells
+        for y in ((cy - r, cy + r) if r else (cy,)):
+            if y0 <= y <= y1:
+                for x in range(x0, x1 + 1):
+                    yield from cells.get((x, y), ())
+        for x in ((cx - r, cx + r) if r else ()):
+            if x0 <= x <= x1:
+                for y in range(max(y0, cy - r + 1), min(y1, cy + r - 1) + 1):
+                    yield from cells.get((x, y), ())
+
+    def k_nearest(self, x, y, k, max_distance=None):
+        """
+        Los k puntos más cercanos a (x, y)
+
+        Args:
+            k (int): Número de puntos
+            max_distance (float): Descartar los puntos más lejanos (opcional)
+
+        Returns:
+            list: Objetos ordenados de más cercano a más lejano
+        """
+        if not self.count or k <= 0:
+            return []
+        limit = math.inf if max_distance is None else max_distance * max_distance
+        xs, ys, size = self.xs, self.ys, self.size
+        cx, cy = self._cell(x, y)
+        heap = []  # (-distancia², -id): en la cima el peor de los k mejores
+        r = max(0, self.min_cx - cx, cx - self.max_cx, self.min_cy - cy, cy - self.max_cy)
+        r_max = max(cx - self.min_cx, self.max_cx - cx, cy - self.min_cy, self.max_cy - cy)
+
+        while r <= r_max:
+            for i in self._ring(cx, cy, r):
+                d2 = (xs[i] - x) ** 2 + (ys[i] - y) ** 2
+                if d2 > limit:
+                    continue
+                if len(heap) < k:
+                    heapq.heappush(heap, (-d2, -i))
+                elif (d2, i) < (-heap[0][0], -heap[0][1]):
+                    heapq.heapreplace(heap, (-d2, -i))
+
+            # Distancia mínima desde (x, y) a las celdas que quedan fuera del bloque visitado
+            gap = min(x - (cx - r) * size, (cx + r + 1) * size - x, y - (cy - r) * size, (cy + r + 1) * size - y)
+            if gap * gap > limit or (len(heap) == k and gap * gap > -heap[0][0]):
+                break
+            r += 1
+
+        return [self.items[-i] for _, i in sorted(heap, reverse=True)]
+
+    def nearest(self, x, y, max_distance=None):
+        """El punto más cercano a (x, y), o None si no hay ninguno a menos de max_distance"""
+        found = self.k_nearest(x, y, 1, max_distance)
+        return found[0] if found else None
+
+    def within(self, x, y, radius):
+        """
+        Puntos a una distancia de (x, y) menor o igual que radius
+
+        Returns:
+            list: Objetos ordenados de más cercano a más lejano
+        """
+        if not self.count:
+            return []
+        x0, y0 = self._cell(x - radius, y - radius)
+        x1, y1 = self._cell(x + radius, y + radius)
+        x0, x1 = max(x0, self.min_cx), min(x1, self.max_cx)
+        y0, y1 = max(y0, self.min_cy), min(y1, self.max_cy)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) <= len(self.cells):
+            keys = ((cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1))
+        else:
+            keys = (key for key in self.cells if x0 <= key[0] <= x1 and y0 <= key[1] <= y1)
+
+        xs, ys, limit = self.xs, self.ys, radius * radius
+        found = []
+        for key in keys:
+            for i in self.cells.get(key, ()):
+                d2 = (xs[i] - x) ** 2 + (ys[i] - y) ** 2
+                if d2 <= limit:
+                    found.append((d2, i))
+        found.sort()
+        return [self.items[i] for _, i in found]
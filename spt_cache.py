@@ -0,0 +1,105 @@
+import sys
+from collections import OrderedDict
+
+from shortest_path_tree import ShortestPathTree
+
+
+def _TreeSize(tree):
+    """Memoria aproximada en bytes de un árbol de caminos mínimos (tablas y valores float)"""
+    return sys.getsizeof(tree.distances) + sys.getsizeof(tree.previous) + 24 * len(tree.distances)
+
+
+class ShortestPathTreeCache:
+    def __init__(self, max_trees=32, max_bytes=16 * 2 ** 20):
+        """
+        Caché LRU de árboles de caminos mínimos (distancias + predecesores) por origen
+
+        La clave es (origen, versión del grafo). Cuando el Graph o AirSpace cambia, el
+        árbol antiguo del mismo origen se repara con su registro de cambios en lugar de
+        calcularlo otra vez (ver ShortestPathTree.update).
+
+        Args:
+            max_trees (int): Número máximo de árboles guardados (opcional)
+            max_bytes (int): Memoria máxima aproximada de todos los árboles (opcional)
+        """
+        self.max_trees = max_trees
+        self.max_bytes = max_bytes
+        self.trees = OrderedDict()  # (origen, versión) -> (ShortestPathTree, bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.revalidations = 0  # Árboles de una versión anterior reparados en lugar de recalculados
+        self.repaired_nodes = 0  # Nodos reprocesados en esas reparaciones
+
+    def __repr__(self):
+        return (f"ShortestPathTreeCache({len(self.trees)} trees, {self.bytes / 2 ** 20:.2f} MB, "
+                f"{self.hits} hits, {self.misses} misses)")
+
+    def get_tree(self, data, origin):
+        """
+        Devuelve el árbol de origin, reparándolo o calculándolo si hace falta
+
+        Args:
+            data (Graph): Grafo o AirSpace al que pertenece el árbol
+            origin: Node (Graph) o número de NavPoint (AirSpace) de origen
+
+        Returns:
+            ShortestPathTree: Árbol actualizado a la versión actual de data
+        """
+        key = (origin, data.version)
+        entry = self.trees.get(key)
+        if entry is not None:
+            if entry[0].data is data:
+                self.trees.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            del self.trees[key]  # Árbol de otro grafo con la misma clave
+            self.bytes -= entry[1]
+
+        old_key = next((k for k, e in self.trees.items() if k[0] == origin and e[0].data is data), None)
+        if old_key is not None:
+            tree, size = self.trees.pop(old_key)
+            self.bytes -= size
+            self.repaired_nodes += tree.update()
+            self.hits += 1
+            self.revalidations += 1
+        else:
+            tree = ShortestPathTree(data, origin)
+            self.misses += 1
+
+        size = _TreeSize(tree)
+        self.trees[key] = (tree, size)
+        self.bytes += size
+
+        # Expulsar los árboles usados hace más tiempo (siempre se conserva el último)
+        while len(self.trees) > 1 and (len(self.trees) > self.max_trees or self.bytes > self.max_bytes):
+            _, (_, old_size) = self.trees.popitem(last=False)
+            self.bytes -= old_size
+            self.evictions += 1
+        return tree
+
+    def shortest_path(self, graph, start_name, end_name):
+        """Camino más corto en un Graph reconstruido desde el árbol del origen"""
+        start_node = graph.get_node(start_name)
+        end_node = graph.get_node(end_name)
+        if not start_node or not end_node:
+            return None
+        return self.get_tree(graph, start_node).path_to(end_node)
+
+    def shortest_nav_path(self, airspace, start_id, end_id):
+        """Camino más corto en un AirSpace reconstruido desde el árbol del origen"""
+        if not airspace.get_point(start_id) or not airspace.get_point(end_id):
+            return None
+        return self.get_tree(airspace, start_id).path_to(end_id)
+
+    def stats(self):
+        """Aciertos, fallos, expulsiones, reparaciones, árboles y memoria de la caché"""
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'revalidations': self.revalidations, 'repaired_nodes': self.repaired_nodes,
+                'trees': len(self.trees), 'bytes': self.bytes}
+
+    def clear(self):
+        """Vacía la caché (las estadísticas se conservan)"""
+        self.trees.clear()
+        self.bytes = 0
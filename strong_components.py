@@ -0,0 +1,179 @@
+from array import array
+
+from reachability import _View
+
+# Por encima de este número de componentes no se guarda el cierre transitivo
+# (ocuparía componentes² / 8 bytes) y can_reach recorre el DAG de condensación
+MAX_CLOSURE_COMPONENTS = 10000
+
+
+def _Tarjan(offsets, targets):
+    """
+    Algoritmo de Tarjan iterativo (sin recursión) sobre una adyacencia CSR
+
+    Returns:
+        tuple: (array con el componente de cada índice, número de componentes). Los
+        componentes se numeran en orden topológico inverso: si hay un segmento de
+        A a B (en componentes distintos), el número de B es menor que el de A
+    """
+    n = len(offsets) - 1
+    order = array('q', [-1]) * n  # Orden de descubrimiento
+    low = array('q', [0]) * n
+    component = array('q', [-1]) * n
+    on_stack = bytearray(n)
+    stack = []
+    counter = 0
+    count = 0
+
+    for root in range(n):
+        if order[root] >= 0:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [[root, offsets[root]]]  # (índice, siguiente segmento por visitar)
+
+        while work:
+            frame = work[-1]
+            v, k = frame
+            if k < offsets[v + 1]:
+                frame[1] = k + 1
+                w = targets[k]
+                if order[w] < 0:
+                    order[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+                    work.append([w, offsets[w]])
+                elif on_stack[w] and order[w] < low[v]:
+                    low[v] = order[w]
+                continue
+
+            work.pop()
+            if work and low[v] < low[work[-1][0]]:
+                low[work[-1][0]] = low[v]
+            if low[v] == order[v]:
+                # v es la raíz de un componente: sacar sus miembros de la pila
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = 0
+                    component[w] = count
+                    if w == v:
+                        break
+                count += 1
+
+    return component, count
+
+
+class StrongComponents:
+    def __init__(self, airspace):
+        """
+        Componentes fuertemente conexos de un espacio aéreo y su DAG de condensación
+
+        Dos puntos del mismo componente se alcanzan mutuamente. El DAG tiene un nodo
+        por componente y un arco si algún segmento va de uno a otro. Con el cierre
+        transitivo del DAG (un entero por componente usado como conjunto de bits),
+        saber si hay camino entre dos puntos cuesta O(1).
+
+        Args:
+            airspace (AirSpace): Espacio aéreo (o CompactAirSpace)
+        """
+        view = _View(airspace, 'airspace')
+        self.view = view
+        self.version = view.version
+        self.component, self.count = _Tarjan(view.offsets, view.targets)
+
+        self.sizes = array('q', [0]) * self.count
+        for c in self.component:
+            self.sizes[c] += 1
+
+        # DAG de condensación: componentes sucesores de cada componente
+        self.successors = [set() for _ in range(self.count)]
+        offsets, targets, component = view.offsets, view.targets, self.component
+        for v in range(len(component)):
+            cv = component[v]
+            for k in range(offsets[v], offsets[v + 1]):
+                cw = component[targets[k]]
+                if cw != cv:
+                    self.successors[cv].add(cw)
+
+        # Cierre transitivo: los sucesores tienen número menor, así que ya están calculados
+        self.reach = None
+        if self.count <= MAX_CLOSURE_COMPONENTS:
+            self.reach = []
+            for c in range(self.count):
+                bits = 1 << c
+                for d in self.successors[c]:
+                    bits |= self.reach[d]
+                self.reach.append(bits)
+
+    def __repr__(self):
+        largest = max(self.sizes, default=0)
+        return f"StrongComponents({self.count} components, largest {largest} points)"
+
+    def component_of(self, number):
+        """Componente del NavPoint con ese número, o None si no existe"""
+        index = self.view.index_of.get(number)
+        return None if index is None else self.component[index]
+
+    def members(self, component):
+        """NavPoint de un componente"""
+        return [self.view.point(i) for i, c in enumerate(self.component) if c == component]
+
+    def strongly_connected(self, start_id, end_id):
+        """True si los dos puntos se alcanzan mutuamente"""
+        a, b = self.component_of(start_id), self.component_of(end_id)
+        return a is not None and a == b
+
+    def can_reach(self, start_id, end_id):
+        """
+        Indica si existe algún camino de start_id a end_id sin lanzar ninguna búsqueda
+
+        Returns:
+            bool: False también si alguno de los puntos no existe
+        """
+        a, b = self.component_of(start_id), self.component_of(end_id)
+        if a is None or b is None:
+            return False
+        if a == b:
+            return True
+        if b > a:
+            return False  # Orden topológico: desde a solo se llega a componentes menores
+        if self.reach is not None:
+            return bool(self.reach[a] >> b & 1)
+
+        # Sin cierre transitivo: recorrer el DAG de condensación desde a
+        seen = {a}
+        stack = [a]
+        while stack:
+            for d in self.successors[stack.pop()]:
+                if d == b:
+                    return True
+                if d > b and d not in seen:
+                    seen.add(d)
+                    stack.append(d)
+        return False
+
+
+def GetStrongComponents(airspace):
+    """
+    Componentes fuertemente conexos de airspace, calculados una vez por versión
+    (se guardan en airspace._components)
+
+    Args:
+        airspace (AirSpace): Espacio aéreo (o CompactAirSpace)
+
+    Returns:
+        StrongComponents: Componentes de la versión actual del espacio aéreo
+    """
+    components = airspace._components
+    if components is None or components.version != airspace.version:
+        components = StrongComponents(airspace)
+        airspace._components = components
+    return components
+
+
+def CanReachNavPoint(airspace, start_id, end_id):
+    """Comprobación O(1) de que hay algún camino de start_id a end_id (ver StrongComponents)"""
+    return GetStrongComponents(airspace).can_reach(start_id, end_id)
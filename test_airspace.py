@@ -0,0 +1,414 @@
+import gc
+import os
+import tempfile
+import weakref
+from airspace import *
+from compact_airspace import LoadAirspaceCompact, LoadAirspaceCache
+from contraction import BuildContractionHierarchy, FindShortestNavPathCH
+from distance_matrix import BuildAirportDistanceMatrix
+from k_shortest import FindKShortestNavPaths
+from pareto import FindParetoNavRoutes
+from reachability import ReachableNavPointsWithin, ReachableNavPointsWithinBatch
+from shortest_path_tree import ShortestPathTree
+from strong_components import GetStrongComponents, CanReachNavPoint
+from spt_cache import ShortestPathTreeCache
+from landmarks import BuildLandmarks, SaveLandmarks, LoadLandmarks
+from navgraph import BuildNavGraph, FindShortestNavPathCSR, GetReachableNavPointsCSR
+
+
+def test_indexes():
+    airspace = LoadAirspace("Cat_nav.txt", "Cat_seg.txt", "Cat_ger.txt")
+    print("\nTesting NavPoint index and adjacency:")
+    point = airspace.get_point(5129)
+    print("Point 5129:", point.name)
+    assert point.name == "GODOX"
+    assert len(airspace.points_by_number) == len(airspace.nav_points)
+    assert sum(len(segs) for segs in airspace.outgoing.values()) == len(airspace.nav_segments)
+    for seg in airspace.get_outgoing_segments(5129):
+        assert seg.origin_number == 5129
+        print(f"- {seg.origin_number} -> {seg.destination_number} ({seg.distance} km)")
+
+    new_point = NavPoint(99999, "TEST", 41.0, 2.0)
+    assert airspace.add_nav_point(new_point)
+    assert not airspace.add_nav_point(NavPoint(99999, "DUP", 0, 0))
+    assert airspace.add_nav_segment(NavSegment(5129, 99999, 10.0))
+    assert airspace.get_point(99999) is new_point
+    assert any(s.destination_number == 99999 for s in airspace.get_outgoing_segments(5129))
+    assert airspace.get_incoming_segments(99999)[0].origin_number == 5129
+
+    # Los dos tipos de espacio aéreo rechazan segmentos con puntos desconocidos
+    compact = LoadAirspaceCompact("Cat_nav.txt", "Cat_seg.txt", "Cat_ger.txt")
+    for data in (airspace, compact):
+        version, count = data.version, len(data.nav_segments)
+        assert not data.add_nav_segment(NavSegment(5129, 123456, 10.0))
+        assert data.version == version and len(data.nav_segments) == count
+
+
+def test_shortest_nav_path():
+    airspace = LoadAirspace("Cat_nav.txt", "Cat_seg.txt", "Cat_ger.txt")
+    print("\nTesting shortest path from 5129 (GODOX) to 6061 (IZA):")
+    path = FindShortestNavPath(airspace, 5129, 6061)
+    print("Path:", [p.name for p in path.points])
+    print("Total cost:", path.cost)
+    assert path.points[0].number == 5129
+    assert path.points[-1].number == 6061
+    cost = 0
+    for a, b in zip(path.points, path.points[1:]):
+        seg = next(s for s in airspace.get_outgoing_segments(a.number) if s.destination_number == b.number)
+        cost += seg.distance
+    assert abs(cost - path.cost) < 1e-6
+
+
+def test_compact_loader():
+    airspace = LoadAirspace("Eur_nav.txt", "Eur_seg.txt", "Eur_ger.txt")
+    compact = LoadAirspaceCompact("Eur_nav.txt", "Eur_seg.txt", "Eur_ger.txt")
+    print("\nTesting columnar loader on Eur:", len(compact.nav_points), "points,",
+          len(compact.nav_segments), "segments")
+    assert [p.number for p in compact.nav_points] == [p.number for p in airspace.nav_points]
+    assert len(compact.nav_segments) == len(airspace.nav_segments)
+    start, end = airspace.nav_points[0].number, airspace.nav_points[500].number
+    path = FindShortestNavPath(airspace, start, end)
+    compact_path = FindShortestNavPath(compact, start, end)
+    assert [p.number for p in compact_path.points] == [p.number for p in path.points]
+
+
+def test_binary_cache():
+    files = ("Spa_nav.txt", "Spa_seg.txt", "Spa_ger.txt")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = os.path.join(tmp, "Spa_airspace.cache")
+        first = LoadAirspace(*files, cache_file=cache_file)
+        print("\nTesting binary cache:", os.path.getsize(cache_file), "bytes")
+        cached = LoadAirspaceCache(cache_file, list(files))
+        assert cached is not None
+        assert [p.name for p in cached.nav_points] == [p.name for p in first.nav_points]
+        assert len(cached.get_outgoing_segments(48)) == len(first.get_outgoing_segments(48))
+        cached = None  # Liberar el archivo mapeado antes de borrar el directorio
+
+        # Una caché truncada se descarta y se vuelve a crear desde los archivos de texto
+        size = os.path.getsize(cache_file)
+        for cut in (4, size // 2):
+            with open(cache_file, 'r+b') as f:
+                f.truncate(size - cut)
+            assert LoadAirspaceCache(cache_file, list(files)) is None
+            reloaded = LoadAirspace(*files, cache_file=cache_file)
+            assert len(reloaded.nav_segments) == len(first.nav_segments)
+            reloaded = None
+            assert os.path.getsize(cache_file) == size
+
+
+def test_csr():
+    airspace = LoadAirspace("Spa_nav.txt", "Spa_seg.txt", "Spa_ger.txt")
+    navgraph = BuildNavGraph(airspace)
+    print("\nTesting CSR view:", navgraph)
+    numbers = [p.number for p in airspace.nav_points]
+    for start, end in zip(numbers[::50], numbers[25::50]):
+        path = FindShortestNavPath(airspace, start, end)
+        csr_path = FindShortestNavPathCSR(navgraph, start, end)
+        assert (path is None) == (csr_path is None)
+        if path:
+            assert abs(path.cost - csr_path.cost) < 1e-6
+    reachable = GetReachableNavPoints(airspace, numbers[0])
+    assert [p.number for p in GetReachableNavPointsCSR(navgraph, numbers[0])] == [p.number for p in reachable]
+
+    # El BFS compartido usa una vista CSR que se reconstruye si el espacio aéreo cambia
+    outside = next(n for n in numbers if n not in {p.number for p in reachable})
+    airspace.add_nav_segment(NavSegment(numbers[0], outside, 1.0))
+    assert outside in [p.number for p in GetReachableNavPoints(airspace, numbers[0])]
+
+    # La vista solo tiene una referencia débil: no mantiene vivo el espacio aéreo
+    alive = weakref.ref(airspace)
+    airspace = None
+    gc.collect()
+    assert alive() is None and navgraph.airspace is None and not navgraph.is_current()
+
+
+def test_bidirectional():
+    airspace = LoadAirspace("Spa_nav.txt", "Spa_seg.txt", "Spa_ger.txt")
+    print("\nTesting bidirectional search")
+    numbers = [p.number for p in airspace.nav_points]
+    for start, end in zip(numbers[::40], numbers[::-40]):
+        path = FindShortestNavPath(airspace, start, end)
+        for heuristic in (None, lambda point, end_point: 0):
+            bidir_path = FindShortestNavPath(airspace, start, end, heuristic=heuristic, bidirectional=True)
+            assert (path is None) == (bidir_path is None)
+            if path:
+                assert abs(path.cost - bidir_path.cost) < 1e-6
+                assert bidir_path.points[0].number == start
+                assert bidir_path.points[-1].number == end
+
+
+def test_landmarks():
+    files = ("Cat_nav.txt", "Cat_seg.txt", "Cat_ger.txt")
+    airspace = LoadAirspace(*files)
+    landmarks = BuildLandmarks(airspace, count=4)
+    print("\nTesting", landmarks)
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "Cat_landmarks.cache")
+        assert SaveLandmarks(landmarks, filename, list(files))
+        loaded = LoadLandmarks(filename, list(files))
+        assert list(loaded.landmarks) == list(landmarks.landmarks)
+        numbers = [p.number for p in airspace.nav_points]
+        for start, end in zip(numbers[::20], numbers[::-20]):
+            path = FindShortestNavPath(airspace, start, end)
+            alt_path = FindShortestNavPath(airspace, start, end, heuristic=loaded.lower_bound)
+            assert (path is None) == (alt_path is None)
+            if path:
+                assert abs(path.cost - alt_path.cost) < 1e-6
+                assert landmarks.lower_bound(airspace.get_point(start), airspace.get_point(end)) <= path.cost + 1e-6
+
+            # Las cotas siguen siendo válidas al evitar puntos (camino alternativo)
+            avoid = set(numbers[5::40]) - {start, end}
+            path = FindAlternativeNavPath(airspace, start, end, avoid)
+            alt_path = FindAlternativeNavPath(airspace, start, end, avoid, heuristic=loaded.lower_bound)
+            assert (path is None) == (alt_path is None)
+            if path:
+                assert abs(path.cost - alt_path.cost) < 1e-6
+        loaded = None
+
+        # Un archivo truncado se descarta en lugar de cargarse a medias
+        size = os.path.getsize(filename)
+        for cut in (4, size // 2):
+            with open(filename, 'r+b') as f:
+                f.truncate(size - cut)
+            assert LoadLandmarks(filename, list(files)) is None
+
+
+def test_contraction_hierarchy():
+    airspace = LoadAirspace("Cat_nav.txt", "Cat_seg.txt", "Cat_ger.txt")
+    hierarchy = BuildContractionHierarchy(airspace)
+    print("\nTesting", hierarchy)
+    numbers = [p.number for p in airspace.nav_points]
+    for start, end in zip(numbers[::10], numbers[::-10]):
+        path = FindShortestNavPath(airspace, start, end)
+        ch_path = FindShortestNavPathCH(hierarchy, start, end)
+        assert (path is None) == (ch_path is None)
+        if path:
+            assert abs(path.cost - ch_path.cost) < 1e-6
+            # Los atajos se deshacen: cada paso es un segmento original
+            for a, b in zip(ch_path.points, ch_path.points[1:]):
+                assert any(s.destination_number == b.number for s in airspace.get_outgoing_segments(a.number))
+
+
+def test_airport_distance_matrix():
+    airspace = LoadAirspace("Cat_nav.txt", "Cat_seg.txt", "Cat_ger.txt")
+    lebl = next(a for a in airspace.nav_airports if a.name == "LEBL")
+    assert [airspace.get_point(n).name for n in lebl.sids] == ["BCN.D"]
+    assert [airspace.get_point(n).name for n in lebl.stars] == ["BCN.A"]
+
+    matrix = BuildAirportDistanceMatrix(airspace, predecessors=True)
+    print("\nTesting", matrix)
+    for source in matrix.sources:
+        for target in matrix.targets:
+            path = FindShortestNavPath(airspace, source, target)
+            if path is None:
+                assert matrix.get(source, target) == float("inf")
+            else:
+                assert abs(matrix.get(source, target) - path.cost) < 1e-6
+                assert matrix.path(source, target).points[-1].number == target
+
+
+def test_path_cache():
+    airspace = LoadAirspace("Cat_nav.txt", "Cat_seg.txt", "Cat_ger.txt")
+    cache = ShortestPathTreeCache(max_trees=2)
+    numbers = [p.number for p in airspace.nav_points]
+    for start in numbers[:3]:
+        for end in numbers[100:110]:
+            path = FindShortestNavPath(airspace, start, end)
+            cached = cache.shortest_nav_path(airspace, start, end)
+            assert (path is None) == (cached is None)
+            if path:
+                assert abs(path.cost - cached.cost) < 1e-6
+    print("\nTesting", cache)
+    assert cache.stats() == {'hits': 27, 'misses': 3, 'evictions': 1, 'revalidations': 0,
+                             'repaired_nodes': 0, 'trees': 2, 'bytes': cache.bytes}
+
+
+def test_shortest_path_tree_repair():
+    airspace = LoadAirspace("Cat_nav.txt", "Cat_seg.txt", "Cat_ger.txt")
+    start = airspace.nav_points[0].number
+    tree = ShortestPathTree(airspace, start)
+    end = max(tree.distances, key=tree.distances.get)
+    path = tree.path_to(end)
+    print("\nTesting shortest path tree repair:", tree)
+
+    # Cerrar un segmento del camino y volver a calcular la ruta
+    closed = path.points[len(path.points) // 2]
+    airspace.remove_nav_segment(path.points[len(path.points) // 2 - 1].number, closed.number)
+    print("Repaired nodes:", tree.update())
+    distances, _ = NavDijkstra(airspace, start)
+    assert tree.distances.keys() == distances.keys()
+    assert all(abs(tree.distances[n] - distances[n]) < 1e-6 for n in distances)
+
+    airspace.set_segment_distance(path.points[0].number, path.points[1].number, 1.0)
+    tree.update()
+    distances, _ = NavDijkstra(airspace, start)
+    assert all(abs(tree.distances[n] - distances[n]) < 1e-6 for n in distances)
+
+
+def test_k_shortest_nav_paths():
+    airspace = LoadAirspace("Cat_nav.txt", "Cat_seg.txt", "Cat_ger.txt")
+    lebl = next(a for a in airspace.nav_airports if a.name == "LEBL")
+    lezg = next(a for a in airspace.nav_airports if a.name == "LEZG")
+    start, end = lebl.sids[0], lezg.stars[0]
+    paths = FindKShortestNavPaths(airspace, start, end, 5)
+    print("\nTesting k shortest paths", lebl.name, "->", lezg.name, [round(p.cost, 2) for p in paths])
+    assert abs(paths[0].cost - FindShortestNavPath(airspace, start, end).cost) < 1e-6
+    routes = [tuple(p.number for p in path.points) for path in paths]
+    assert len(set(routes)) == len(routes)
+    for path, route in zip(paths, routes):
+        assert route[0] == start and route[-1] == end
+        assert len(set(route)) == len(route)  # Sin ciclos
+    assert all(a.cost <= b.cost + 1e-9 for a, b in zip(paths, paths[1:]))
+    assert FindKShortestNavPaths(airspace, start, 99999, 5) == []
+
+
+def test_pareto_nav_routes():
+    airspace = LoadAirspace("Cat_nav.txt", "Cat_seg.txt", "Cat_ger.txt")
+    start, end = 1663, 14920  # BCN.D -> ZAR.A
+    extra = {"long_segments": lambda segment: max(0, segment.distance - 50)}
+    routes = FindParetoNavRoutes(airspace, start, end, extra)
+    print("\nTesting Pareto front:", [route.criteria for route in routes])
+    assert abs(routes[0].cost - FindShortestNavPath(airspace, start, end).cost) < 1e-6
+    for route in routes:
+        assert route.criteria["hops"] == len(route.points) - 1
+        assert set(route.criteria) == {"distance", "hops", "long_segments"}
+    # Ninguna ruta del frente domina a otra
+    values = [tuple(route.criteria.values()) for route in routes]
+    for a in values:
+        assert not any(b != a and all(x <= y for x, y in zip(b, a)) for b in values)
+
+
+def test_alternative_nav_path():
+    airspace = LoadAirspace("Cat_nav.txt", "Cat_seg.txt", "Cat_ger.txt")
+    start, end = 1663, 14920  # BCN.D -> ZAR.A
+    shortest = FindShortestNavPath(airspace, start, end)
+    assert FindAlternativeNavPath(airspace, start, end).cost == shortest.cost
+
+    avoid = {p.number for p in shortest.points[3:6]}
+    path = FindAlternativeNavPath(airspace, start, end, avoid_points=avoid)
+    print("\nTesting alternative path avoiding", avoid, "->", round(path.cost, 2), "km")
+    assert path.cost > shortest.cost
+    assert not avoid & {p.number for p in path.points}
+
+    # Un segmento se puede indicar como NavSegment o como par (origen, destino)
+    pair = (shortest.points[6].number, shortest.points[7].number)
+    segment = next(s for s in airspace.get_outgoing_segments(pair[0]) if s.destination_number == pair[1])
+    for avoid_segments in ([pair], [segment]):
+        path = FindAlternativeNavPath(airspace, start, end, avoid_segments=avoid_segments)
+        numbers = [p.number for p in path.points]
+        assert pair not in zip(numbers, numbers[1:]) and path.cost > shortest.cost
+    assert FindAlternativeNavPath(airspace, start, end, avoid_points={start}) is None
+
+    # La búsqueda bidireccional respeta los mismos puntos y segmentos a evitar
+    path = FindShortestNavPath(airspace, start, end, avoid_points=avoid, avoid_segments=[pair])
+    both = FindShortestNavPath(airspace, start, end, bidirectional=True, avoid_points=avoid, avoid_segments=[pair])
+    numbers = [p.number for p in both.points]
+    assert abs(both.cost - path.cost) < 1e-6
+    assert not avoid & set(numbers) and pair not in zip(numbers, numbers[1:])
+    assert FindShortestNavPath(airspace, start, end, bidirectional=True, avoid_points={end}) is None
+
+
+def test_bounded_reachability():
+    airspace = LoadAirspace("Cat_nav.txt", "Cat_seg.txt", "Cat_ger.txt")
+    start = 1663  # BCN.D
+    within = ReachableNavPointsWithin(airspace, start, max_distance=300)
+    print("\nTesting bounded reachability:", len(within), "points within 300 km")
+    distances, _ = NavDijkstra(airspace, start)
+    assert {p.number for p, _ in within} == {n for n, d in distances.items() if d <= 300}
+    assert [d for _, d in within] == sorted(d for _, d in within)
+
+    hops = ReachableNavPointsWithin(airspace, start, max_hops=3)
+    assert hops[0] == (airspace.get_point(start), 0) and max(h for _, h in hops) == 3
+    numbers = [p.number for p in airspace.nav_points]
+    batch = ReachableNavPointsWithinBatch(airspace, numbers + [start, 99999], max_hops=3)
+    assert batch[start] == hops and 99999 not in batch
+    for number in numbers:
+        assert batch[number] == ReachableNavPointsWithin(airspace, number, max_hops=3)
+
+
+def test_strong_components():
+    airspace = LoadAirspace("Cat_nav.txt", "Cat_seg.txt", "Cat_ger.txt")
+    components = GetStrongComponents(airspace)
+    print("\nTesting", components)
+    assert GetStrongComponents(airspace) is components  # Se calcula una vez por versión
+    assert sum(components.sizes) == len(airspace.nav_points)
+
+    numbers = [p.number for p in airspace.nav_points]
+    for start in numbers[::10]:
+        reachable = {p.number for p in GetReachableNavPoints(airspace, start)}
+        for end in numbers:
+            assert components.can_reach(start, end) == (end in reachable)
+        # Arcos del DAG de condensación hacia componentes con número menor
+        c = components.component_of(start)
+        assert all(d < c for d in components.successors[c])
+
+    # Un segmento nuevo puede unir componentes: se recalculan con la nueva versión
+    start, end = next((s, e) for s in numbers for e in numbers if not CanReachNavPoint(airspace, s, e))
+    airspace.add_nav_segment(NavSegment(start, end, 1.0))
+    assert CanReachNavPoint(airspace, start, end)
+    assert GetStrongComponents(airspace) is not components
+    assert not CanReachNavPoint(airspace, start, 99999)
+
+
+def test_spatial_index():
+    airspace = LoadAirspace("Cat_nav.txt", "Cat_seg.txt", "Cat_ger.txt")
+    compact = LoadAirspaceCompact("Cat_nav.txt", "Cat_seg.txt", "Cat_ger.txt")
+    index = airspace.spatial_index()
+    print("\nTesting", index)
+
+    def by_distance(lon, lat):
+        return sorted(airspace.nav_points, key=lambda p: (p.longitude - lon) ** 2 + (p.latitude - lat) ** 2)
+
+    for p in airspace.nav_points[::25]:
+        lon, lat = p.longitude + 0.03, p.latitude - 0.02
+        ordered = [q.number for q in by_distance(lon, lat)]
+        assert index.nearest(lon, lat) == ordered[0]
+        assert index.k_nearest(lon, lat, 5) == ordered[:5]
+        assert compact.spatial_index().k_nearest(lon, lat, 5) == ordered[:5]
+        near = {q.number for q in airspace.nav_points
+                if (q.longitude - lon) ** 2 + (q.latitude - lat) ** 2 <= 0.25}
+        assert set(index.within(lon, lat, 0.5)) == near
+    assert index.nearest(-30, 10, max_distance=0.1) is None
+
+    # Los puntos añadidos (como desde la interfaz) se indexan sin reconstruir todo
+    point = NavPoint(999999, "NEW", 45.0, -20.0)
+    airspace.add_nav_point(point)
+    compact.add_nav_point(point)
+    assert index.nearest(-20.01, 45.0) == 999999
+    assert compact.spatial_index().nearest(-20.01, 45.0) == 999999
+
+
+
+def test_views_released():
+    # Las vistas y los componentes se guardan en el propio espacio aéreo: al soltarlo se libera todo
+    alive = []
+    for prefix in ("Cat", "Spa", "Eur"):
+        airspace = LoadAirspace(f"{prefix}_nav.txt", f"{prefix}_seg.txt", f"{prefix}_ger.txt")
+        start = airspace.nav_points[0].number
+        assert GetReachableNavPoints(airspace, start)
+        assert ReachableNavPointsWithin(airspace, start, max_hops=2)
+        assert CanReachNavPoint(airspace, start, start)
+        alive.append(weakref.ref(airspace))
+    airspace = None
+    gc.collect()
+    assert all(ref() is None for ref in alive)
+
+if __name__ == "__main__":
+    test_indexes()
+    test_shortest_nav_path()
+    test_compact_loader()
+    test_binary_cache()
+    test_csr()
+    test_bidirectional()
+    test_landmarks()
+    test_contraction_hierarchy()
+    test_airport_distance_matrix()
+    test_path_cache()
+    test_shortest_path_tree_repair()
+    test_k_shortest_nav_paths()
+    test_pareto_nav_routes()
+    test_alternative_nav_path()
+    test_bounded_reachability()
+    test_strong_components()
+    test_spatial_index()
+    test_views_released()
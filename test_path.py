@@ -1,5 +1,11 @@
+import gc
+import weakref
 from graph import *
 from path import Path
+from k_shortest import FindKShortestPaths
+from pareto import FindParetoRoutes
+from reachability import ReachableNodes
+from spt_cache import ShortestPathTreeCache
 
 def test_reachability():
     G = CreateGraph_1()
@@ -10,6 +16,61 @@ def test_reachability():
     print("Plotting reachable nodes...")
     PlotReachableNodes(G, "D")
 
+def test_reachability_engine():
+    G = CreateGraph_1()
+    D = G.get_node("D")
+    directed = ReachableNodes(G, D)
+    undirected = ReachableNodes(G, D, undirected=True)
+    assert directed[0] is D and len(set(directed)) == len(directed)
+    assert set(directed) <= set(undirected)
+
+    # La vista CSR se reconstruye cuando cambia la versión del grafo
+    AddNode(G, Node("Z", 30, 30))
+    assert G.get_node("Z") not in ReachableNodes(G, D)
+    AddSegment(G, "DZ", "D", "Z")
+    assert G.get_node("Z") in GetReachableNodes(G, "D")
+    RemoveSegment(G, "D", "Z")
+    assert G.get_node("Z") not in ReachableNodes(G, D)
+
+    # Las vistas se guardan en el propio grafo y no lo mantienen vivo
+    alive = weakref.ref(G)
+    G = None
+    gc.collect()
+    assert alive() is None
+
+def test_connectivity():
+    G = CreateGraph_1()
+    print("\nTesting union-find connectivity:", G.components)
+    assert AreConnected(G, "A", "L") and GetComponentSize(G, "A") == len(G.nodes)
+
+    AddNode(G, Node("Z", 30, 30))
+    AddNode(G, Node("Y", 31, 30))
+    AddSegment(G, "YZ", "Y", "Z")  # Se une sin reconstruir nada
+    assert not G.components.dirty
+    assert AreConnected(G, "Z", "Y") and not AreConnected(G, "A", "Z")
+    assert GetComponentSize(G, "Z") == 2 and G.components.count == 2
+
+    # Los borrados marcan la estructura y se reconstruye en la siguiente consulta
+    RemoveSegment(G, "Y", "Z")
+    assert G.components.dirty
+    assert not AreConnected(G, "Y", "Z") and GetComponentSize(G, "Y") == 1
+    RemoveNode(G, "Y")
+    assert GetComponents(G).count == 2 and not AreConnected(G, "Y", "Z")
+
+def test_closest_node():
+    G = CreateGraph_1()
+    for x, y in [(0, 0), (7.4, 3.2), (15, 15), (-40, 90)]:
+        expected = min(G.nodes, key=lambda n: (n.x - x) ** 2 + (n.y - y) ** 2)
+        assert GetClosest(G, x, y) is expected
+
+    # El índice se mantiene al añadir y borrar nodos
+    AddNode(G, Node("Z", 100, 100))
+    assert GetClosest(G, 99, 99).name == "Z"
+    RemoveNode(G, "Z")
+    assert GetClosest(G, 99, 99).name != "Z"
+    ordered = sorted(G.nodes, key=lambda n: (n.x - 1) ** 2 + (n.y - 20) ** 2)
+    assert GetSpatialIndex(G).k_nearest(1, 20, 3) == ordered[:3]
+
 def test_shortest_path():
     G = CreateGraph_1()
     print("\nTesting shortest path from B to F:")
@@ -21,13 +82,62 @@ def test_shortest_path():
     else:
         print("No path found")
 
+def test_path_cache():
+    G = CreateGraph_1()
+    cache = ShortestPathTreeCache()
+    print("\nTesting shortest path tree cache from B:")
+    for end in ("F", "K", "F"):
+        path = cache.shortest_path(G, "B", end)
+        assert path.cost == FindShortestPath(G, "B", end).cost
+    print(cache)
+    assert cache.hits == 2 and cache.misses == 1
+
+    # Un nodo nuevo no cambia el árbol: se sigue usando
+    version = G.version
+    AddNode(G, Node("Z", 30, 30))
+    assert G.version == version + 1
+    assert G.changes.since(version)[0][1:] == ("add_node", G.get_node("Z"))
+    cache.shortest_path(G, "B", "F")
+    assert cache.misses == 1 and cache.revalidations == 1
+
+    # Quitar una rama del árbol solo reprocesa el subárbol afectado
+    RemoveSegment(G, "B", "F")
+    path = cache.shortest_path(G, "B", "F")
+    assert cache.misses == 1 and cache.revalidations == 2 and cache.repaired_nodes > 0
+    assert path.cost == FindShortestPath(G, "B", "F").cost
+
+def test_k_shortest_paths():
+    G = CreateGraph_1()
+    print("\nTesting k shortest paths from A to F:")
+    paths = FindKShortestPaths(G, "A", "F", 4)
+    for p in paths:
+        print([n.name for n in p.nodes], p.cost)
+    assert [[n.name for n in p.nodes] for p in paths] == [
+        ["A", "K", "L", "F"], ["A", "B", "F"], ["A", "E", "F"], ["A", "B", "G", "F"]]
+    assert paths[0].cost == FindShortestPath(G, "A", "F").cost
+
+def test_pareto_routes():
+    G = CreateGraph_1()
+    print("\nTesting Pareto routes from A to F:")
+    routes = FindParetoRoutes(G, "A", "F")
+    for route in routes:
+        print([n.name for n in route.nodes], route.criteria)
+    assert [[n.name for n in r.nodes] for r in routes] == [["A", "K", "L", "F"], ["A", "B", "F"]]
+    assert [r.criteria["hops"] for r in routes] == [3, 2]
+
 if __name__ == "__main__":
     print("Testing graph functions...")
     G = CreateGraph_1()
     Plot(G)
     
     test_reachability()
+    test_reachability_engine()
+    test_connectivity()
+    test_closest_node()
     test_shortest_path()
+    test_path_cache()
+    test_k_shortest_paths()
+    test_pareto_routes()
     
     # Also test with the simple graph
     G2 = CreateGraph_2()